@@ -5,7 +5,8 @@ Commands:
   - show <player>: show model file path and existence
   - metadata <player>: show rows from `model_metadata` table for player
   - promote <player>: copy model to a production filename `<player>_production.pkl`
-  - archive <player>: move model file to `models_store/archive/`
+  - archive <player>: move model file to `models_store/archive/` (`--compress`
+    re-dumps it compressed; archived copies are never memory-mapped for serving)
 
 This CLI is intentionally lightweight and operates against on-disk artifacts and the
 `model_metadata` table via a short-lived sync SQLAlchemy engine when DATABASE_URL is set.
@@ -17,10 +18,10 @@ import os
 import shutil
 import logging
 from typing import Optional
-from sqlalchemy import create_engine, select
+from sqlalchemy import select
 import datetime
 
-from backend.services.model_registry import ModelRegistry, _sync_db_url
+from backend.services.model_registry import ModelRegistry, _get_engine, _sync_db_url
 
 logger = logging.getLogger("model_versioning_cli")
 
@@ -67,7 +68,7 @@ def _insert_metadata_row(player: str, version: Optional[str], path: str, notes:
         from backend.models.model_metadata import ModelMetadata
 
         sync_url = _sync_db_url(os.environ.get("DATABASE_URL"))
-        engine = create_engine(sync_url, future=True)
+        engine = _get_engine(sync_url)
         with engine.begin() as conn:
             ins = ModelMetadata.__table__.insert().values(
                 name=player,
@@ -96,12 +97,14 @@ def promote_model(reg: ModelRegistry, player: str, tag: str = "production", forc
     print(f"Promoted {src} -> {dst}")
     # attempt to record metadata for the promoted artifact
     try:
-        _insert_metadata_row(player, version=tag, path=dst, notes=f"promoted at {datetime.datetime.now(datetime.timezone.utc).isoformat()}Z")
+        from backend.services.training_data_service import _utc_now_iso  # local import
+
+        _insert_metadata_row(player, version=tag, path=dst, notes=f"promoted at {_utc_now_iso()}")
     except Exception:
         pass
 
 
-def archive_model(reg: ModelRegistry, player: str, force: bool = False):
+def archive_model(reg: ModelRegistry, player: str, force: bool = False, compress: Optional[str] = None):
     player = _safe_player(player)
     src = reg._model_path(player)
     if not os.path.exists(src):
@@ -113,7 +116,13 @@ def archive_model(reg: ModelRegistry, player: str, force: bool = False):
     if os.path.exists(dst) and not force:
         print(f"Archive already contains {dst} (use --force to overwrite)")
         return
-    shutil.move(src, dst)
+    if compress:
+        from backend.services.model_registry import _artifact_compression, _dump_artifact, _load_artifact
+
+        _dump_artifact(_load_artifact(src), dst, compress=_artifact_compression(compress))
+        os.remove(src)
+    else:
+        shutil.move(src, dst)
     print(f"Archived {src} -> {dst}")
 
 
@@ -125,7 +134,7 @@ def show_metadata(player: str, db_url: Optional[str] = None):
         return
 
     sync_url = _sync_db_url(os.environ.get("DATABASE_URL") or db_url)
-    engine = create_engine(sync_url, future=True)
+    engine = _get_engine(sync_url)
     with engine.begin() as conn:
         stmt = select(ModelMetadata).where(ModelMetadata.name == player)
         res = conn.execute(stmt).scalars().all()
@@ -156,6 +165,8 @@ def main(argv: Optional[list] = None):
     sp4 = sub.add_parser("archive", help="Archive model file to models_store/archive/")
     sp4.add_argument("player")
     sp4.add_argument("--force", action="store_true", help="Overwrite archived file if exists")
+    sp4.add_argument("--compress", nargs="?", const="true", default=None,
+                     help="Store the archived copy compressed (lz4 if installed, else zlib; optional level 1-9)")
 
     args = p.parse_args(argv)
 
@@ -168,7 +179,7 @@ def main(argv: Optional[list] = None):
     elif args.cmd == "promote":
         promote_model(reg, args.player, tag=args.tag, force=args.force)
     elif args.cmd == "archive":
-        archive_model(reg, args.player, force=args.force)
+        archive_model(reg, args.player, force=args.force, compress=args.compress)
     elif args.cmd == "metadata":
         show_metadata(args.player)
     else:
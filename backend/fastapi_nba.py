@@ -98,8 +98,8 @@ async def _lifespan(app: FastAPI):
         global registry, ml_service
         if registry is None:
             try:
-                from backend.services.model_registry import ModelRegistry as _MR
-                registry = _MR()
+                from backend.services.model_registry import get_registry as _get_registry
+                registry = _get_registry()
             except Exception:
                 registry = None
 
@@ -119,7 +119,11 @@ async def _lifespan(app: FastAPI):
             except Exception:
                 model_dir = None
 
-        if model_dir:
+        # Models are loaded lazily on first prediction (and kept in the
+        # registry's bounded LRU). Set PRELOAD_MODELS=true to warm every
+        # flat .pkl at startup instead.
+        preload = os.environ.get('PRELOAD_MODELS', 'false').lower() in ('1', 'true', 'yes')
+        if model_dir and preload:
             # load all .pkl models found in the dir
             for fname in sorted(os.listdir(model_dir)):
                 if not fname.endswith('.pkl') or fname.endswith('_calibrator.pkl'):
@@ -939,11 +943,11 @@ ml_service = MLPredictionService() if MLPredictionService is not None else None
 
 # Model registry endpoints (optional)
 try:
-    from backend.services.model_registry import ModelRegistry
+    from backend.services.model_registry import get_registry
 except Exception:
-    ModelRegistry = None
+    get_registry = None
 
-registry = ModelRegistry() if ModelRegistry is not None else None
+registry = get_registry() if get_registry is not None else None
 
 
 class PredictionRequest(BaseModel):
@@ -1017,19 +1021,26 @@ class BatchPredictResponse(BaseModel):
     predictions: List[PredictionResponse]
 
 
+# Cache format version, the last segment of the /api/predict cache key.
+# Entries are served as raw bytes, so bump it whenever the stored body
+# changes; older entries then miss instead of bypassing PredictionResponse.
+# (v1 entries were json.dumps of the unfiltered result dict.)
+_PREDICT_CACHE_VERSION = 'v2'
+
+
 @app.post('/api/predict', response_model=PredictionResponse, responses={503: {"description": "ML service unavailable"}})
 async def api_predict(req: PredictionRequest):
     if ml_service is None:
         raise HTTPException(status_code=503, detail='ML service unavailable')
     # Simple caching by player|stat|line when Redis is available.
-    cache_key = f"predict:{req.player}:{req.stat}:{req.line}"
+    # (`predict:<player>:` stays the leading segment for save_model's invalidation)
+    cache_key = f"predict:{req.player}:{req.stat}:{req.line}:{_PREDICT_CACHE_VERSION}"
     if redis_client:
         try:
             raw = redis_client.get(cache_key)
             if raw:
-                # stored as JSON string
-                import json
-                return json.loads(raw.decode('utf-8') if isinstance(raw, (bytes, bytearray)) else raw)
+                # stored as the serialized response body: serve it untouched
+                return Response(content=raw, media_type='application/json')
         except Exception:
             pass
 
@@ -1041,15 +1052,19 @@ async def api_predict(req: PredictionRequest):
         opponent_data=req.opponent_data or {}
     )
 
+    # Validate and encode once (pydantic-core writes the JSON bytes directly);
+    # the same body is returned and cached.
+    resp = PredictionResponse(**result)
+    body = resp.model_dump_json() if hasattr(resp, 'model_dump_json') else resp.json()
+
     # store in redis for 1 hour
     if redis_client:
         try:
-            import json
-            redis_client.setex(cache_key, 60 * 60, json.dumps(result))
+            redis_client.setex(cache_key, 60 * 60, body)
         except Exception:
             pass
 
-    return result
+    return Response(content=body, media_type='application/json')
 
 
 @app.post('/api/batch_predict', response_model=BatchPredictResponse, responses={503: {"description": "ML service unavailable"}})
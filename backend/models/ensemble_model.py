@@ -26,6 +26,19 @@ except Exception:
     XGBOOST_AVAILABLE = False
 
 
+def _member_predict(est):
+    """`est.predict` for a component: estimators fitted on a DataFrame
+    (`feature_names_in_`) get the frame, so sklearn can check the column
+    names; everything else gets the bare ndarray it was trained on."""
+    if hasattr(est, "feature_names_in_"):
+        return est.predict
+
+    def predict(X):
+        return est.predict(X.values if isinstance(X, pd.DataFrame) else X)
+
+    return predict
+
+
 class EnsembleModel:
     def __init__(self, rf_params: Optional[Dict] = None, en_params: Optional[Dict] = None, weights: Optional[List[float]] = None):
         self.rf_params = rf_params or {"n_estimators": 100, "random_state": 0}
@@ -62,31 +75,82 @@ class EnsembleModel:
             except Exception:
                 self.xgb_model = None
 
-    def predict(self, X: pd.DataFrame) -> np.ndarray:
-        if not isinstance(X, pd.DataFrame):
-            X = pd.DataFrame(X)
-        preds = []
+    def _weight_vector(self, n_models: int) -> np.ndarray:
+        """Normalized combine weights for `n_models` component predictions.
+
+        Uses `self.weights` when it matches the number of components, else a
+        uniform average. Cached until `weights` or the component count changes.
+        """
+        key = (tuple(self.weights) if self.weights else None, n_models)
+        cached = getattr(self, "_weight_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if self.weights and len(self.weights) == n_models:
+            w = np.asarray(self.weights, dtype=np.float64)
+            w = w / w.sum()
+        else:
+            w = np.full(n_models, 1.0 / n_models)
+        self._weight_cache = (key, w)
+        return w
+
+    def _components(self):
+        """Parallel tuples `(predict_fns, best_effort_flags)` for the trained
+        components, rebuilt only when a component object is replaced."""
+        key = (self.rf, self.en, self.xgb_model if XGBOOST_AVAILABLE else None)
+        cached = getattr(self, "_component_cache", None)
+        if cached is not None and all(a is b for a, b in zip(cached[0], key)):
+            return cached[1], cached[2]
+        fns, best_effort = [], []
         if self.rf is not None:
-            preds.append(self.rf.predict(X.values))
+            fns.append(_member_predict(self.rf))
+            best_effort.append(False)
         if self.en is not None:
-            preds.append(self.en.predict(X))
-        if self.xgb_model is not None and XGBOOST_AVAILABLE:
-            try:
-                dmat = xgb.DMatrix(X.values)
-                preds.append(self.xgb_model.predict(dmat))
-            except Exception:
-                pass
+            fns.append(_member_predict(self.en))
+            best_effort.append(False)
+        if key[2] is not None:
+            fns.append(self._xgb_predict)
+            best_effort.append(True)
+        self._component_cache = (key, tuple(fns), tuple(best_effort))
+        return self._component_cache[1], self._component_cache[2]
+
+    def _xgb_predict(self, X) -> np.ndarray:
+        X_vals = X.values if isinstance(X, pd.DataFrame) else X
+        return self.xgb_model.inplace_predict(np.ascontiguousarray(X_vals, dtype=np.float32))
 
-        if not preds:
+    def __getstate__(self):
+        # bound-method caches are rebuilt on demand after unpickling
+        state = self.__dict__.copy()
+        state.pop("_component_cache", None)
+        return state
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        # a DataFrame is handed to the members as-is, so those fitted on one
+        # see their feature names; the rest unwrap it (see _member_predict)
+        if not isinstance(X, pd.DataFrame):
+            X = np.asarray(X)
+            if X.ndim == 1:
+                X = X.reshape(-1, 1)
+        from backend.services.prediction_kernels import map_members
+
+        fns, best_effort = self._components()
+
+        # component predictions go straight into one (n_models, n_samples)
+        # buffer and are combined with a single weights @ buffer
+        # (members run concurrently for large batches, see map_members)
+        out = np.empty((len(fns), X.shape[0]), dtype=np.float64)
+        n = 0
+        for pred, optional in zip(map_members(fns, X), best_effort):
+            if isinstance(pred, Exception):
+                if optional:
+                    continue
+                raise pred
+            out[n] = pred
+            n += 1
+
+        if n == 0:
             raise RuntimeError("No component models available for prediction")
 
-        arr = np.vstack(preds)
-        if self.weights and len(self.weights) == arr.shape[0]:
-            w = np.asarray(self.weights).reshape(-1, 1)
-            res = (arr * w).sum(axis=0) / float(w.sum())
-        else:
-            res = arr.mean(axis=0)
-        return res
+        return self._weight_vector(n) @ out[:n]
 
     def save(self, path: str) -> None:
         payload = {
@@ -179,9 +243,16 @@ class StackingEnsemble:
         if not isinstance(X, _pd.DataFrame):
             X = _pd.DataFrame(X)
         X_vals = X.values
-        preds = _np.vstack([est.predict(X_vals) for _name, est in self.base_models])
-        # shape (n_models, n_samples) -> transpose to (n_samples, n_models)
-        preds_t = preds.T
+        # base predictions written column-wise into the (n_samples, n_models)
+        # meta-feature matrix, no vstack + transpose copy
+        from backend.services.prediction_kernels import map_members
+
+        preds_t = _np.empty((X_vals.shape[0], len(self.base_models)), dtype=_np.float64)
+        preds = map_members([est.predict for _name, est in self.base_models], X_vals)
+        for m_idx, pred in enumerate(preds):
+            if isinstance(pred, Exception):
+                raise pred
+            preds_t[:, m_idx] = pred
         meta_preds = self.meta_model.predict(preds_t)
         return meta_preds
 
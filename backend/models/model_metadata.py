@@ -1,10 +1,12 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, UniqueConstraint
 from backend.db import Base
 
 
 class ModelMetadata(Base):
     __tablename__ = "model_metadata"
+    # matches migration 0010; lets saves upsert on (name, version)
+    __table_args__ = (UniqueConstraint("name", "version", name="uq_model_metadata_name_version"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(128), nullable=False, index=True)
@@ -0,0 +1,74 @@
+"""ONNX Runtime inference wrapper for persisted sklearn models.
+
+`export_onnx` converts a fitted sklearn estimator (including the
+VotingRegressor ensembles built by the training pipeline) with `skl2onnx`;
+`OnnxModel` serves the exported graph through `onnxruntime` behind the usual
+`.predict(X)` interface. Both dependencies are optional: without them
+export returns False and the registry keeps loading the pickled model.
+
+ONNX graphs compute in float32, so predictions can differ from sklearn in
+the last few digits; serving them is opt-in (see `ModelRegistry`).
+"""
+from typing import Optional
+import logging
+import os
+
+import numpy as np
+
+try:
+    import onnxruntime as ort  # type: ignore
+    ONNXRUNTIME_AVAILABLE = True
+except Exception:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from skl2onnx import convert_sklearn  # type: ignore
+    from skl2onnx.common.data_types import FloatTensorType  # type: ignore
+    SKL2ONNX_AVAILABLE = True
+except Exception:
+    convert_sklearn = None
+    FloatTensorType = None
+    SKL2ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def export_onnx(model, path: str, n_features: Optional[int] = None) -> bool:
+    """Write `model` as an ONNX graph with one float input `X` of shape
+    (None, n_features). Returns False when skl2onnx is missing or the model
+    cannot be converted."""
+    if not SKL2ONNX_AVAILABLE:
+        return False
+    n = n_features or getattr(model, "n_features_in_", None)
+    if not n:
+        return False
+    try:
+        onx = convert_sklearn(model, initial_types=[("X", FloatTensorType([None, int(n)]))])
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(onx.SerializeToString())
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        logger.debug("ONNX export failed for %s", path, exc_info=True)
+        return False
+
+
+class OnnxModel:
+    def __init__(self, path: str):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is not available in this environment")
+        self.path = path
+        self._session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        inp = self._session.get_inputs()[0]
+        self._input_name = inp.name
+        width = inp.shape[1] if len(inp.shape) > 1 else None
+        self.n_features_in_ = width if isinstance(width, int) else None
+
+    def predict(self, X) -> np.ndarray:
+        arr = np.ascontiguousarray(X, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        out = self._session.run(None, {self._input_name: arr})[0]
+        return np.asarray(out, dtype=np.float64).reshape(-1)
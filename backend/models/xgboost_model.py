@@ -15,6 +15,16 @@ except Exception:
     XGBOOST_AVAILABLE = False
 
 
+def _as_float32_matrix(X) -> np.ndarray:
+    """Contiguous float32 2-D view of `X` (XGBoost predicts in float32, so
+    this is the copy it would make anyway) for `Booster.inplace_predict`,
+    which skips building a DMatrix per call."""
+    vals = X.values if isinstance(X, pd.DataFrame) else np.asarray(X)
+    if vals.ndim == 1:
+        vals = vals.reshape(-1, 1)
+    return np.ascontiguousarray(vals, dtype=np.float32)
+
+
 class XGBoostModel:
     def __init__(self, params: Optional[dict] = None, num_boost_round: int = 100):
         if not XGBOOST_AVAILABLE:
@@ -51,10 +61,7 @@ class XGBoostModel:
             raise ImportError("xgboost is not available in this environment")
         if self.booster is None:
             raise RuntimeError("model not trained or loaded")
-        if not isinstance(X, pd.DataFrame):
-            X = pd.DataFrame(X)
-        dmat = xgb.DMatrix(X.values)
-        return self.booster.predict(dmat)
+        return self.booster.inplace_predict(_as_float32_matrix(X))
 
     def compute_shap(self, X: pd.DataFrame):
         """Compute SHAP values for given `X` if `shap` is available.
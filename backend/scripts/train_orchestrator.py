@@ -28,11 +28,24 @@ import numpy as np
 import pandas as pd
 
 from backend.services.training_pipeline import train_player_model
-from backend.services.model_registry import ModelRegistry
+from backend.services.model_registry import get_registry
 
 import multiprocessing
 from typing import Optional
 
+# out_dir -> CalibrationService, built once per process and reused for every
+# player that process trains (each pool worker keeps its own).
+_CALIBRATION_SERVICES: dict = {}
+
+
+def _calibration_service(out_dir: str):
+    svc = _CALIBRATION_SERVICES.get(out_dir)
+    if svc is None:
+        from backend.services import calibration_service as calib_mod
+
+        svc = _CALIBRATION_SERVICES[out_dir] = calib_mod.CalibrationService(model_dir=out_dir)
+    return svc
+
 
 def _train_worker(kwargs: dict) -> dict:
     """Top-level worker function for multiprocessing. Receives a kwargs dict
@@ -45,8 +58,6 @@ def _train_worker(kwargs: dict) -> dict:
 
     try:
         # local imports inside worker
-        from backend.services.model_registry import ModelRegistry
-        from backend.services import calibration_service as calib_mod
         import joblib
 
         m_path = Path(manifest)
@@ -128,7 +139,9 @@ def _train_worker(kwargs: dict) -> dict:
 
         model = train_player_model(train_for_model, target_col="target")
 
-        registry = ModelRegistry(model_dir=str(out_dir))
+        # shared per process (and with the calibration service) instead of a
+        # fresh registry per player
+        registry = get_registry(str(out_dir))
         registry.save_model(player, model, version=None, notes="orchestrator-parallel")
 
         # persist selected features list if present
@@ -145,7 +158,7 @@ def _train_worker(kwargs: dict) -> dict:
         if fit_calibrator and val_df.shape[0] >= 3:
             try:
                 # ensure calibrator is saved to the same model_dir used by the orchestrator
-                calib = calib_mod.CalibrationService(model_dir=str(out_dir))
+                calib = _calibration_service(str(out_dir))
                 # assemble validation features and align to model's expected feature names
                 X_val = val_df[feat_cols].copy()
                 # attempt to reorder/add missing cols according to model.feature_names_in_
@@ -196,6 +209,10 @@ def _train_worker(kwargs: dict) -> dict:
         }
     except Exception as e:
         return {"player": player, "status": "failed", "error": str(e)}
+    finally:
+        # pool workers are terminated without running atexit hooks, so the
+        # metadata rows save_model queued are written before the task returns
+        get_registry(str(out_dir)).flush(timeout=None)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -245,8 +262,6 @@ def main(manifest: str, min_games: int, out_dir: str, report_csv: str, limit: in
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    registry = ModelRegistry(model_dir=str(out_dir))
-
     # prepare worker kwargs
     worker_kwargs = []
     for player in candidates:
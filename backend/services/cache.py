@@ -13,6 +13,8 @@ import os
 import json
 import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 from typing import Any, Optional
 
 try:
@@ -122,7 +124,7 @@ async def redis_set_json(key: str, obj: Any, ex: Optional[int] = None) -> bool:
         async with _fallback_lock:
             _fallback_store[key] = {"v": json.dumps(obj), "e": None}
             if ex:
-                _fallback_store[key]["e"] = asyncio.get_event_loop().time() + ex
+                _fallback_store[key]["e"] = asyncio.get_running_loop().time() + ex
         _inc_metric("sets")
         return True
 
@@ -165,7 +167,7 @@ async def redis_get_json(key: str) -> Optional[Any]:
 
         # item shape: {"v": json_str, "e": expiry_ts_or_None}
         expires = item.get("e")
-        now = asyncio.get_event_loop().time()
+        now = asyncio.get_running_loop().time()
         if expires is not None and now > expires:
             # remove expired entry
             try:
@@ -193,7 +195,7 @@ async def _fallback_cleanup_loop(interval_seconds: int = 60):
         while True:
             await asyncio.sleep(interval_seconds)
             try:
-                now = asyncio.get_event_loop().time()
+                now = asyncio.get_running_loop().time()
                 async with _fallback_lock:
                     # Remove expired keys
                     keys = list(_fallback_store.keys())
@@ -233,9 +235,8 @@ def start_fallback_cleanup_task(interval_seconds: Optional[int] = None) -> None:
     global _fallback_cleanup_task
     if _fallback_cleanup_task is not None and not _fallback_cleanup_task.done():
         return
-    loop = None
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
     except RuntimeError:
         # no running loop in caller; caller should schedule task later
         return
@@ -426,6 +427,133 @@ def redis_delete_prefix_sync(prefix: str) -> int:
         return deleted
 
 
+def _glob_escape(text: str) -> str:
+    """Escape Redis MATCH glob characters so a prefix is matched literally."""
+    for ch in ("\\", "*", "?", "[", "]"):
+        text = text.replace(ch, "\\" + ch)
+    return text
+
+
+def _scan_groups(prefixes: tuple) -> dict:
+    """Group `prefixes` by namespace (the text up to the first ':'); each
+    group is walked with one `SCAN MATCH <common prefix>*`. Merging across
+    namespaces would widen the pattern, e.g. `predict:X:` and
+    `player_context:X:` share only `p`, which matches every player's keys."""
+    groups: dict = {}
+    for p in prefixes:
+        groups.setdefault(p.split(":", 1)[0], []).append(p)
+    return {_glob_escape(os.path.commonprefix(g)) + "*": tuple(g) for g in groups.values()}
+
+
+def _unlink_redis_prefixes(prefixes: tuple, batch_size: int) -> int:
+    """Redis half of `invalidate_prefixes_sync`; returns keys unlinked."""
+    try:
+        import redis as sync_redis
+    except Exception:
+        return 0
+
+    url = os.environ.get("REDIS_URL") or "redis://127.0.0.1:6379/0"
+    try:
+        client = sync_redis.from_url(url, decode_responses=True)
+        client.ping()
+    except Exception as e:
+        _logger.debug("redis unavailable for prefix invalidation: %s", e)
+        return 0
+    deleted = 0
+    try:
+        pipe = client.pipeline(transaction=False)
+        queued = False
+        batch = []
+        for match, group in _scan_groups(prefixes).items():
+            for k in client.scan_iter(match=match, count=batch_size):
+                if not k.startswith(group):
+                    continue
+                batch.append(k)
+                if len(batch) >= batch_size:
+                    pipe.unlink(*batch)
+                    queued = True
+                    batch = []
+        if batch:
+            pipe.unlink(*batch)
+            queued = True
+        if queued:
+            deleted = sum(int(n or 0) for n in pipe.execute())
+    except Exception as e:
+        _logger.debug("redis prefix invalidation failed: %s", e)
+    _inc_metric("deletes", deleted)
+    return deleted
+
+
+# Single worker for background Redis invalidations (see
+# `invalidate_prefixes_sync(background=True)`), created on first use.
+_invalidation_pool: Optional[ThreadPoolExecutor] = None
+_invalidation_lock = threading.Lock()
+_pending_invalidations: set = set()
+
+
+def _reset_invalidation_pool() -> None:
+    # a forked child inherits the executor object but not its thread, so
+    # work submitted to it would never run; start afresh on first use
+    global _invalidation_pool, _invalidation_lock, _pending_invalidations
+    _invalidation_pool = None
+    _invalidation_lock = threading.Lock()
+    _pending_invalidations = set()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_invalidation_pool)
+
+
+def invalidate_prefixes_sync(prefixes, batch_size: int = 500, background: bool = False) -> int:
+    """Delete every key starting with any of `prefixes`, for sync callers.
+
+    The in-memory fallback store is swept once for all prefixes. With a
+    reachable Redis a single client runs one `SCAN MATCH <common prefix>*`
+    per key namespace (the longest prefix shared by the prefixes in that
+    namespace, see `_scan_groups`), filtered client-side with
+    `str.startswith`, and matching keys are
+    removed with UNLINK in batches of `batch_size`, queued on one pipeline
+    and sent with a single EXECUTE. Returns the number of keys deleted.
+
+    With `background=True` only the fallback sweep happens before returning
+    (and only its deletions are counted); the Redis round trips run on a
+    worker thread. `flush_invalidations` waits for them.
+    """
+    global _invalidation_pool
+    prefixes = tuple(prefixes)
+    if not prefixes:
+        return 0
+
+    # one pass over the fallback store (plain dict ops, safe with or without
+    # a running event loop in this thread)
+    stale = [k for k in list(_fallback_store.keys()) if k.startswith(prefixes)]
+    for k in stale:
+        _fallback_store.pop(k, None)
+    deleted = len(stale)
+    _inc_metric("deletes", deleted)
+
+    if not background:
+        return deleted + _unlink_redis_prefixes(prefixes, batch_size)
+    with _invalidation_lock:
+        if _invalidation_pool is None:
+            _invalidation_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-invalidate")
+        fut = _invalidation_pool.submit(_unlink_redis_prefixes, prefixes, batch_size)
+        _pending_invalidations.add(fut)
+    fut.add_done_callback(_pending_invalidations.discard)
+    return deleted
+
+
+def flush_invalidations(timeout: Optional[float] = 10.0) -> bool:
+    """Wait for background Redis invalidations (at most `timeout` seconds,
+    None waits indefinitely). Returns True when none are left pending."""
+    with _invalidation_lock:
+        pending = list(_pending_invalidations)
+    if not pending:
+        return True
+    _, not_done = futures_wait(pending, timeout=timeout)
+    return not not_done
+
+
 def get_cache_metrics() -> dict:
     """Return current cache metrics snapshot."""
     return dict(_metrics)
@@ -5,6 +5,7 @@ model predictions to observed targets. Calibrators are saved/loaded via
 `ModelRegistry.save_calibrator` for persistence alongside models.
 """
 from __future__ import annotations
+from collections import OrderedDict
 from typing import Optional
 import logging
 import joblib
@@ -12,6 +13,7 @@ import os
 import datetime
 from datetime import timezone
 import json
+import math
 
 import numpy as np
 from sklearn.isotonic import IsotonicRegression
@@ -24,10 +26,15 @@ logger = logging.getLogger(__name__)
 
 class CalibrationService:
     def __init__(self, model_dir: Optional[str] = None):
-        # Use ModelRegistry for persistence
-        from backend.services.model_registry import ModelRegistry
+        # Use the shared ModelRegistry for persistence
+        from backend.services.model_registry import get_registry
 
-        self.registry = ModelRegistry(model_dir=model_dir) if model_dir else ModelRegistry()
+        self.registry = get_registry(model_dir) if model_dir else get_registry()
+        # player -> (calibrator, bound 1-D apply fn, fn also takes a float);
+        # rebound only when the registry hands back a different calibrator.
+        # Capped like the registry's LRU so it never pins evicted calibrators.
+        self._bound = OrderedDict()
+        self._bound_cap = getattr(self.registry, '_model_cache_size', 128)
 
     def fit_calibrator(self, y_true: np.ndarray, y_pred: np.ndarray, method: str = 'isotonic'):
         """Fit a calibrator mapping y_pred -> y_true.
@@ -122,12 +129,11 @@ class CalibrationService:
         # Attempt to persist calibration metrics into model_metadata table
         try:
             from backend.models.model_metadata import ModelMetadata  # local import
-            from backend.services.model_registry import _sync_db_url
-            from sqlalchemy import create_engine
+            from backend.services.model_registry import _get_engine, _sync_db_url
 
             raw_db = os.environ.get('DATABASE_URL')
             sync_url = _sync_db_url(raw_db)
-            engine = create_engine(sync_url, future=True)
+            engine = _get_engine(sync_url)
             notes = json.dumps({'calibration_method': method, 'before': before, 'after': after})
             # Use calibrator path if available
             try:
@@ -154,22 +160,72 @@ class CalibrationService:
         return self.registry.load_calibrator(player_name)
 
     def calibrate(self, player_name: str, preds):
+        """Apply the persisted calibrator for `player_name` to `preds`.
+
+        `preds` may be a scalar, a 1-D array of raw predictions (one
+        vectorized call for all of them) or an already 2-D feature
+        matrix. Returns an ndarray (a float for scalar input).
+        """
         calib = self.load_calibrator(player_name)
         if calib is None:
             raise ValueError(f'No calibrator found for {player_name}')
+        bound = self._bound.get(player_name)
+        if bound is None or bound[0] is not calib:
+            bound = (calib, *_bind_calibrator(calib))
+            self._bound[player_name] = bound
+            while len(self._bound) > self._bound_cap:
+                self._bound.popitem(last=False)
+        self._bound.move_to_end(player_name)
+        _, fn, scalar_ok = bound
+        if fn is None:
+            return None
+        if scalar_ok and isinstance(preds, (int, float, np.number)):
+            # one raw prediction through a parametric calibrator: no arrays
+            out = float(fn(float(preds)))
+            if not math.isfinite(out):
+                logger.error('Failed to apply calibrator for %s: non-finite value', player_name)
+                raise ValueError('calibrator produced non-finite values')
+            return out
+        arr = np.ascontiguousarray(preds, dtype=np.float64)
         try:
-            import numpy as _np
-
-            arr = _np.asarray(preds)
-            # handle linear vs isotonic by shape expectations
-            if hasattr(calib, 'predict'):
-                if arr.ndim == 1:
-                    try:
-                        return calib.predict(arr)
-                    except Exception:
-                        return calib.predict(arr.reshape(-1, 1))
-                else:
-                    return calib.predict(arr)
+            if arr.ndim > 1:
+                out = calib.predict(arr)
+            else:
+                out = fn(arr.reshape(-1))
+            out = np.asarray(out, dtype=np.float64)
+            if not np.isfinite(out).all():
+                raise ValueError('calibrator produced non-finite values')
         except Exception:
             logger.exception('Failed to apply calibrator for %s', player_name)
             raise
+        return float(out[0]) if arr.ndim == 0 else out
+
+
+def _bind_calibrator(calib):
+    """Pick, once per calibrator, how to run it over a 1-D array.
+
+    The two calibrators produced by `fit_calibrator` are applied from their
+    fitted parameters (an affine map for LinearRegression, `np.interp` over
+    the thresholds for clipping IsotonicRegression), which matches their
+    `predict` without sklearn's per-call input validation. Other estimators
+    fitted on a single column (`n_features_in_ == 1`) get `x` as shape
+    (n, 1), the rest get the flat array.
+
+    Returns `(fn, scalar_ok)`, where `scalar_ok` says `fn` also maps a plain
+    float (true for the two parametric forms); `fn` is None when `calib` has
+    no `predict`.
+    """
+    if not hasattr(calib, 'predict'):
+        return None, False
+    if type(calib) is LinearRegression and np.ndim(calib.coef_) == 1 and np.size(calib.coef_) == 1:
+        coef = float(calib.coef_[0])
+        intercept = float(calib.intercept_)
+        return (lambda x: x * coef + intercept), True
+    if type(calib) is IsotonicRegression and calib.out_of_bounds == 'clip' and hasattr(calib, 'X_thresholds_'):
+        xs = np.asarray(calib.X_thresholds_, dtype=np.float64)
+        ys = np.asarray(calib.y_thresholds_, dtype=np.float64)
+        if xs.shape[0] > 1:
+            return (lambda x: np.interp(x, xs, ys)), True
+    if getattr(calib, 'n_features_in_', None) == 1:
+        return (lambda x: calib.predict(x.reshape(-1, 1))), False
+    return calib.predict, False
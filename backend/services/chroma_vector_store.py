@@ -41,6 +41,13 @@ class ChromaVectorStore:
         # chroma expects lists for ids/embeddings/metadata
         self.collection.add(ids=[id], embeddings=[embedding], metadatas=[metadata or {}], documents=[metadata.get('text') if metadata and 'text' in metadata else ''])
 
+    def add_many(self, ids: List[str], embeddings: List[List[float]], metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        metas = [m or {} for m in (metadatas or [None] * len(ids))]
+        self.collection.add(ids=list(ids), embeddings=list(embeddings), metadatas=metas, documents=[m.get('text', '') for m in metas])
+
+    def extend(self, ids: List[str], embeddings: Any, metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        self.add_many(ids, [list(map(float, row)) for row in embeddings], metadatas)
+
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
         res = self.collection.query(query_embeddings=[query_embedding], n_results=top_k)
         # res contains keys: 'ids', 'distances', 'metadatas'
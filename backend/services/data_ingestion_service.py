@@ -108,11 +108,10 @@ def invalidate_player_contexts(player_names: List[str]) -> None:
         logger.debug("cache module not available for invalidation")
         return
 
-    for p in player_names:
-        try:
-            cache_module.redis_delete_prefix_sync(f"player_context:{p}:")
-        except Exception:
-            logger.exception("Failed to invalidate player_context cache for %s", p)
+    try:
+        cache_module.invalidate_prefixes_sync([f"player_context:{p}:" for p in player_names])
+    except Exception:
+        logger.exception("Failed to invalidate player_context cache for %s", player_names)
 
 
 def invalidate_all_player_contexts() -> None:
@@ -1,15 +1,19 @@
 import json
+import os
 from pathlib import Path
 import shutil
 import datetime
 from typing import Optional, List
 
+from backend.services.training_data_service import _utc_now_iso
+
 
 def register_manifest(manifest_path: str, registry_dir: str = 'backend/models_store/datasets') -> Optional[dict]:
     """Register an exported dataset (the directory containing `manifest.json`) into a central registry.
 
     Copies the dataset directory into `registry_dir/{name}/{version}_{uid}/` and
-    updates `registry_dir/index.json` with a record for quick lookup.
+    records it in the registry index (`index.json` plus the `index.jsonl`
+    journal) for quick lookup.
     Returns the registered manifest dict with an added `_registry_path` key on success,
     or None on failure.
     """
@@ -42,51 +46,108 @@ def register_manifest(manifest_path: str, registry_dir: str = 'backend/models_st
         # update manifest path to point to new location
         manifest['_registry_path'] = str(dest_dir)
 
-        # update central index
-        index_path = dest_root / 'index.json'
-        index = []
-        if index_path.exists():
-            try:
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    index = json.load(f) or []
-            except Exception:
-                index = []
-
-        # remove any existing entry with same name+version+uid
-        index = [e for e in index if not (e.get('name') == name and e.get('version') == version and e.get('uid') == uid)]
+        # record in the central index (one journal line, see _append_index)
         entry = {
             'name': name,
             'version': version,
             'uid': uid,
-            'created_at': manifest.get('created_at') or datetime.datetime.now(datetime.timezone.utc).isoformat() + 'Z',
+            'created_at': manifest.get('created_at') or _utc_now_iso(),
             'rows': manifest.get('rows', 0),
             'columns': manifest.get('columns', []),
             '_registry_path': str(dest_dir)
         }
-        index.append(entry)
-        # sort by created_at
-        try:
-            index.sort(key=lambda x: x.get('created_at') or '')
-        except Exception:
-            pass
-
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, default=str)
+        _append_index(dest_root, entry)
 
         return manifest
     except Exception:
         return None
 
 
-def list_registered(name: Optional[str] = None, registry_dir: str = 'backend/models_store/datasets') -> List[dict]:
-    idx = Path(registry_dir) / 'index.json'
-    if not idx.exists():
-        return []
+# The registry index is `index.json` (a snapshot, sorted by created_at) plus
+# `index.jsonl`, an append-only journal of entries registered since. Each
+# registration appends and fsyncs one line instead of rewriting the whole
+# index; every _COMPACT_EVERY lines the journal is folded into a new
+# snapshot and truncated.
+_COMPACT_EVERY = 64
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        # datetimes passed through to str() so output matches json.dumps(default=str)
+        opt = orjson.OPT_PASSTHROUGH_DATETIME | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=str, option=opt)
+except Exception:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, default=str).encode('utf-8')
+
+
+def _entry_key(e: dict):
+    return (e.get('name'), e.get('version'), e.get('uid'))
+
+
+def _load_index(root: Path) -> List[dict]:
+    entries: List[dict] = []
+    idx = root / 'index.json'
+    if idx.exists():
+        try:
+            entries = _json_loads(idx.read_bytes()) or []
+        except Exception:
+            entries = []
+    journal = root / 'index.jsonl'
+    if journal.exists():
+        latest = {_entry_key(e): e for e in entries}
+        for line in journal.read_bytes().splitlines():
+            try:
+                e = _json_loads(line)
+            except ValueError:
+                continue  # torn final line from an interrupted append
+            # a re-registered name+version+uid replaces the earlier entry
+            latest.pop(_entry_key(e), None)
+            latest[_entry_key(e)] = e
+        entries = list(latest.values())
     try:
-        with open(idx, 'r', encoding='utf-8') as f:
-            entries = json.load(f) or []
+        entries.sort(key=lambda x: x.get('created_at') or '')
     except Exception:
-        return []
+        pass
+    return entries
+
+
+def _append_index(root: Path, entry: dict) -> None:
+    line = _json_dumps(entry) + b'\n'
+    with open(root / 'index.jsonl', 'a+b') as f:
+        f.seek(0)
+        journal = f.read()  # at most _COMPACT_EVERY lines
+        if journal and not journal.endswith(b'\n'):
+            line = b'\n' + line  # keep a torn last line from swallowing this one
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    if journal.count(b'\n') + 1 >= _COMPACT_EVERY:
+        _compact_index(root)
+
+
+def _compact_index(root: Path) -> None:
+    """Fold the journal into index.json (written atomically), then truncate
+    it. Replaying a journal that was already folded in is harmless."""
+    entries = _load_index(root)
+    idx = root / 'index.json'
+    tmp = root / f'index.json.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps(entries, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, idx)
+    with open(root / 'index.jsonl', 'w', encoding='utf-8'):
+        pass
+
+
+def list_registered(name: Optional[str] = None, registry_dir: str = 'backend/models_store/datasets') -> List[dict]:
+    entries = _load_index(Path(registry_dir))
     if name:
         return [e for e in entries if e.get('name') == name]
     return entries
@@ -167,7 +228,7 @@ def create_dataset_version(name: str, seasons: str, df_train: pd.DataFrame, df_v
         'name': base_name,
         'version': version,
         'uid': uid,
-        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat() + 'Z',
+        'created_at': _utc_now_iso(),
         'seasons': seasons,
         'rows_train': int(len(df_train)),
         'rows_val': int(len(df_val)),
@@ -190,7 +251,9 @@ def create_dataset_version(name: str, seasons: str, df_train: pd.DataFrame, df_v
     sync_url = _make_sync_db_url(db_url or '')
     if sync_url and create_engine is not None:
         try:
-            engine = create_engine(sync_url)
+            from backend.services.model_registry import _get_engine
+
+            engine = _get_engine(sync_url)
             with engine.begin() as conn:
                 insert_sql = text(
                     """
@@ -24,9 +24,17 @@ from __future__ import annotations
 
 from typing import Dict, Any, List, Optional
 import numpy as np
+import pandas as pd
 import math
 from datetime import datetime
 
+# Opt-in to pandas future behavior to avoid the downcasting warning during fillna
+try:
+    pd.set_option('future.no_silent_downcasting', True)
+except Exception:
+    # Older pandas versions may not provide this option; ignore failures.
+    pass
+
 
 def recent_stats_from_games(
     recent_games: List[Dict[str, Any]], stat_field: str = "statValue"
@@ -41,7 +49,6 @@ def recent_stats_from_games(
     Returns:
         A dictionary with keys: ``mean``, ``median``, ``std``, ``sample_size``
         and ``trend_slope``. Numeric values are floats; when no samples
-                    'trade_sentiment': float(llm_feats.get('trade_sentiment') or llm_feats.get('trade_sent') or 0.0),
         exist the mean/median/std/trend_slope values are ``None`` and
         ``sample_size`` is 0.
 
@@ -223,311 +230,87 @@ def _add_contextual_features(features: Dict[str, Any], player_ctx: Dict[str, Any
     features["travel_distance_km"] = travel_km
     features["opp_altitude_m"] = opp_alt
     features["is_high_altitude_opp"] = 1 if opp_alt >= 1000 else 0
-
-    # Add contextual Phase 3 features (playoff, rivalry, national TV, travel, altitude)
-    try:
-        _add_contextual_features(features, player_context, None)
-    except Exception:
-        pass
     return features
 
-# -------------------------------------------------------------------------
-
-
-def engineer_features(player_context: Dict[str, Any]) -> Dict[str, Any]:
-    """High-level feature engineering wrapper returning a flat dict.
-
-    Args:
-        player_context: A mapping representing a player's context. Expected
-            keys include ``recentGames`` (list of game dicts) and
-            optionally ``seasonAvg`` and ``contextualFactors``.
-
-    Returns:
-        A flat dictionary of features suitable for quick model inputs. The
-        returned dict uses simple imputation: missing numeric values are
-        set to ``0.0``. The explicit ``is_back_to_back`` key is provided
-        and derived from ``contextualFactors.daysRest`` (1 when daysRest == 0).
-    """
-    recent = player_context.get("recentGames", []) or []
-    stats = recent_stats_from_games(recent)
-    rolls = rolling_averages(recent)
-
-    features = {
-        "recent_mean": stats["mean"] or player_context.get("seasonAvg"),
-        "recent_median": stats["median"],
-        "recent_std": stats["std"] or 0.0,
-        "sample_size": stats["sample_size"],
-        "trend_slope": stats["trend_slope"] or 0.0,
-        "last3_avg": rolls["last3"] or player_context.get("seasonAvg"),
-        "last5_avg": rolls["last5"] or player_context.get("seasonAvg"),
-        "last10_avg": rolls["last10"] or player_context.get("seasonAvg"),
-        "ema_0_3": rolls["ema_alpha_0_3"] or player_context.get("seasonAvg"),
-        # back-to-back indicator: 1 when daysRest == 0, else 0 (derived from contextualFactors)
-        "is_back_to_back": 1 if (player_context.get("contextualFactors", {}).get("daysRest") == 0) else 0,
-    }
-
-    # Simple imputation for missing numeric values
-    for k, v in list(features.items()):
-        if v is None:
-            features[k] = 0.0
 
-    # Multi-season aggregated features (if provided by backend context)
-    multi_adv = player_context.get("advancedStatsMulti") or {}
-    multi_season_stats = player_context.get("seasonStatsMulti") or {}
-    try:
-        adv_agg = multi_adv.get("aggregated", {}) if isinstance(multi_adv, dict) else {}
-    except Exception:
-        adv_agg = {}
+def _stat_column(recent_games: List[Dict], stat_field: str = "statValue") -> np.ndarray:
+    """The non-None `stat_field` values of `recent_games` (in list order,
+    newest first) as a float64 array, read in a single pass over the dicts."""
+    return np.fromiter(
+        (v for g in recent_games if (v := g.get(stat_field)) is not None),
+        dtype=np.float64,
+    )
 
-    # seasonStatsMulti is mapping season->stats; compute simple mean across seasons
-    season_agg = {}
-    try:
-        counts = {}
-        sums = {}
-        for s, st in (multi_season_stats or {}).items():
-            if not isinstance(st, dict):
-                continue
-            for k, v in st.items():
-                try:
-                    fv = float(v)
-                except Exception:
-                    continue
-                sums[k] = sums.get(k, 0.0) + fv
-                counts[k] = counts.get(k, 0) + 1
-        for k, total in sums.items():
-            season_agg[k] = total / float(counts.get(k, 1))
-    except Exception:
-        season_agg = {}
-
-    features.update({
-        # prefer canonical advanced fields, fall back to computed proxies when present
-        "multi_PER": float(adv_agg.get("PER") or adv_agg.get("PER_proxy") or 0.0),
-        "multi_WS": float(adv_agg.get("WS") or adv_agg.get("WS_proxy_per_game") or 0.0),
-        "multi_TS_PCT": float(adv_agg.get("TS_PCT") or 0.0),
-        "multi_USG_PCT": float(adv_agg.get("USG_PCT") or 0.0),
-        "multi_season_PTS_avg": float(season_agg.get("PTS") or 0.0),
-        "multi_season_count": int(len(multi_season_stats)) if isinstance(multi_season_stats, dict) else 0,
-    })
-    # Include multi-season BPM when available (or 0.0)
-    try:
-        multi_bpm = adv_agg.get("BPM") or adv_agg.get("BPM_48") or adv_agg.get("BPM_approx") or 0.0
-    except Exception:
-        multi_bpm = 0.0
-    features.update({
-        "multi_BPM": float(multi_bpm),
-    })
-    # Additional advanced/team aggregated metrics
-    features.update({
-        "multi_PIE": float(adv_agg.get("PIE") or 0.0),
-        "multi_off_rating": float(adv_agg.get("OFF_RATING") or 0.0),
-        "multi_def_rating": float(adv_agg.get("DEF_RATING") or 0.0),
-    })
-
-    # Attempt league-level normalization (z-score) for advanced stats when
-    # a season can be inferred from the provided multi-season stats. This
-    # helps make proxies more comparable across players and seasons.
-    try:
-        from backend.services import nba_stats_client as _nba
-
-        season_to_use = None
-        if isinstance(multi_season_stats, dict) and len(multi_season_stats) > 0:
-            # pick most recent season key if available
-            try:
-                season_to_use = list(multi_season_stats.keys())[0]
-            except Exception:
-                season_to_use = None
-
-        if season_to_use:
-            league_map = _nba.fetch_league_player_advanced(season_to_use)
-            if league_map:
-                # compute league mean/std for PER and TS_PCT when available
-                per_vals = []
-                ts_vals = []
-                pts_vals = []
-                for pid, stats in league_map.items():
-                    try:
-                        if 'PER' in stats:
-                            per_vals.append(float(stats['PER']))
-                    except Exception:
-                        pass
-                    try:
-                        if 'TS_PCT' in stats:
-                            ts_vals.append(float(stats['TS_PCT']))
-                    except Exception:
-                        pass
-                    try:
-                        # some league mappings include per-game PTS under other keys; skip if absent
-                        if 'PTS' in stats:
-                            pts_vals.append(float(stats['PTS']))
-                    except Exception:
-                        pass
-
-                import math
-                def _z(v, vals):
-                    try:
-                        if v is None:
-                            return 0.0
-                        if not vals:
-                            return 0.0
-                        mean = float(sum(vals) / len(vals))
-                        var = float(sum((x - mean) ** 2 for x in vals) / len(vals))
-                        std = math.sqrt(var) if var > 0.0 else 0.0
-                        return float((v - mean) / std) if std > 0.0 else 0.0
-                    except Exception:
-                        return 0.0
 
-                # produce z-scored features for PER and TS_PCT
-                try:
-                    features['multi_PER_z'] = _z(features.get('multi_PER'), per_vals)
-                except Exception:
-                    features['multi_PER_z'] = 0.0
-                try:
-                    features['multi_TS_pct_z'] = _z(features.get('multi_TS_PCT'), ts_vals)
-                except Exception:
-                    features['multi_TS_pct_z'] = 0.0
-    except Exception:
-        # non-fatal; if normalization fails just continue with raw features
-        pass
-    # Player-context features (contract year, All-Star, recent awards, trade sentiment)
-    try:
-        # contract end year heuristics
-        contract = player_context.get('contract') or {}
-        end_year = contract.get('end_year') or contract.get('contractEndYear') or player_context.get('contractEndYear')
-        current_year = datetime.now().year
-        is_contract_year = 0
-        try:
-            if end_year is not None:
-                if int(end_year) in (current_year, current_year + 1):
-                    is_contract_year = 1
-        except Exception:
-            is_contract_year = 0
-        features['is_contract_year'] = is_contract_year
-
-        # All-Star indicator
-        is_all_star = 1 if (player_context.get('isAllStar') or player_context.get('allStar') or player_context.get('all_star')) else 0
-        features['is_all_star'] = is_all_star
-
-        # Recent awards count (list expected under 'awards')
-        awards = player_context.get('awards') or []
-        try:
-            features['recent_awards_count'] = int(len(awards))
-        except Exception:
-            features['recent_awards_count'] = 0
-
-        # Trade rumor / transfer sentiment from existing LLM extraction if available
-        # Reuse previously-extracted llm_feats when present in player_context
-        llm_feats = player_context.get('llm_features') or {}
-        trade_sent = 0.0
-        try:
-            trade_sent = float(llm_feats.get('trade_sentiment') or llm_feats.get('trade_sent') or 0.0)
-        except Exception:
-            trade_sent = 0.0
-        features['trade_sentiment'] = trade_sent
-    except Exception:
-        # non-fatal
-        features['is_contract_year'] = 0
-        features['is_all_star'] = 0
-        features['recent_awards_count'] = 0
-        features['trade_sentiment'] = 0.0
-
-    # Add contextual Phase 3 features (playoff, rivalry, national TV, travel, altitude)
-    try:
-        _add_contextual_features(features, player_context, None)
-    except Exception:
-        pass
-
-    return features
-    
-"""Feature engineering helpers for player predictions.
-
-This module provides lightweight functions used by the ML service and
-eventually the training pipeline. Keep functions pure and data-frame
-friendly so they can be tested independently.
-"""
-from typing import List, Dict, Optional
-import numpy as np
-import pandas as pd
-
-# Opt-in to pandas future behavior to avoid the downcasting warning during fillna
-try:
-    pd.set_option('future.no_silent_downcasting', True)
-except Exception:
-    # Older pandas versions may not provide this option; ignore failures.
-    pass
+def calculate_rolling_averages(recent_games: List[Dict], windows: List[int] = [3, 5, 10]) -> Dict:
+    return _rolling_from_values(_stat_column(recent_games), windows)
 
 
-def calculate_rolling_averages(recent_games: List[Dict], windows: List[int] = [3, 5, 10]) -> Dict:
-    values = [g.get("statValue") for g in recent_games if g.get("statValue") is not None]
+def _rolling_from_values(values: np.ndarray, windows: List[int] = [3, 5, 10]) -> Dict:
+    """`calculate_rolling_averages` over an already extracted stat column."""
+    n = values.shape[0]
     out = {}
     for w in windows:
-        if w > 0 and len(values) > 0:
-            slice_vals = values[:w] if len(values) >= w else values[: len(values)]
-            out[f"last_{w}_avg"] = float(np.mean(slice_vals))
+        if w > 0 and n > 0:
+            out[f"last_{w}_avg"] = float(values[:w].mean())
         else:
             out[f"last_{w}_avg"] = None
 
     # exponential moving average
-    if values:
+    if n:
         alpha = 0.3
-        ema = values[0]
-        for v in values[1:]:
+        seq = values.tolist()
+        ema = seq[0]
+        for v in seq[1:]:
             ema = alpha * v + (1 - alpha) * ema
         out["exponential_moving_avg"] = float(ema)
     else:
         out["exponential_moving_avg"] = None
 
     # weighted moving average (more weight to recent games)
-    def weighted_moving_avg(vals: List[float], window: int) -> Optional[float]:
-        if not vals or window <= 0:
+    def weighted_moving_avg(window: int) -> Optional[float]:
+        if not n or window <= 0:
             return None
-        window_len = min(window, len(vals))
-        slice_vals = vals[:window_len]
+        window_len = min(window, n)
         weights = np.arange(window_len, 0, -1)
-        wsum = float(np.dot(slice_vals, weights))
+        wsum = float(np.dot(values[:window_len], weights))
         denom = float(weights.sum())
         return float(wsum / denom) if denom != 0.0 else None
 
-    out["wma_3"] = weighted_moving_avg(values, 3)
-    out["wma_5"] = weighted_moving_avg(values, 5)
+    out["wma_3"] = weighted_moving_avg(3)
+    out["wma_5"] = weighted_moving_avg(5)
 
-    # rolling statistics: std, min, max, median over windows
+    # rolling statistics: std, min, max, median over windows (one sort each)
     for w in windows:
         key_base = f"last_{w}"
-        if len(values) >= 1:
-            slice_vals = values[:w] if len(values) >= w else values[:len(values)]
-            arr = np.array(slice_vals, dtype=float)
-            out[f"{key_base}_std"] = float(arr.std(ddof=0)) if arr.size > 0 else None
-            out[f"{key_base}_min"] = float(arr.min()) if arr.size > 0 else None
-            out[f"{key_base}_max"] = float(arr.max()) if arr.size > 0 else None
-            out[f"{key_base}_median"] = float(np.median(arr)) if arr.size > 0 else None
+        arr = values[:w] if n else values
+        if arr.size > 0:
+            srt = np.sort(arr)
+            mid = arr.size // 2
+            out[f"{key_base}_std"] = float(arr.std(ddof=0))
+            out[f"{key_base}_min"] = float(srt[0])
+            out[f"{key_base}_max"] = float(srt[-1])
+            out[f"{key_base}_median"] = float(srt[mid]) if arr.size % 2 else float((srt[mid - 1] + srt[mid]) / 2.0)
         else:
             out[f"{key_base}_std"] = None
             out[f"{key_base}_min"] = None
             out[f"{key_base}_max"] = None
             out[f"{key_base}_median"] = None
 
-    # trend slope (linear regression) over last 10 games (or available)
-    def linear_slope(vals: List[float], window: int = 10) -> Optional[float]:
-        if not vals:
-            return None
-        slice_vals = vals[:window]
-        if len(slice_vals) < 2:
-            return 0.0
-        x = np.arange(len(slice_vals))
-        y = np.array(slice_vals, dtype=float)
-        slope, _ = np.polyfit(x, y, 1)
-        return float(slope)
-
-    out["slope_10"] = linear_slope(values, 10)
+    # trend slope (least squares) over last 10 games (or available)
+    if not n:
+        out["slope_10"] = None
+    elif n < 2:
+        out["slope_10"] = 0.0
+    else:
+        y = values[:10]
+        x = np.arange(y.shape[0], dtype=np.float64)
+        x -= x.mean()
+        out["slope_10"] = float(np.dot(x, y - y.mean()) / np.dot(x, x))
 
     # momentum: current (most recent) vs 5-game average
-    if values:
-        current = float(values[0])
-        if len(values) >= 5:
-            five_avg = float(np.mean(values[:5]))
-        else:
-            five_avg = float(np.mean(values))
-        out["momentum_vs_5_avg"] = float(current - five_avg)
+    if n:
+        out["momentum_vs_5_avg"] = float(values[0] - values[:5].mean())
     else:
         out["momentum_vs_5_avg"] = None
 
@@ -535,23 +318,95 @@ def calculate_rolling_averages(recent_games: List[Dict], windows: List[int] = [3
 
 
 def engineer_features(player_data: Dict, opponent_data: Optional[Dict] = None) -> pd.DataFrame:
+    return features_to_frame(engineer_features_dict(player_data, opponent_data))
+
+
+def features_to_frame(features) -> pd.DataFrame:
+    """Build the model input DataFrame from a feature dict (one row) or a
+    list of feature dicts (one row each; missing columns become 0)."""
+    df = pd.DataFrame([features] if isinstance(features, dict) else list(features))
+    # Fill missing values and ensure correct dtypes; call infer_objects to avoid
+    # future downcasting behavior changes in pandas.
+    df = df.fillna(0)
+    try:
+        # Non-fatal: infer_objects will attempt to downcast object dtypes safely.
+        df = df.infer_objects(copy=False)
+    except Exception:
+        # If pandas version doesn't support the option or it fails, continue.
+        pass
+
+    return df
+
+
+def _float_values(values, count: int) -> np.ndarray:
+    """`count` feature values as a float64 vector, with None and NaN set to
+    0.0 as `features_to_frame`'s fillna(0) does."""
+    arr = np.fromiter((0.0 if v is None else v for v in values), dtype=np.float64, count=count)
+    np.copyto(arr, 0.0, where=np.isnan(arr))
+    return arr
+
+
+def features_to_row(features: Dict) -> np.ndarray:
+    """Return the feature dict as a `(1, n)` float64 array in column order.
+
+    Missing values (None or NaN) become 0.0 like `features_to_frame`; raises
+    ValueError or TypeError when a value is not numeric (e.g. a date string),
+    in which case callers should use the DataFrame instead.
+    """
+    return _float_values(features.values(), len(features)).reshape(1, -1)
+
+
+def engineer_features_array(player_data: Dict, opponent_data: Optional[Dict] = None, columns: Optional[List[str]] = None) -> np.ndarray:
+    """Same features as `engineer_features`, as a `(1, n)` float64 array.
+
+    Without `columns` the row follows the feature dict order; with `columns`
+    (e.g. the list a model was trained on) values are placed in that order
+    and absent (or NaN) features are 0.0. Raises ValueError/TypeError on
+    non-numeric values, like `features_to_row`. Intended for inference;
+    training keeps the DataFrame from `engineer_features`.
+    """
+    features = engineer_features_dict(player_data, opponent_data)
+    if columns is None:
+        return features_to_row(features)
+    return _float_values(map(features.get, columns), len(columns)).reshape(1, -1)
+
+
+def features_to_matrix(features: List[Dict]) -> np.ndarray:
+    """Stack feature dicts into an `(n, m)` float64 array in a single
+    `np.fromiter` pass (None and NaN -> 0.0, as `features_to_row`).
+
+    Every dict must have the same keys in the same order (callers check);
+    raises ValueError or TypeError on non-numeric values.
+    """
+    if not features:
+        return np.empty((0, 0), dtype=np.float64)
+    m = len(features[0])
+    flat = _float_values((v for f in features for v in f.values()), len(features) * m)
+    return flat.reshape(len(features), m)
+
+
+def engineer_features_dict(player_data: Dict, opponent_data: Optional[Dict] = None) -> Dict:
+    """Same features as `engineer_features`, as a flat dict (no pandas)."""
     recent = player_data.get("recentGames") or []
-    rolling = calculate_rolling_averages(recent)
+    # the stat column is read from the game dicts once and shared below
+    vals = _stat_column(recent)
+    rolling = _rolling_from_values(vals)
 
+    ctx = player_data.get("contextualFactors") or {}
+    days_rest = ctx.get("daysRest")
     features = {
         "recent_mean": None,
         "recent_std": None,
         "season_avg": player_data.get("seasonAvg"),
-        "is_home": 1 if player_data.get("contextualFactors", {}).get("homeAway") == "home" else 0,
-        "days_rest": player_data.get("contextualFactors", {}).get("daysRest") or 0,
+        "is_home": 1 if ctx.get("homeAway") == "home" else 0,
+        "days_rest": days_rest or 0,
         # explicit back-to-back indicator: 1 when days_rest == 0, else 0
-        "is_back_to_back": 1 if (player_data.get("contextualFactors", {}).get("daysRest") == 0) else 0,
+        "is_back_to_back": 1 if days_rest == 0 else 0,
     }
 
-    vals = [g.get("statValue") for g in recent if g.get("statValue") is not None]
-    if vals:
-        features["recent_mean"] = float(np.mean(vals))
-        features["recent_std"] = float(np.std(vals))
+    if vals.size:
+        features["recent_mean"] = float(vals.mean())
+        features["recent_std"] = float(vals.std())
 
     features.update(rolling)
 
@@ -807,18 +662,7 @@ def engineer_features(player_data: Dict, opponent_data: Optional[Dict] = None) -
         # non-fatal if module not present
         pass
 
-    df = pd.DataFrame([features])
-    # Fill missing values and ensure correct dtypes; call infer_objects to avoid
-    # future downcasting behavior changes in pandas.
-    df = df.fillna(0)
-    try:
-        # Non-fatal: infer_objects will attempt to downcast object dtypes safely.
-        df = df.infer_objects(copy=False)
-    except Exception:
-        # If pandas version doesn't support the option or it fails, continue.
-        pass
-
-    return df
+    return features
 
 
 def _calculate_opponent_adjusted(recent_games: List[Dict], opponent_data: Optional[Dict]) -> Dict:
@@ -910,6 +754,11 @@ class FeatureEngineering:
         """Compatibility shim: returns the same DataFrame as the module-level function."""
         return engineer_features(player_data, opponent_data)
 
+    @staticmethod
+    def engineer_features_array(player_data: Dict, opponent_data: Optional[Dict] = None, columns: Optional[List[str]] = None) -> np.ndarray:
+        """Compatibility shim for the module-level `engineer_features_array`."""
+        return engineer_features_array(player_data, opponent_data, columns)
+
 
 # --- Contextual feature importance & pruning helpers (Phase 3 finalization)
 CONTEXTUAL_FEATURE_KEYS = [
@@ -6,19 +6,209 @@ and validates it with Pydantic. Falls back to simple heuristics on failure.
 """
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
 import json
 import logging
 import os
+import random
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, Optional
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple
 
+import numpy as np
+from cachetools import TTLCache
 from pydantic import BaseModel, Field, ValidationError
 
+try:
+    import requests
+except Exception:
+    requests = None  # type: ignore
+
+_HTTP_SESSION = None
+
+
+def _http_session():
+    """Return the shared keep-alive `requests.Session` for Ollama calls.
+
+    Reusing one pooled session avoids a TCP/TLS handshake per request.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        from requests.adapters import HTTPAdapter
+
+        sess = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=int(os.environ.get('OLLAMA_POOL_MAXSIZE', '32')), max_retries=0)
+        sess.mount('http://', adapter)
+        sess.mount('https://', adapter)
+        _HTTP_SESSION = sess
+    return _HTTP_SESSION
+
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except Exception:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 from backend.services.ollama_client import get_default_client
 from backend.services.vector_store import InMemoryVectorStore
 
 logger = logging.getLogger(__name__)
 
+# Placeholder rows from news fetchers that carry no signal for the LLM. Only
+# text that is entirely one of these (fullmatch) goes straight to the
+# heuristic fallback; real articles mentioning the phrases are untouched.
+_BOILERPLATE_RX = re.compile(
+    r"(no news|no updates?|see wire|nothing to report|n/?a|none)( available| today)?[.!]*",
+    re.IGNORECASE,
+)
+
+# Substring keywords for the heuristic fallbacks, grouped by category.
+_HEURISTIC_KEYWORDS = {
+    'injury': ('injur', 'sprain', 'strain', 'out', 'questionable', 'doubtful'),
+    'morale': ('morale', 'confidence', 'motivated'),
+    'motivation': ('contract', 'extension', 'contract year'),
+    'coaching': ('coach', 'coaching change', 'coach fired', 'coach hired'),
+}
+# One alternation inside a lookahead so every start position is tested in a
+# single C-level scan; the named group reports which category matched.
+_HEURISTIC_RX = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{cat}>{'|'.join(re.escape(k) for k in kws)})" for cat, kws in _HEURISTIC_KEYWORDS.items()
+    ) + ")"
+)
+
+# fetch_news_and_extract result when the fetcher returns no text.
+_EMPTY_NEWS_FEATURES = {
+    'injury_sentiment': 0.0,
+    'morale_score': 0.0,
+    'motivation': 0.0,
+    'coaching_change_impact': 0.0,
+}
+
+# Redis payloads above this size are zlib-compressed (base64 text so the
+# value round-trips through clients created with decode_responses=True).
+_CACHE_COMPRESS_MIN_BYTES = 1024
+_COMPRESSED_PREFIX = "z:"  # keep in sync with the bytes check in _decode_cached
+
+
+def _encode_cached(value: Dict[str, Any]) -> str:
+    raw = _json_dumps(value)
+    if len(raw) < _CACHE_COMPRESS_MIN_BYTES:
+        return raw.decode('utf-8')
+    return _COMPRESSED_PREFIX + base64.b64encode(zlib.compress(raw, 1)).decode('ascii')
+
+
+def _decode_cached(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    if raw.startswith(b"z:"):
+        raw = zlib.decompress(base64.b64decode(raw[2:]))
+    return _json_loads(raw)
+
+
+def _record_cache_metric(hit: bool) -> None:
+    try:
+        from backend.services import metrics
+
+        (metrics.llm_feature_cache_hits_total if hit else metrics.llm_feature_cache_misses_total).inc()
+    except Exception:
+        # metrics should never break main logic
+        pass
+
+
+def _keyword_hits(lower: str) -> set:
+    """Return the set of `_HEURISTIC_KEYWORDS` categories found in `lower`."""
+    hits = set()
+    for m in _HEURISTIC_RX.finditer(lower):
+        hits.add(m.lastgroup)
+        if len(hits) == len(_HEURISTIC_KEYWORDS):
+            break
+    return hits
+
+
+# Lightweight tool descriptor for the LLM to call when it needs fresh web
+# information, compatible with common tool-calling formats (name + JSON
+# Schema `parameters`).
+_WEB_SEARCH_TOOLS = [
+    {
+        "name": "web_search",
+        "description": "Search the web for recent news or quotes; returns plain-text summary.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query"}
+            },
+            "required": ["query"]
+        },
+    }
+]
+
+
+# Where common providers put the generated text (Ollama generate/chat,
+# OpenAI-style chat/completions). Probed before the generic walk.
+_KNOWN_TEXT_PATHS = (
+    ("response",),
+    ("message", "content"),
+    ("choices", 0, "message", "content"),
+    ("choices", 0, "text"),
+    ("outputs", 0, "content"),
+)
+
+
+@lru_cache(maxsize=1024)
+def _build_prompt(text: str) -> str:
+    return (
+        "You are a sports analyst. Given the following short news summary or context,\n"
+        "produce a JSON object only (no extra text) with the keys: injury_status (string), morale_score (int 0-100), news_sentiment (float -1.0..1.0), trade_sentiment (float -1.0..1.0), motivation (float 0.0..1.0).\n"
+        "Respond using valid JSON only.\n\nContext:\n"
+        f"{text}\n\nReturn JSON."
+    )
+
+
+def _find_text(obj: Any) -> Optional[str]:
+    """Return the first non-empty string nested anywhere in `obj`.
+
+    Tries `_KNOWN_TEXT_PATHS` first, then walks dicts/lists depth-first with
+    an explicit stack (no recursion limit on deeply nested payloads).
+    """
+    for path in _KNOWN_TEXT_PATHS:
+        cur = obj
+        for step in path:
+            if isinstance(step, int):
+                cur = cur[step] if isinstance(cur, list) and len(cur) > step else None
+            else:
+                cur = cur.get(step) if isinstance(cur, dict) else None
+            if cur is None:
+                break
+        if isinstance(cur, str) and cur:
+            return cur
+
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, str):
+            if x:
+                return x
+        elif isinstance(x, dict):
+            # reversed so values are visited in their original order
+            stack.extend(reversed(list(x.values())))
+        elif isinstance(x, list):
+            stack.extend(reversed(x))
+    return None
+
 
 class QualitativeFeatures(BaseModel):
     injury_status: str = Field(..., description="Short label for injury status, e.g. 'questionable', 'out', 'healthy'")
@@ -28,27 +218,217 @@ class QualitativeFeatures(BaseModel):
     motivation: float = Field(0.0, description="Motivation score 0..1")
 
 
+def _sse_payloads(blocks: Iterable[Any]) -> Iterator[bytes]:
+    """Yield non-empty SSE/NDJSON payloads (bytes) from raw response blocks.
+
+    Splits on newlines in a reusable bytearray, strips an optional `data:`
+    prefix and stops at the `[DONE]` sentinel, without decoding each line
+    to str first.
+    """
+    buf = bytearray()
+    for block in blocks:
+        if not block:
+            continue
+        buf += block if isinstance(block, (bytes, bytearray)) else str(block).encode('utf-8')
+        start = 0
+        while True:
+            nl = buf.find(b'\n', start)
+            if nl < 0:
+                break
+            line = bytes(buf[start:nl]).strip()
+            start = nl + 1
+            if line.startswith(b'data:'):
+                line = line[5:].lstrip()
+            if line == b'[DONE]':
+                return
+            if line:
+                yield line
+        del buf[:start]
+    line = bytes(buf).strip()
+    if line.startswith(b'data:'):
+        line = line[5:].lstrip()
+    if line and line != b'[DONE]':
+        yield line
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Pydantic v2 validates in its compiled core (and can decode JSON in the same
+# pass); keep the v1 API as a fallback for older deployments.
+_PYDANTIC_V2 = hasattr(QualitativeFeatures, 'model_validate')
+
+
+def _validate_qf(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a dict as `QualitativeFeatures`; raises ValidationError."""
+    if _PYDANTIC_V2:
+        return QualitativeFeatures.model_validate(obj).model_dump()
+    return QualitativeFeatures.parse_obj(obj).dict()
+
+
+def _validate_qf_json(resp: Any) -> Optional[Dict[str, Any]]:
+    """Decode and validate a JSON text response in one step, or return None."""
+    if not _PYDANTIC_V2 or not isinstance(resp, (str, bytes)):
+        return None
+    try:
+        return QualitativeFeatures.model_validate_json(resp).model_dump()
+    except (ValidationError, ValueError):
+        return None
+
+
+# Accepted key spellings per QualitativeFeatures field, in priority order,
+# with the default used when none of them is present.
+_FIELD_ALIASES = (
+    ('injury_status', ('injury_status', 'injury', 'injuryStatus'), 'healthy', str),
+    ('morale_score', ('morale_score', 'morale', 'moraleScore'), 50, lambda v: int(float(v))),
+    ('news_sentiment', ('news_sentiment', 'sentiment'), 0.0, float),
+    ('trade_sentiment', ('trade_sentiment', 'tradeSentiment'), 0.0, float),
+    ('motivation', ('motivation', 'motivation_score'), 0.5, float),
+)
+
+
+def _first(j: Dict[str, Any], keys: Tuple[str, ...], default: Any) -> Any:
+    """Return the value of the first alias present in `j` (None counts as
+    absent). Unlike an `or` chain this keeps valid falsy values like 0."""
+    for k in keys:
+        v = j.get(k)
+        if v is not None:
+            return v
+    return default
+
+
 class LLMFeatureService:
     def __init__(self, default_model: Optional[str] = None, redis_client: Optional[object] = None, ttl_seconds: int = 24 * 3600, vector_store: Optional[InMemoryVectorStore] = None):
         self.client = get_default_client()
         self.default_model = default_model or os.environ.get('OLLAMA_DEFAULT_MODEL') or 'llama3'
-        # optional Redis client for caching; fall back to in-process cache
+        # two-tier feature cache: bounded in-process TTL cache (L1) backed by
+        # an optional Redis client (L2) shared across worker processes
         self.redis = redis_client
         self.ttl = int(ttl_seconds)
-        self._cache: Dict[str, Dict[str, float]] = {}
+        self._cache: TTLCache = TTLCache(maxsize=int(os.environ.get('LLM_FEATURE_CACHE_SIZE', '10000')), ttl=self.ttl)
         self._ollama_last_call = 0.0
         # allow injection of a vector store (useful for tests / production swap)
         self.vector_store = vector_store if vector_store is not None else InMemoryVectorStore()
         # last embedding source used: 'live'|'fallback'|None
         self._last_embedding_source: Optional[str] = None
+        # web_search calls in flight for the async extraction path, keyed by query
+        self._inflight_web: Dict[str, asyncio.Future] = {}
+        self.refresh_config()
+        # validated LLM extractions keyed by blake2b(model + prompt); the prompt
+        # only depends on the context text, so identical news is extracted once
+        self._extract_cache: TTLCache = TTLCache(maxsize=int(os.environ.get('LLM_FEATURE_CACHE_SIZE', '10000')), ttl=self.ttl)
+
+    def refresh_config(self) -> None:
+        """(Re)read env-driven settings used on the per-request paths.
+
+        Called from `__init__`; tests that monkeypatch the environment after
+        construction can call it again to pick up the new values.
+        """
+        # Ollama HTTP settings for `_ollama_request_with_retries`
+        url = os.environ.get('OLLAMA_URL')
+        api_key = os.environ.get('OLLAMA_CLOUD_API_KEY') or os.environ.get('OLLAMA_API_KEY')
+        if api_key and not url:
+            url = 'https://api.ollama.com'
+        if not url:
+            url = 'http://localhost:11434'
+        base = url.rstrip('/')
+        self._ollama_is_cloud = 'ollama.com' in base
+        # local Ollama HTTP API uses /api/generate (not /v1/generate)
+        self._ollama_api_path = base + ('/api/chat' if self._ollama_is_cloud else '/api/generate')
+        self._ollama_headers = {'Authorization': f"Bearer {api_key}"} if api_key else None
+        self._ollama_timeout = float(os.environ.get('OLLAMA_TIMEOUT', '10'))
+        self._ollama_max_wait = float(os.environ.get('OLLAMA_MAX_WAIT_SECONDS', '60'))
+        self._ollama_stream = os.environ.get('OLLAMA_STREAM', 'false').lower() in ('1', 'true', 'yes')
+        self._ollama_keep_alive = os.environ.get('OLLAMA_KEEPALIVE')
+        self._min_ctx_chars = int(os.environ.get('LLM_MIN_CTX_CHARS', '3'))
+        # Deterministic fallback embeddings for `generate_embedding`.
+        # Production-safe default: if `OLLAMA_EMBEDDINGS_FALLBACK` is not set and
+        # the runtime environment indicates production, disable fallback.
+        fb_env = os.environ.get('OLLAMA_EMBEDDINGS_FALLBACK')
+        if fb_env is not None:
+            self._embed_fallback = str(fb_env).lower() in ('1', 'true', 'yes')
+        else:
+            # infer from common environment vars
+            env = (os.environ.get('ENV') or os.environ.get('APP_ENV') or os.environ.get('FLASK_ENV') or os.environ.get('PYTHON_ENV') or '').lower()
+            self._embed_fallback = env not in ('production', 'prod')
+        self._embed_fallback_dim = int(os.environ.get('OLLAMA_EMBEDDING_DIM', '384'))
 
     def _build_prompt(self, player_name: str, text: str) -> str:
-        return (
-            "You are a sports analyst. Given the following short news summary or context,\n"
-            "produce a JSON object only (no extra text) with the keys: injury_status (string), morale_score (int 0-100), news_sentiment (float -1.0..1.0), trade_sentiment (float -1.0..1.0), motivation (float 0.0..1.0).\n"
-            "Respond using valid JSON only.\n\nContext:\n"
-            f"{text}\n\nReturn JSON."
-        )
+        return _build_prompt(text)
+
+    def _extract_key(self, model: str, prompt: str) -> bytes:
+        return hashlib.blake2b((model + "\x00" + prompt).encode("utf-8"), digest_size=16).digest()
+
+    def _is_trivial_context(self, text: Optional[str]) -> bool:
+        """True when `text` is a placeholder not worth an LLM call: a few
+        characters (LLM_MIN_CTX_CHARS) or nothing but a boilerplate phrase.
+        Empty context is not trivial; the model can fetch its own via tools."""
+        stripped = (text or "").strip()
+        if not stripped:
+            return False
+        return len(stripped) < self._min_ctx_chars or _BOILERPLATE_RX.fullmatch(stripped) is not None
+
+    @staticmethod
+    def _parse_response(resp: Any) -> Any:
+        """Return dict/list parsed from a client response, or None."""
+        if isinstance(resp, (dict, list)):
+            return resp
+        s = resp.decode('utf-8', 'replace') if isinstance(resp, bytes) else str(resp)
+        try:
+            return _json_loads(s)
+        except Exception:
+            pass
+        # find the first JSON object embedded in surrounding prose; raw_decode
+        # stops at the end of the object so trailing text is ignored
+        start = s.find('{')
+        while start != -1:
+            try:
+                return _JSON_DECODER.raw_decode(s, start)[0]
+            except ValueError:
+                start = s.find('{', start + 1)
+        return None
+
+    @staticmethod
+    def _tool_query(parsed: Any) -> Optional[str]:
+        """Return the web_search query when `parsed` is a tool-call shape."""
+        if not isinstance(parsed, dict) or not (
+            parsed.get('tool_call') or parsed.get('tool') or parsed.get('web_search') or parsed.get('call_tool')
+        ):
+            return None
+        try:
+            # support multiple possible shapes; expect a query string
+            query = None
+            # shape: {"tool_call": {"name": "web_search", "arguments": {"query": "..."}}}
+            tc = parsed.get('tool_call') or parsed.get('tool') or parsed.get('call_tool') or parsed
+            if isinstance(tc, dict):
+                args = tc.get('arguments') or tc.get('args') or tc
+                if isinstance(args, dict):
+                    query = args.get('query') or args.get('q') or args.get('search')
+            if query is None:
+                # fallback: if top-level web_search key present, use it
+                query = parsed.get('web_search')
+            return str(query) if query else None
+        except Exception:
+            return None
+
+    def _validate_features(self, parsed: Any) -> Optional[Dict[str, Any]]:
+        """Validate `parsed` against `QualitativeFeatures`, coercing if needed."""
+        if isinstance(parsed, list) and parsed:
+            if isinstance(parsed[0], dict):
+                parsed = parsed[0]
+
+        if not isinstance(parsed, dict):
+            return None
+
+        try:
+            return _validate_qf(parsed)
+        except ValidationError:
+            coerced = self._coerce_partial(parsed)
+            if coerced:
+                try:
+                    return _validate_qf(coerced)
+                except ValidationError:
+                    pass
+        return None
 
     def extract_from_text(self, player_name: str, text: str, model: Optional[str] = None, max_attempts: int = 2) -> Dict[str, Any]:
         """Request JSON from the client and return validated features or {}.
@@ -58,31 +438,21 @@ class LLMFeatureService:
         method will attempt a best-effort coercion and otherwise fall back to
         simple heuristics.
         """
+        # Don't spend an LLM round-trip on empty or boilerplate context.
+        if self._is_trivial_context(text):
+            return self._fallback_heuristics(text or "")
+
         model = model or self.default_model
         prompt = self._build_prompt(player_name, text)
-
-        # define a lightweight tool descriptor for the LLM to call when it
-        # needs fresh web information. Ollama tool-calling expects a small
-        # JSON schema describing the tool; we keep it minimal here.
-        # Tool descriptor compatible with common tool-calling formats (name + JSON Schema `parameters`).
-        tools = [
-            {
-                "name": "web_search",
-                "description": "Search the web for recent news or quotes; returns plain-text summary.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query"}
-                    },
-                    "required": ["query"]
-                },
-            }
-        ]
+        cache_key = self._extract_key(model, prompt)
+        cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
 
         for _ in range(max_attempts):
             try:
                 # pass both `response_format` and `format` to support different client APIs
-                resp = self.client.generate(model=model, prompt=prompt, timeout=30, response_format='json', format='json', tools=tools)
+                resp = self.client.generate(model=model, prompt=prompt, timeout=30, response_format='json', format='json', tools=_WEB_SEARCH_TOOLS)
             except Exception as e:
                 logger.debug("LLM client.generate failed: %s", e)
                 resp = None
@@ -90,81 +460,135 @@ class LLMFeatureService:
             if not resp:
                 continue
 
-            parsed = None
-            if isinstance(resp, (dict, list)):
-                parsed = resp
-            else:
-                try:
-                    parsed = json.loads(str(resp))
-                except Exception:
-                    # try to find a JSON object substring
-                    try:
-                        s = str(resp)
-                        start = s.find('{')
-                        end = s.rfind('}')
-                        if start != -1 and end != -1 and end > start:
-                            parsed = json.loads(s[start:end+1])
-                    except Exception:
-                        parsed = None
+            # common case: the model returned exactly the schema as JSON text
+            features = _validate_qf_json(resp)
+            if features is not None:
+                self._extract_cache[cache_key] = features
+                return dict(features)
 
+            parsed = self._parse_response(resp)
             if parsed is None:
                 continue
 
             # tool-calling helper: if the model returned an explicit tool call
             # shape, execute it and supply the result back to the model.
-            if isinstance(parsed, dict) and (
-                parsed.get('tool_call') or parsed.get('tool') or parsed.get('web_search') or parsed.get('call_tool')
-            ):
+            query = self._tool_query(parsed)
+            if query:
                 try:
-                    # support multiple possible shapes; expect a query string
-                    query = None
-                    # shape: {"tool_call": {"name": "web_search", "arguments": {"query": "..."}}}
-                    tc = parsed.get('tool_call') or parsed.get('tool') or parsed.get('call_tool') or parsed
-                    if isinstance(tc, dict):
-                        args = tc.get('arguments') or tc.get('args') or tc
-                        if isinstance(args, dict):
-                            query = args.get('query') or args.get('q') or args.get('search')
-                    if query is None:
-                        # fallback: if top-level web_search key present, use it
-                        query = parsed.get('web_search')
-
-                    if query:
-                        # import local web search and call it
-                        from backend.services.web_search import web_search
-
-                        result = web_search(str(query))
-                        # append tool result to prompt and retry generation
-                        prompt = prompt + "\n\n[web_search result]\n" + str(result)
-                        continue
+                    # import local web search and call it
+                    from backend.services.web_search import web_search
+
+                    result = web_search(query)
+                    # append tool result to prompt and retry generation
+                    prompt = prompt + "\n\n[web_search result]\n" + str(result)
+                    continue
                 except Exception:
                     # on any failure, ignore and continue parsing attempt
                     pass
 
-            if isinstance(parsed, list) and parsed:
-                if isinstance(parsed[0], dict):
-                    parsed = parsed[0]
+            features = self._validate_features(parsed)
+            if features is not None:
+                self._extract_cache[cache_key] = features
+                return dict(features)
 
-            if not isinstance(parsed, dict):
-                continue
+        return self._fallback_heuristics(text)
+
+    async def _web_search_async(self, query: str) -> str:
+        """Run `web_search` off-loop, sharing one in-flight call per query."""
+        inflight = self._inflight_web.get(query)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        from backend.services.web_search import web_search
+
+        fut = asyncio.ensure_future(asyncio.to_thread(web_search, query))
+        self._inflight_web[query] = fut
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            if self._inflight_web.get(query) is fut:
+                del self._inflight_web[query]
+
+    async def extract_from_text_async(self, player_name: str, text: str, model: Optional[str] = None, max_attempts: int = 2) -> Dict[str, Any]:
+        """Async variant of `extract_from_text`.
+
+        The blocking client call runs in a worker thread; concurrent
+        extractions that request the same web_search query share one call.
+        """
+        if self._is_trivial_context(text):
+            return self._fallback_heuristics(text or "")
 
+        model = model or self.default_model
+        prompt = self._build_prompt(player_name, text)
+        cache_key = self._extract_key(model, prompt)
+        cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        for _ in range(max_attempts):
             try:
-                vf = QualitativeFeatures.parse_obj(parsed)
-                return vf.dict()
-            except ValidationError:
-                coerced = self._coerce_partial(parsed)
-                if coerced:
-                    try:
-                        vf = QualitativeFeatures.parse_obj(coerced)
-                        return vf.dict()
-                    except ValidationError:
-                        pass
+                resp = await asyncio.to_thread(
+                    self.client.generate, model=model, prompt=prompt, timeout=30, response_format='json', format='json', tools=_WEB_SEARCH_TOOLS
+                )
+            except Exception as e:
+                logger.debug("LLM client.generate failed: %s", e)
+                resp = None
+
+            if not resp:
                 continue
 
-        # fallback heuristics
+            # common case: the model returned exactly the schema as JSON text
+            features = _validate_qf_json(resp)
+            if features is not None:
+                self._extract_cache[cache_key] = features
+                return dict(features)
+
+            parsed = self._parse_response(resp)
+            if parsed is None:
+                continue
+
+            query = self._tool_query(parsed)
+            if query:
+                try:
+                    result = await self._web_search_async(query)
+                    prompt = prompt + "\n\n[web_search result]\n" + str(result)
+                    continue
+                except Exception:
+                    pass
+
+            features = self._validate_features(parsed)
+            if features is not None:
+                self._extract_cache[cache_key] = features
+                return dict(features)
+
+        return self._fallback_heuristics(text)
+
+    async def extract_many(self, items: List[Tuple[str, str]], model: Optional[str] = None, concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract features for many `(player_name, text)` pairs concurrently.
+
+        At most `concurrency` (env `LLM_EXTRACT_CONCURRENCY`, default 8)
+        extractions are in flight at once. Results keep the input order.
+        """
+        limit = int(concurrency or os.environ.get('LLM_EXTRACT_CONCURRENCY', '8'))
+        sem = asyncio.Semaphore(max(1, limit))
+
+        async def _one(player_name: str, text: str) -> Dict[str, Any]:
+            async with sem:
+                try:
+                    return await self.extract_from_text_async(player_name, text, model=model)
+                except Exception:
+                    logger.exception("extract_many: extraction failed for %s", player_name)
+                    return self._fallback_heuristics(text or "")
+
+        return list(await asyncio.gather(*(_one(p, t) for p, t in items)))
+
+    def _fallback_heuristics(self, text: str) -> Dict[str, Any]:
+        """Keyword-based features in the `QualitativeFeatures` shape."""
         lower = (text or "").lower()
-        injury = -0.5 if any(k in lower for k in ('injur', 'sprain', 'strain', 'out', 'questionable', 'doubtful')) else 0.0
-        morale = 50 if any(k in lower for k in ('morale', 'confidence', 'motivated')) else 50
-        motivation = 1.0 if any(k in lower for k in ('contract', 'extension', 'contract year')) else 0.5
+        hits = _keyword_hits(lower) if lower.strip() else set()
+        injury = -0.5 if 'injury' in hits else 0.0
+        morale = 50 if 'morale' in hits else 50
+        motivation = 1.0 if 'motivation' in hits else 0.5
         trade = 0.0
         return {
             'injury_status': 'healthy' if injury == 0.0 else 'questionable',
@@ -176,71 +600,62 @@ class LLMFeatureService:
 
     def _coerce_partial(self, j: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
-            out = {
-                'injury_status': str(j.get('injury_status') or j.get('injury') or j.get('injuryStatus') or 'healthy'),
-                'morale_score': int(float(j.get('morale_score') or j.get('morale') or j.get('moraleScore') or 50)),
-                'news_sentiment': float(j.get('news_sentiment') or j.get('sentiment') or 0.0),
-                'trade_sentiment': float(j.get('trade_sentiment') or j.get('tradeSentiment') or 0.0),
-                'motivation': float(j.get('motivation') or j.get('motivation_score') or 0.5),
-            }
-            return out
-        except Exception:
+            return {field: conv(_first(j, keys, default)) for field, keys, default, conv in _FIELD_ALIASES}
+        except (TypeError, ValueError):
             return None
 
     def _cache_key(self, player_name: str, source_id: str) -> str:
         return f"llm_feat:{player_name}:{source_id}"
 
     def _get_cached(self, key: str) -> Optional[Dict[str, float]]:
+        v = self._cache.get(key)
+        if v is not None:
+            _record_cache_metric(True)
+            return v
         if self.redis:
             try:
-                v = self.redis.get(key)
-                if v:
-                    return json.loads(v)
+                raw = self.redis.get(key)
+                if raw:
+                    v = _decode_cached(raw)
+                    self._cache[key] = v
+                    _record_cache_metric(True)
+                    return v
             except Exception:
                 logger.exception("Redis read failed for %s", key)
-        return self._cache.get(key)
+        _record_cache_metric(False)
+        return None
 
     def _set_cached(self, key: str, value: Dict[str, float]) -> None:
+        self._cache[key] = value
         if self.redis:
             try:
-                self.redis.set(key, json.dumps(value), ex=self.ttl)
-                return
+                self.redis.set(key, _encode_cached(value), ex=self.ttl)
             except Exception:
                 logger.exception("Redis write failed for %s", key)
-        self._cache[key] = value
 
     def _ollama_request_with_retries(self, prompt: str, max_attempts: int = 3, backoff_factor: float = 1.0) -> Optional[str]:
         """Call Ollama HTTP endpoint with optional streaming and retries.
 
-        This mirrors the helper used in earlier versions and is exercised by
-        tests that monkeypatch `requests.post` to return streaming lines.
+        Requests go through the pooled `_http_session()`; tests monkeypatch
+        that accessor to return streaming lines.
         """
-        try:
-            import requests
-        except Exception:
+        if requests is None:
             logger.debug("requests not available; skipping ollama provider")
             return None
 
-        url = os.environ.get('OLLAMA_URL')
-        api_key = os.environ.get('OLLAMA_CLOUD_API_KEY') or os.environ.get('OLLAMA_API_KEY')
-        if api_key and not url:
-            url = 'https://api.ollama.com'
-        if not url:
-            url = 'http://localhost:11434'
-
-        stream_enabled = os.environ.get('OLLAMA_STREAM', 'false').lower() in ('1', 'true', 'yes')
+        stream_enabled = self._ollama_stream
+        api_path = self._ollama_api_path
+        headers = self._ollama_headers
+        timeout = self._ollama_timeout
+        session = _http_session()
 
         attempts = 0
-        max_wait = float(os.environ.get('OLLAMA_MAX_WAIT_SECONDS', '60'))
+        max_wait = self._ollama_max_wait
         while attempts < max_attempts:
             try:
-                base = url.rstrip('/')
-                if 'ollama.com' in base:
-                    api_path = base + '/api/chat'
+                if self._ollama_is_cloud:
                     payload = {"model": self.default_model, "messages": [{"role": "user", "content": prompt}], "stream": stream_enabled}
                 else:
-                    # local Ollama HTTP API uses /api/generate (not /v1/generate)
-                    api_path = base + '/api/generate'
                     # include both keys for compatibility and expose stream flag
                     payload = {
                         "model": self.default_model,
@@ -249,30 +664,19 @@ class LLMFeatureService:
                         "stream": stream_enabled,
                     }
 
-                headers = {}
-                if api_key:
-                    headers['Authorization'] = f"Bearer {api_key}"
-
-                timeout = float(os.environ.get('OLLAMA_TIMEOUT', '10'))
+                # optional: how long Ollama keeps the model loaded between calls
+                if self._ollama_keep_alive:
+                    payload["keep_alive"] = self._ollama_keep_alive
 
                 if stream_enabled:
-                    resp = requests.post(api_path, json=payload, headers=headers or None, timeout=timeout, stream=True)
+                    resp = session.post(api_path, json=payload, headers=headers, timeout=timeout, stream=True)
                     resp.raise_for_status()
                     collected = []
-                    for raw_line in resp.iter_lines(decode_unicode=True):
-                        if raw_line is None:
-                            continue
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        if line.startswith('data:'):
-                            line = line[len('data:'):].strip()
-                        if line == '[DONE]':
-                            break
+                    for line in _sse_payloads(resp.iter_content(chunk_size=65536)):
                         try:
-                            chunk = json.loads(line)
+                            chunk = _json_loads(line)
                         except Exception:
-                            chunk = line
+                            chunk = line.decode('utf-8', 'replace')
                         if isinstance(chunk, str):
                             collected.append(chunk)
                         elif isinstance(chunk, dict):
@@ -290,7 +694,7 @@ class LLMFeatureService:
                         return '\n'.join([c for c in collected if c])
                     # fallthrough
 
-                resp = requests.post(api_path, json=payload, headers=headers or None, timeout=timeout)
+                resp = session.post(api_path, json=payload, headers=headers, timeout=timeout)
                 resp.raise_for_status()
                 # prefer JSON when available
                 try:
@@ -315,20 +719,6 @@ class LLMFeatureService:
                     if 'text' in data:
                         return data.get('text')
                     # find nested text
-                    def _find_text(obj):
-                        if isinstance(obj, str):
-                            return obj
-                        if isinstance(obj, dict):
-                            for v in obj.values():
-                                t = _find_text(v)
-                                if t:
-                                    return t
-                        if isinstance(obj, list):
-                            for v in obj:
-                                t = _find_text(v)
-                                if t:
-                                    return t
-                        return None
                     t = _find_text(data)
                     if t:
                         return t
@@ -337,7 +727,6 @@ class LLMFeatureService:
                     return resp.text
             except Exception as e:
                 attempts += 1
-                import time, random
                 base_wait = backoff_factor * (2 ** (attempts - 1))
                 jitter = random.uniform(0, min(1.0, base_wait))
                 wait = min(max_wait, base_wait + jitter)
@@ -352,14 +741,13 @@ class LLMFeatureService:
 
         Returns a single vector (list of floats) or None.
         """
-        import time as _time
         try:
             from backend.services import metrics
         except Exception:
             metrics = None
 
         model = model or self.default_model
-        _start = _time.time()
+        _start = time.time()
         emb = None
         try:
             # try live embeddings via the client wrapper
@@ -449,25 +837,11 @@ class LLMFeatureService:
         except Exception:
             emb = None
 
-        # If live embeddings failed, optionally fall back to deterministic local embedding.
-        # Production-safe default: if `OLLAMA_EMBEDDINGS_FALLBACK` is not set and
-        # the runtime environment indicates production, disable fallback.
-        try:
-            fb_env = os.environ.get('OLLAMA_EMBEDDINGS_FALLBACK')
-            if fb_env is not None:
-                allow_fb = str(fb_env).lower() in ('1', 'true', 'yes')
-            else:
-                # infer from common environment vars
-                env = (os.environ.get('ENV') or os.environ.get('APP_ENV') or os.environ.get('FLASK_ENV') or os.environ.get('PYTHON_ENV') or '').lower()
-                allow_fb = False if env in ('production', 'prod') else True
-        except Exception:
-            allow_fb = True
-
-        if (emb is None) and allow_fb:
+        # If live embeddings failed, optionally fall back to deterministic local
+        # embedding (see `refresh_config` for how this is enabled).
+        if (emb is None) and self._embed_fallback:
             try:
-                import hashlib, random
-
-                dim = int(os.environ.get('OLLAMA_EMBEDDING_DIM', '384'))
+                dim = self._embed_fallback_dim
                 h = hashlib.sha256(text.encode('utf-8')).hexdigest()
                 seed = int(h[:16], 16)
                 rnd = random.Random(seed)
@@ -479,7 +853,7 @@ class LLMFeatureService:
                 return None
 
         # record metrics
-        _dur = _time.time() - _start
+        _dur = time.time() - _start
         try:
             if metrics is not None:
                 metrics.embedding_requests_total.inc()
@@ -490,7 +864,7 @@ class LLMFeatureService:
             # metrics should never break main logic
             pass
 
-        if emb is None and not allow_fb:
+        if emb is None and not self._embed_fallback:
             # In production we prefer failing fast and logging when live embeddings
             # are unavailable rather than silently using deterministic vectors.
             logger.error("generate_embedding: live embedding failed and fallback disabled (production mode)")
@@ -499,23 +873,113 @@ class LLMFeatureService:
 
         return None
 
-    def index_texts(self, items: List[Tuple[str, str, Optional[Dict[str, Any]]]], model: Optional[str] = None) -> List[str]:
+    def generate_embeddings_batch(self, texts: List[str], model: Optional[str] = None) -> List[Optional[List[float]]]:
+        """Embed `texts` with one backend request when the client supports it.
+
+        Returns a list aligned with `texts`. When the batch request is not
+        available or fails, each text goes through `generate_embedding`
+        (which also applies the deterministic fallback policy).
+        """
+        if not texts:
+            return []
+        model = model or self.default_model
+        vecs = None
+        batch_fn = getattr(self.client, 'embeddings_batch', None)
+        if callable(batch_fn):
+            _start = time.time()
+            try:
+                vecs = batch_fn(model=model, inputs=list(texts))
+            except Exception as e:
+                logger.debug("generate_embeddings_batch: batch request failed: %s", e)
+                vecs = None
+            try:
+                from backend.services import metrics
+
+                metrics.embedding_requests_total.inc()
+                metrics.embedding_latency_seconds.observe(time.time() - _start)
+                if vecs is not None:
+                    metrics.embedding_success_total.inc()
+            except Exception:
+                pass
+        if vecs is not None and len(vecs) == len(texts):
+            self._last_embedding_source = 'live'
+            return list(vecs)
+        return [self.generate_embedding(t, model=model) for t in texts]
+
+    def _store_block(self, ids: List[str], vectors: List[List[float]], metas: List[Dict[str, Any]]) -> bool:
+        """Hand a batch of embeddings to the vector store in one call.
+
+        Prefers `extend` with a single `(N, D)` float32 matrix, then
+        `add_many`; returns False when the caller should add items one by one.
+        """
+        extend = getattr(self.vector_store, 'extend', None)
+        if callable(extend) and len({len(v) for v in vectors}) == 1:
+            try:
+                extend(ids, np.asarray(vectors, dtype=np.float32), metas)
+                return True
+            except Exception:
+                logger.debug("index_texts: extend failed; trying add_many")
+        add_many = getattr(self.vector_store, 'add_many', None)
+        if callable(add_many):
+            try:
+                add_many(ids, vectors, metas)
+                return True
+            except Exception:
+                logger.debug("index_texts: add_many failed; adding items one by one")
+        return False
+
+    def index_texts(self, items: List[Tuple[str, str, Optional[Dict[str, Any]]]], model: Optional[str] = None, batch_size: Optional[int] = None, workers: Optional[int] = None) -> List[str]:
         """Index a list of items into the vector store.
 
-        `items` is a list of tuples: (id, text, metadata).
-        Returns list of ids successfully indexed.
+        `items` is a list of tuples: (id, text, metadata). Texts are embedded
+        in batches of `batch_size` (env `LLM_EMBED_BATCH_SIZE`, default 64),
+        sorted by length within each batch to keep padding low. Up to
+        `workers` batches (env `LLM_EMBED_CONCURRENCY`, default 4) are
+        embedded concurrently in a thread pool; vectors are written to the
+        store from the calling thread, one batch at a time in input order.
+        Returns list of ids successfully indexed, in input order.
         """
-        indexed = []
-        for id, text, meta in items:
+        size = max(1, int(batch_size or os.environ.get('LLM_EMBED_BATCH_SIZE', '64')))
+        it = iter(items)
+        batches = list(iter(lambda: list(islice(it, size)), []))
+        if not batches:
+            return []
+
+        def _embed(batch):
+            order = sorted(range(len(batch)), key=lambda i: len(batch[i][1] or ""))
             try:
-                emb = self.generate_embedding(text, model=model)
-                if emb:
-                    self.vector_store.add(id, emb, meta or {})
-                    indexed.append(id)
+                embs = self.generate_embeddings_batch([batch[i][1] for i in order], model=model)
             except Exception:
-                continue
+                return batch, {}
+            return batch, {i: emb for i, emb in zip(order, embs) if emb}
+
+        limit = min(len(batches), max(1, int(workers or os.environ.get('LLM_EMBED_CONCURRENCY', '4'))))
+        indexed: List[str] = []
+        if limit == 1:
+            self._index_embedded(map(_embed, batches), indexed)
+        else:
+            with ThreadPoolExecutor(max_workers=limit) as pool:
+                self._index_embedded(pool.map(_embed, batches), indexed)
         return indexed
 
+    def _index_embedded(self, results: Iterable[Tuple[list, Dict[int, List[float]]]], indexed: List[str]) -> None:
+        for batch, by_pos in results:
+            ok = [i for i in range(len(batch)) if i in by_pos]
+            if not ok:
+                continue
+            ids = [batch[i][0] for i in ok]
+            vectors = [by_pos[i] for i in ok]
+            metas = [batch[i][2] or {} for i in ok]
+            if self._store_block(ids, vectors, metas):
+                indexed.extend(ids)
+                continue
+            for id, emb, meta in zip(ids, vectors, metas):
+                try:
+                    self.vector_store.add(id, emb, meta)
+                    indexed.append(id)
+                except Exception:
+                    continue
+
     def similarity_with_history(self, current_text: str, top_k: int = 3, model: Optional[str] = None) -> Dict[str, Any]:
         """Compute similarity features between `current_text` and indexed history.
 
@@ -525,27 +989,35 @@ class LLMFeatureService:
         if emb is None:
             return {"top_matches": [], "max_similarity": 0.0, "avg_topk_similarity": 0.0}
         results = self.vector_store.search(emb, top_k=top_k)
-        scores = [r['score'] for r in results]
-        max_sim = float(scores[0]) if scores else 0.0
-        avg_sim = float(sum(scores) / len(scores)) if scores else 0.0
+        scores = np.fromiter((r['score'] for r in results), dtype=np.float64, count=len(results))
+        max_sim = float(scores.max()) if scores.size else 0.0
+        avg_sim = float(scores.mean()) if scores.size else 0.0
         return {"top_matches": results, "max_similarity": max_sim, "avg_topk_similarity": avg_sim}
 
     def fetch_news_and_extract(self, player_name: str, source_id: str, text_fetcher) -> Dict[str, float]:
         """Fetch text via `text_fetcher` and return numeric features.
 
         Uses structured extraction when available; otherwise falls back to
-        deterministic heuristics. Results are cached in-process keyed by
-        `(player_name, source_id)` to make repeated calls stable for tests.
+        deterministic heuristics. Results are cached keyed by
+        `(player_name, source_id)` in a bounded TTL cache and, when a Redis
+        client was supplied, in Redis so other workers can reuse them.
         """
-        key = f"{player_name}::{source_id}"
-        if key in self._cache:
-            return self._cache[key]
+        key = self._cache_key(player_name, source_id)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
 
         try:
             text = text_fetcher(player_name)
         except Exception:
             text = ""
 
+        # Nothing to extract from: neutral features, no LLM call or scan.
+        if not text or not str(text).strip():
+            out = dict(_EMPTY_NEWS_FEATURES)
+            self._set_cached(key, out)
+            return out
+
         # Try structured extraction first
         structured = {}
         try:
@@ -553,6 +1025,13 @@ class LLMFeatureService:
         except Exception:
             structured = {}
 
+        out = self._news_features(text, structured)
+        self._set_cached(key, out)
+        return out
+
+    @staticmethod
+    def _news_features(text: str, structured: Dict[str, Any]) -> Dict[str, float]:
+        """Map extracted features (or keyword heuristics) to news feature floats."""
         if structured:
             # normalize morale_score (schema uses 0-100) to [-1.0, 1.0]
             ms = structured.get('morale_score')
@@ -561,31 +1040,119 @@ class LLMFeatureService:
                 morale_norm = max(-1.0, min(1.0, (msf - 50.0) / 50.0))
             except Exception:
                 morale_norm = 0.0
-            out = {
+            return {
                 'injury_sentiment': float(structured.get('news_sentiment') or 0.0),
                 'morale_score': float(morale_norm),
                 'motivation': float(structured.get('motivation') or 0.0),
                 'coaching_change_impact': 0.0,
             }
-            self._cache[key] = out
-            return out
 
         # Deterministic heuristic fallback
-        lower = (text or "").lower()
-        injury = -1.0 if any(k in lower for k in ('injur', 'sprain', 'strain', 'out', 'questionable', 'doubtful')) else 0.0
-        morale = 1.0 if any(k in lower for k in ('morale', 'confidence', 'motivated')) else 0.0
-        motivation = 1.0 if any(k in lower for k in ('contract', 'extension', 'contract year')) else 0.0
-        coaching = 1.0 if any(k in lower for k in ('coach', 'coaching change', 'coach fired', 'coach hired')) else 0.0
+        hits = _keyword_hits((text or "").lower())
+        injury = -1.0 if 'injury' in hits else 0.0
+        morale = 1.0 if 'morale' in hits else 0.0
+        motivation = 1.0 if 'motivation' in hits else 0.0
+        coaching = 1.0 if 'coaching' in hits else 0.0
 
-        out = {
+        return {
             'injury_sentiment': float(injury),
             'morale_score': float(morale),
             'motivation': float(motivation),
             'coaching_change_impact': float(coaching),
         }
-        self._cache[key] = out
+
+    async def afetch_news_and_extract(self, player_name: str, source_id: str, text_fetcher) -> Dict[str, float]:
+        """Async variant of `fetch_news_and_extract`.
+
+        `text_fetcher` may be a plain function (run in a worker thread) or a
+        coroutine function. Shares the same two-tier cache.
+        """
+        key = self._cache_key(player_name, source_id)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        try:
+            if asyncio.iscoroutinefunction(text_fetcher):
+                text = await text_fetcher(player_name)
+            else:
+                text = await asyncio.to_thread(text_fetcher, player_name)
+        except Exception:
+            text = ""
+
+        if not text or not str(text).strip():
+            out = dict(_EMPTY_NEWS_FEATURES)
+            self._set_cached(key, out)
+            return out
+
+        try:
+            structured = await self.extract_from_text_async(player_name, text)
+        except Exception:
+            structured = {}
+
+        out = self._news_features(text, structured)
+        self._set_cached(key, out)
+        return out
+
+    async def afetch_many(self, player_names: List[str], source_id: str, text_fetcher, concurrency: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Fetch and extract news features for many players concurrently.
+
+        Returns `{player_name: features}`; a player whose pipeline raised gets
+        the neutral feature dict.
+        """
+        limit = int(concurrency or os.environ.get('LLM_EXTRACT_CONCURRENCY', '8'))
+        sem = asyncio.Semaphore(max(1, limit))
+
+        async def _one(name: str) -> Dict[str, float]:
+            async with sem:
+                return await self.afetch_news_and_extract(name, source_id, text_fetcher)
+
+        results = await asyncio.gather(*(_one(n) for n in player_names), return_exceptions=True)
+        out: Dict[str, Dict[str, float]] = {}
+        for name, res in zip(player_names, results):
+            if isinstance(res, BaseException):
+                logger.warning("afetch_many: %s failed: %s", name, res)
+                res = dict(_EMPTY_NEWS_FEATURES)
+            out[name] = res
         return out
 
+    async def aindex_texts(self, items: List[Tuple[str, str, Optional[Dict[str, Any]]]], model: Optional[str] = None, batch_size: Optional[int] = None, concurrency: Optional[int] = None) -> List[str]:
+        """Async variant of `index_texts` that embeds several batches at once.
+
+        Each batch is embedded in a worker thread (at most `concurrency`, env
+        `LLM_EMBED_CONCURRENCY`, default 4, at a time); vectors are added to
+        the store in input order once all batches finish.
+        """
+        size = max(1, int(batch_size or os.environ.get('LLM_EMBED_BATCH_SIZE', '64')))
+        limit = int(concurrency or os.environ.get('LLM_EMBED_CONCURRENCY', '4'))
+        sem = asyncio.Semaphore(max(1, limit))
+        batches = [items[i:i + size] for i in range(0, len(items), size)]
+
+        async def _embed(batch):
+            async with sem:
+                return await asyncio.to_thread(self.generate_embeddings_batch, [t for _, t, _ in batch], model)
+
+        embedded = await asyncio.gather(*(_embed(b) for b in batches), return_exceptions=True)
+        indexed: List[str] = []
+        for batch, embs in zip(batches, embedded):
+            if isinstance(embs, BaseException):
+                logger.debug("aindex_texts: batch embedding failed: %s", embs)
+                continue
+            ok = [(id, emb, meta or {}) for (id, _, meta), emb in zip(batch, embs) if emb]
+            if not ok:
+                continue
+            ids, vectors, metas = (list(col) for col in zip(*ok))
+            if self._store_block(ids, vectors, metas):
+                indexed.extend(ids)
+                continue
+            for id, emb, meta in ok:
+                try:
+                    self.vector_store.add(id, emb, meta)
+                    indexed.append(id)
+                except Exception:
+                    continue
+        return indexed
+
 
 _default_llm_service: Optional[LLMFeatureService] = None
 
@@ -606,6 +1173,17 @@ def create_default_service(default_model: Optional[str] = None) -> LLMFeatureSer
                 except Exception:
                     logger.exception('ChromaVectorStore requested but failed to initialize; falling back to InMemoryVectorStore')
                     vector_store = None
+            elif vs == 'memmap':
+                try:
+                    from backend.services.memmap_vector_store import MemmapVectorStore
+
+                    path = os.environ.get('VECTOR_STORE_PATH') or os.path.join(os.path.dirname(__file__), '..', 'vector_store_data', 'vectors')
+                    vector_store = MemmapVectorStore(path)
+                except Exception:
+                    logger.exception('MemmapVectorStore requested but failed to initialize; falling back to InMemoryVectorStore')
+                    vector_store = None
+            elif os.environ.get('VECTOR_STORE_QUANTIZE'):
+                vector_store = InMemoryVectorStore(quantize=os.environ['VECTOR_STORE_QUANTIZE'].lower())
         except Exception:
             vector_store = None
         _default_llm_service = LLMFeatureService(default_model=default_model, vector_store=vector_store)
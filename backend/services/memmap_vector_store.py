@@ -0,0 +1,207 @@
+"""Disk-backed vector store using a NumPy memmap plus a SQLite id table.
+
+Embeddings live in a `(capacity, dim)` float32 matrix memory-mapped from
+`<path>.f32`; ids, row numbers and metadata live in `<path>.meta.sqlite`.
+Reopening the same path restores every previously added vector without
+re-embedding, and the OS page cache keeps the hot rows resident.
+
+The API mirrors `InMemoryVectorStore`: add(id, embedding, metadata),
+add_many(ids, embeddings, metadatas), extend(ids, embedding_matrix,
+metadatas), search(query_embedding, top_k) and all_items().
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_INITIAL_CAPACITY = 1024
+
+
+class MemmapVectorStore:
+    def __init__(self, path: str, dim: Optional[int] = None, flush_every: int = 256):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._mat_path = self.path + ".f32"
+        self._flush_every = max(1, int(flush_every))
+        self._dirty = 0
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(self.path + ".meta.sqlite", check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, row INTEGER NOT NULL, metadata TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._db.commit()
+
+        info = dict(self._db.execute("SELECT key, value FROM store_info").fetchall())
+        self.dim: Optional[int] = info.get("dim") or (int(dim) if dim else None)
+        self._capacity = int(info.get("capacity") or 0)
+        self._rows: Dict[str, int] = dict(self._db.execute("SELECT id, row FROM items").fetchall())
+        self._count = (max(self._rows.values()) + 1) if self._rows else 0
+        # rows are dense in [0, count): row -> id lets search work on the
+        # contiguous view instead of fancy-indexing a copy of the matrix
+        self._row_ids: List[Optional[str]] = [None] * self._count
+        for id, row in self._rows.items():
+            self._row_ids[row] = id
+        # per-row L2 norms, built on first search and kept current on writes
+        self._norms: Optional[np.ndarray] = None
+        self._mat: Optional[np.memmap] = None
+        if self.dim and self._capacity and os.path.exists(self._mat_path):
+            self._mat = np.memmap(self._mat_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if self._mat is not None and needed <= self._capacity:
+            return
+        new_cap = max(_INITIAL_CAPACITY, self._capacity)
+        while new_cap < needed:
+            new_cap *= 2
+        if self._mat is not None:
+            self._mat.flush()
+            self._mat = None
+        # grow (or create) the backing file; new pages are zero-filled
+        with open(self._mat_path, "ab") as fh:
+            fh.truncate(new_cap * self.dim * 4)
+        self._mat = np.memmap(self._mat_path, dtype=np.float32, mode="r+", shape=(new_cap, self.dim))
+        self._capacity = new_cap
+        if self._norms is not None:
+            norms = np.zeros(new_cap, dtype=np.float32)
+            norms[:self._norms.shape[0]] = self._norms
+            self._norms = norms
+        self._db.executemany(
+            "INSERT OR REPLACE INTO store_info (key, value) VALUES (?, ?)",
+            [("dim", int(self.dim)), ("capacity", int(new_cap))],
+        )
+
+    def add(self, id: str, embedding: List[float], metadata: Optional[Dict[str, Any]] = None) -> None:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vec.shape[0])
+            if vec.shape[0] != self.dim:
+                raise ValueError(f"embedding dim {vec.shape[0]} does not match store dim {self.dim}")
+            row = self._rows.get(id)
+            if row is None:
+                row = self._count
+                self._ensure_capacity(row + 1)
+                self._count += 1
+                self._row_ids.append(id)
+            self._mat[row] = vec
+            if self._norms is not None:
+                self._norms[row] = np.linalg.norm(vec)
+            self._rows[id] = row
+            self._db.execute(
+                "INSERT OR REPLACE INTO items (id, row, metadata) VALUES (?, ?, ?)",
+                (id, row, json.dumps(metadata or {})),
+            )
+            self._dirty += 1
+            if self._dirty >= self._flush_every:
+                self._flush_locked()
+
+    def add_many(self, ids: List[str], embeddings: List[List[float]], metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        metadatas = metadatas or [None] * len(ids)
+        for id, emb, meta in zip(ids, embeddings, metadatas):
+            self.add(id, emb, meta)
+
+    def extend(self, ids: List[str], embeddings: np.ndarray, metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        """Write an `(N, D)` block of embeddings with one slice assignment per
+        contiguous run of new rows and a single executemany."""
+        mat = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if mat.ndim != 2 or mat.shape[0] != len(ids):
+            raise ValueError("embeddings must be an (len(ids), dim) array")
+        metadatas = metadatas or [None] * len(ids)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(mat.shape[1])
+            if mat.shape[1] != self.dim:
+                raise ValueError(f"embedding dim {mat.shape[1]} does not match store dim {self.dim}")
+            rows = np.empty(len(ids), dtype=np.int64)
+            for n, id in enumerate(ids):
+                row = self._rows.get(id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._rows[id] = row
+                    self._row_ids.append(id)
+                rows[n] = row
+            self._ensure_capacity(self._count)
+            if len(ids) and rows[-1] - rows[0] == len(ids) - 1 and np.all(np.diff(rows) == 1):
+                self._mat[rows[0]:rows[-1] + 1] = mat
+            else:
+                self._mat[rows] = mat
+            if self._norms is not None:
+                self._norms[rows] = np.linalg.norm(mat, axis=1)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items (id, row, metadata) VALUES (?, ?, ?)",
+                [(id, int(r), json.dumps(m or {})) for id, r, m in zip(ids, rows, metadatas)],
+            )
+            self._dirty += len(ids)
+            if self._dirty >= self._flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._mat is not None:
+            self._mat.flush()
+        self._db.commit()
+        self._dirty = 0
+
+    def flush(self) -> None:
+        """Sync pending rows to disk (msync + SQLite commit)."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._mat = None
+            self._db.close()
+
+    def _metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for id, meta in self._db.execute(f"SELECT id, metadata FROM items WHERE id IN ({marks})", chunk):
+                out[id] = json.loads(meta) if meta else {}
+        return out
+
+    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._mat is None or not self._rows or top_k <= 0:
+                return []
+            q = np.asarray(query_embedding, dtype=np.float32).ravel()
+            if q.shape[0] != self.dim:
+                return []
+            qn = float(np.linalg.norm(q))
+            if qn == 0.0:
+                return []
+            count = self._count
+            if self._norms is None:
+                self._norms = np.zeros(self._capacity, dtype=np.float32)
+                self._norms[:count] = np.linalg.norm(self._mat[:count], axis=1)
+            ids = self._row_ids
+            norms = self._norms[:count]
+            dots = self._mat[:count] @ q
+            scores = np.divide(dots, norms * qn, out=np.zeros_like(dots), where=norms > 0)
+            k = min(int(top_k), scores.shape[0])
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            picked = [ids[i] for i in top]
+            metas = self._metadata(picked)
+        return [{"id": picked[n], "score": float(scores[i]), "metadata": metas.get(picked[n], {})} for n, i in enumerate(top)]
+
+    def all_items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._mat is None:
+                return []
+            ids = list(self._rows.keys())
+            metas = self._metadata(ids)
+            return [
+                {"id": id, "embedding": self._mat[self._rows[id]].tolist(), "metadata": metas.get(id, {})}
+                for id in ids
+            ]
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -1,37 +1,115 @@
 """Prometheus metrics for backend services.
 
-Keep this module minimal to avoid heavy imports in startup paths.
+Keep this module minimal to avoid heavy imports in startup paths:
+`prometheus_client` is only imported the first time a metric (or
+`CONTENT_TYPE_LATEST`) is accessed. Counters/histograms are registered once
+per process; on module reload the already-registered collector is reused
+instead of raising `Duplicated timeseries`. When `prometheus_client` is not
+installed the metrics degrade to no-ops.
+
+Also provides `generate_latest` and `CONTENT_TYPE_LATEST` exports used by
+`backend.main` to expose /metrics safely in single- and multi-process
+deployments.
 """
-from prometheus_client import Counter, Histogram
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
-embedding_requests_total = Counter(
-    'embedding_requests_total', 'Total number of embedding requests attempted'
-)
+if TYPE_CHECKING:  # pragma: no cover
+    import prometheus_client  # noqa: F401
 
-embedding_success_total = Counter(
-    'embedding_success_total', 'Total number of successful embedding requests'
-)
+_FALLBACK_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
-embedding_latency_seconds = Histogram(
-    'embedding_latency_seconds', 'Embedding generation latency in seconds'
-)
-"""Prometheus metrics helper with multiprocess support.
+# name -> (kind, documentation)
+_METRIC_DEFS: Dict[str, Tuple[str, str]] = {
+    'embedding_requests_total': ('Counter', 'Total number of embedding requests attempted'),
+    'embedding_success_total': ('Counter', 'Total number of successful embedding requests'),
+    'embedding_latency_seconds': ('Histogram', 'Embedding generation latency in seconds'),
+    'llm_feature_cache_hits_total': ('Counter', 'LLM feature cache hits (in-process or Redis)'),
+    'llm_feature_cache_misses_total': ('Counter', 'LLM feature cache misses'),
+}
 
-Provides `generate_latest` and `CONTENT_TYPE_LATEST` compatible exports used
-by `backend.main` to expose /metrics safely in single- and multi-process
-deployments.
-"""
-import os
+_PC: Any = None
+_PC_MISSING = False
+_metrics: Dict[str, Any] = {}
+_metrics_lock = threading.Lock()
+
+# Multiprocess scrape registry, rebuilt only when PROMETHEUS_MULTIPROC_DIR
+# changes (new worker .db files appear or are removed).
+_REGISTRY: Any = None
+_REG_KEY: Any = None
+_registry_lock = threading.Lock()
+
+
+def _pc():
+    """Import `prometheus_client` on first use; return None if unavailable."""
+    global _PC, _PC_MISSING
+    if _PC is None and not _PC_MISSING:
+        try:
+            import prometheus_client as _mod
+            _PC = _mod
+        except Exception:
+            _PC_MISSING = True
+    return _PC
+
+
+class _NoopMetric:
+    def inc(self, *args, **kwargs):
+        pass
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def labels(self, *args, **kwargs):
+        return self
+
+
+def _get_metric(name: str):
+    metric = _metrics.get(name)
+    if metric is not None:
+        return metric
+    with _metrics_lock:
+        metric = _metrics.get(name)
+        if metric is not None:
+            return metric
+        pc = _pc()
+        if pc is None:
+            metric = _NoopMetric()
+        else:
+            kind, doc = _METRIC_DEFS[name]
+            existing = getattr(pc.REGISTRY, '_names_to_collectors', {}).get(name)
+            metric = existing if existing is not None else getattr(pc, kind)(name, doc)
+        _metrics[name] = metric
+        return metric
+
+
+def __getattr__(name: str):
+    if name in _METRIC_DEFS:
+        return _get_metric(name)
+    if name == 'CONTENT_TYPE_LATEST':
+        pc = _pc()
+        return pc.CONTENT_TYPE_LATEST if pc is not None else _FALLBACK_CONTENT_TYPE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _multiprocess_registry(pc, mp_dir: str):
+    """Return a cached CollectorRegistry with a MultiProcessCollector that
+    merges metrics files produced by multiple worker processes. The registry
+    is rebuilt only when the directory path or its mtime changes.
+    """
+    global _REGISTRY, _REG_KEY
+    try:
+        key = (mp_dir, os.stat(mp_dir).st_mtime_ns)
+    except OSError:
+        key = None
+    with _registry_lock:
+        if _REGISTRY is None or key is None or key != _REG_KEY:
+            from prometheus_client import multiprocess as _multiprocess
 
-try:
-    from prometheus_client import generate_latest as _gen_default, CONTENT_TYPE_LATEST
-    from prometheus_client import CollectorRegistry
-    from prometheus_client import multiprocess as _multiprocess
-except Exception:
-    _gen_default = None
-    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
-    CollectorRegistry = None
-    _multiprocess = None
+            registry = pc.CollectorRegistry()
+            _multiprocess.MultiProcessCollector(registry)
+            _REGISTRY, _REG_KEY = registry, key
+        return _REGISTRY
 
 
 def generate_latest():
@@ -40,16 +118,13 @@ def generate_latest():
     Falls back to prometheus_client.generate_latest when multiprocess is
     not configured or library is unavailable.
     """
-    if _gen_default is None:
+    pc = _pc()
+    if pc is None:
         raise RuntimeError("prometheus_client not available")
 
     mp_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
-    if mp_dir and CollectorRegistry is not None and _multiprocess is not None:
-        # Use a separate CollectorRegistry and multiprocess mode to merge
-        # metrics files produced by multiple worker processes.
-        registry = CollectorRegistry()
-        _multiprocess.MultiProcessCollector(registry)
-        return _gen_default(registry)
+    if mp_dir:
+        return pc.generate_latest(_multiprocess_registry(pc, mp_dir))
 
     # Single-process default
-    return _gen_default()
+    return pc.generate_latest()
@@ -3,90 +3,263 @@
 Provides `MLPredictionService.predict()` that prefers persisted models and falls
 back to a heuristic when models are absent. Calibrator use is supported via
 `ModelRegistry.load_calibrator` when available.
+
+Prediction is CPU-bound, so the work lives in `predict_sync` /
+`predict_batch_sync`; the async `predict` / `predict_batch` are thin
+awaitable wrappers, and `predict_many` runs a whole batch in one worker
+thread to keep the event loop free.
 """
-from typing import Dict, Optional
+import asyncio
+import functools
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+import math
 import os
+import statistics
+import time
 import logging
 
 import numpy as np
-import pandas as pd
-from .feature_engineering import engineer_features
-from .model_registry import ModelRegistry
+from .feature_engineering import engineer_features_dict, features_to_frame, features_to_matrix, features_to_row
+from .model_registry import get_registry
+from .prediction_kernels import model_predict, score_tail
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _to_decimal(odds: int) -> float:
+    """Convert American odds to decimal odds (memoized: books quote a handful
+    of prices)."""
+    return (odds / 100.0) + 1.0 if odds > 0 else (100.0 / abs(odds)) + 1.0
+
+
+# standard -110 juice, used for both sides unless other odds are given
+_DEFAULT_DECIMAL_ODDS = _to_decimal(-110)
+
+# over probability above / below which a side is recommended
+_OVER_THRESHOLD = 0.55
+_UNDER_THRESHOLD = 0.45
+
+# `score_tail` recommendation codes -> the `recommendation` value
+_REC_LABELS = np.array([None, "OVER", "UNDER"], dtype=object)
+
+
 class MLPredictionService:
     def __init__(self, model_dir: str = "./backend/models_store"):
-        # Use the centralized ModelRegistry for persistence
-        self.registry = ModelRegistry(model_dir=model_dir)
+        # Use the centralized ModelRegistry for persistence, shared per model_dir
+        self.registry = get_registry(model_dir)
+        # player -> asyncio.Lock serializing a cold model load in `predict`;
+        # dropped once that load is done
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        # player -> (monotonic deadline, model) for models that just raised;
+        # until the deadline that same model object is skipped in favour of
+        # the heuristic (a newly saved model is tried straight away). Kept in
+        # deadline order and capped at MODEL_FAILURE_CACHE_SIZE entries.
+        self._failed_models: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._failed_lock = threading.Lock()
+        self._failure_ttl = float(os.environ.get("MODEL_FAILURE_TTL_SECONDS", "60"))
+        self._failure_cache_size = max(1, int(os.environ.get("MODEL_FAILURE_CACHE_SIZE", "128")))
 
     async def predict(self, player_name: str, stat_type: str, line: float, player_data: Dict, opponent_data: Optional[Dict] = None) -> Dict:
-        """Return a prediction dict. If a trained model exists, use it; otherwise use heuristic fallback."""
+        """Awaitable wrapper around `predict_sync`.
+
+        A model that has to be read from disk is loaded in a worker thread,
+        once per player even under concurrent requests, so the unpickle does
+        not block the event loop; cached models and players without a model
+        skip the thread hop.
+        """
         try:
-            features = engineer_features(player_data, opponent_data)
+            if self.registry.needs_load(player_name):
+                lock = self._load_locks.setdefault(player_name, asyncio.Lock())
+                try:
+                    async with lock:
+                        if self.registry.needs_load(player_name):
+                            await asyncio.to_thread(self.registry.load_model, player_name)
+                finally:
+                    # the model is cached now; later requests skip the lock
+                    if self._load_locks.get(player_name) is lock:
+                        del self._load_locks[player_name]
+        except Exception:
+            # predict_sync loads (and reports failures) on its own
+            logger.debug("background model load failed for %s", player_name, exc_info=True)
+        return self.predict_sync(player_name, stat_type, line, player_data, opponent_data)
 
+    def predict_sync(self, player_name: str, stat_type: str, line: float, player_data: Dict, opponent_data: Optional[Dict] = None) -> Dict:
+        """Return a prediction dict. If a trained model exists, use it; otherwise use heuristic fallback."""
+        try:
             # Prefer loading persisted model via ModelRegistry
             model = self.registry.load_model(player_name)
-            if model is None:
-                # fallback heuristic
-                recent = player_data.get("recentGames") or []
-                vals = [g.get("statValue") for g in recent if g.get("statValue") is not None]
-                mean = float(np.mean(vals)) if vals else float(player_data.get("seasonAvg") or 0.0)
-                over_prob = 0.5 + (mean - line) * 0.05
-                over_prob = float(max(0.05, min(0.95, over_prob)))
-                ev = self._calculate_ev(over_prob)
-                rec = "OVER" if over_prob > 0.55 else ("UNDER" if over_prob < 0.45 else None)
-                return {
+            if model is None or self._recently_failed(player_name, model):
+                return self._heuristic(player_name, stat_type, line, player_data)
+            return self._predict_with_model(model, player_name, stat_type, line, player_data, opponent_data)
+
+        except Exception as e:
+            logger.exception("prediction error: %s", e)
+            return {"player": player_name, "error": str(e)}
+
+    def _predict_with_model(self, model, player_name: str, stat_type: str, line: float, player_data: Dict, opponent_data: Optional[Dict] = None) -> Dict:
+        """Predict with `model`; if the model raises, answer with the heuristic."""
+        try:
+            features = self._model_input(model, engineer_features_dict(player_data, opponent_data))
+            raw = float(model_predict(model, features)[0])
+        except Exception:
+            # logged once per failure mark: while marked, this model is not
+            # called again, and a replacement model that fails is logged anew
+            logger.warning("model prediction failed for %s, using heuristic fallback", player_name, exc_info=True)
+            if self._failure_ttl > 0:
+                self._mark_failed(player_name, model)
+            return self._heuristic(player_name, stat_type, line, player_data)
+
+        # simple transform to probability (sigmoid centered on line);
+        # math.exp on the scalar, np.exp stays in the batch kernel
+        z = float(line) - raw
+        over_prob = 1.0 / (1.0 + math.exp(z)) if z < 700.0 else 0.0
+        over_prob = max(0.0, min(1.0, over_prob))
+        return self._result(player_name, stat_type, line, raw, over_prob)
+
+    def _mark_failed(self, player_name: str, model) -> None:
+        now = time.monotonic()
+        with self._failed_lock:
+            self._failed_models[player_name] = (now + self._failure_ttl, model)
+            self._failed_models.move_to_end(player_name)
+            # one TTL for every entry, so the oldest mark expires first
+            while self._failed_models:
+                deadline, _ = next(iter(self._failed_models.values()))
+                if deadline > now and len(self._failed_models) <= self._failure_cache_size:
+                    break
+                self._failed_models.popitem(last=False)
+
+    def _recently_failed(self, player_name: str, model) -> bool:
+        with self._failed_lock:
+            entry = self._failed_models.get(player_name)
+            if entry is None:
+                return False
+            if entry[1] is model and time.monotonic() < entry[0]:
+                return True
+            self._failed_models.pop(player_name, None)
+            return False
+
+    def _heuristic(self, player_name: str, stat_type: str, line: float, player_data: Dict) -> Dict:
+        """Recent-form fallback used when no model is available (or it fails)."""
+        recent = player_data.get("recentGames") or []
+        vals = [v for g in recent if (v := g.get("statValue")) is not None]
+        mean = statistics.fmean(vals) if vals else float(player_data.get("seasonAvg") or 0.0)
+        over_prob = 0.5 + (mean - line) * 0.05
+        over_prob = float(max(0.05, min(0.95, over_prob)))
+        return self._result(player_name, stat_type, line, mean, over_prob)
+
+    async def predict_batch(self, requests: List[Dict]) -> List[Dict]:
+        """Awaitable wrapper around `predict_batch_sync`."""
+        return self.predict_batch_sync(requests)
+
+    async def predict_many(self, requests: List[Dict]) -> List[Dict]:
+        """Run `predict_batch_sync` for the whole batch in one worker thread."""
+        return await asyncio.to_thread(self.predict_batch_sync, requests)
+
+    def predict_batch_sync(self, requests: List[Dict]) -> List[Dict]:
+        """Predict many requests at once; results are returned in input order.
+
+        Each request is a dict with the `predict` keyword arguments
+        (`player_name`, `stat_type`, `line`, `player_data`, optional
+        `opponent_data`). Requests are grouped by player so each persisted
+        model is loaded once and called once on a stacked feature matrix, and
+        the probability / EV / recommendation columns come from one
+        `score_tail` pass over the group.
+        Players without a model (or whose model fails) go through `predict_sync`.
+        """
+        results: List[Optional[Dict]] = [None] * len(requests)
+        by_player: Dict[str, List[int]] = defaultdict(list)
+        for i, req in enumerate(requests):
+            by_player[req["player_name"]].append(i)
+
+        for player_name, idxs in by_player.items():
+            group = [requests[i] for i in idxs]
+            model = self.registry.load_model(player_name)
+            raws = None
+            if model is not None:
+                try:
+                    feats = [engineer_features_dict(r.get("player_data") or {}, r.get("opponent_data")) for r in group]
+                    raws = model_predict(model, self._batch_input(model, feats))
+                    raws = np.asarray(raws, dtype=np.float64).reshape(-1)
+                    if raws.shape[0] != len(group):
+                        raise ValueError("model returned %d predictions for %d rows" % (raws.shape[0], len(group)))
+                except Exception:
+                    logger.exception("batch model prediction failed for %s, using per-request path", player_name)
+                    raws = None
+            if raws is None:
+                for i, req in zip(idxs, group):
+                    results[i] = self.predict_sync(
+                        req["player_name"], req.get("stat_type", "points"), req["line"],
+                        req.get("player_data") or {}, req.get("opponent_data"),
+                    )
+                continue
+
+            lines = np.fromiter((float(r["line"]) for r in group), dtype=np.float64, count=len(group))
+            # derived columns computed in one compiled pass, then zipped into rows
+            over_probs, unders, evs, confs, codes = score_tail(
+                raws, lines, _DEFAULT_DECIMAL_ODDS, _OVER_THRESHOLD, _UNDER_THRESHOLD,
+            )
+            recs = _REC_LABELS[codes]
+            for i, req, raw, over_prob, under, rec, ev, conf in zip(
+                idxs, group, raws.tolist(), over_probs.tolist(), unders.tolist(), recs.tolist(), evs.tolist(), confs.tolist()
+            ):
+                results[i] = {
                     "player": player_name,
-                    "stat": stat_type,
-                    "line": line,
-                    "predicted_value": mean,
+                    "stat": req.get("stat_type", "points"),
+                    "line": req["line"],
+                    "predicted_value": raw,
                     "over_probability": over_prob,
-                    "under_probability": 1 - over_prob,
+                    "under_probability": under,
                     "recommendation": rec,
                     "expected_value": ev,
-                    "confidence": abs(over_prob - 0.5) * 200,
+                    "confidence": conf,
                 }
+        return results
 
-            # If a model exists, try to predict
+    @staticmethod
+    def _batch_input(model, features: List[Dict]):
+        """Stack several feature dicts into one model input (see `_model_input`)."""
+        if getattr(model, "feature_names_in_", None) is None and len({tuple(f) for f in features}) == 1:
             try:
-                # Ensure features are numeric DataFrame/array acceptable to sklearn
-                raw = model.predict(features)[0]
-            except Exception:
-                logger.exception("model prediction failed, using fallback")
-                return await self.predict(player_name, stat_type, line, player_data, opponent_data)
-
-            # simple transform to probability (sigmoid centered on line)
-            over_prob = 1.0 / (1.0 + np.exp(-(raw - line)))
-            over_prob = float(max(0.0, min(1.0, over_prob)))
-            ev = self._calculate_ev(over_prob)
-            rec = "OVER" if over_prob > 0.55 else ("UNDER" if over_prob < 0.45 else None)
-
-            return {
-                "player": player_name,
-                "stat": stat_type,
-                "line": line,
-                "predicted_value": float(raw),
-                "over_probability": over_prob,
-                "under_probability": 1 - over_prob,
-                "recommendation": rec,
-                "expected_value": ev,
-                "confidence": abs(over_prob - 0.5) * 200,
-            }
+                return features_to_matrix(features)
+            except (TypeError, ValueError):
+                pass
+        return features_to_frame(features)
 
-        except Exception as e:
-            logger.exception("prediction error: %s", e)
-            return {"player": player_name, "error": str(e)}
+    @staticmethod
+    def _model_input(model, features: Dict):
+        """Return `features` in the form `model.predict` expects.
+
+        Models fitted on a DataFrame (sklearn sets `feature_names_in_`) get the
+        named-column frame; everything else gets a plain `(1, n)` array, which
+        skips the pandas construction on the hot path.
+        """
+        if getattr(model, "feature_names_in_", None) is not None:
+            return features_to_frame(features)
+        try:
+            return features_to_row(features)
+        except (TypeError, ValueError):
+            return features_to_frame(features)
+
+    @classmethod
+    def _result(cls, player_name: str, stat_type: str, line: float, predicted_value: float, over_prob: float) -> Dict:
+        return {
+            "player": player_name,
+            "stat": stat_type,
+            "line": line,
+            "predicted_value": predicted_value,
+            "over_probability": over_prob,
+            "under_probability": 1 - over_prob,
+            "recommendation": "OVER" if over_prob > _OVER_THRESHOLD else ("UNDER" if over_prob < _UNDER_THRESHOLD else None),
+            "expected_value": cls._calculate_ev(over_prob),
+            "confidence": abs(over_prob - 0.5) * 200,
+        }
 
     @staticmethod
     def _calculate_ev(over_probability: float, odds_over: int = -110, odds_under: int = -110) -> float:
-        # Convert American odds to decimal
-        def to_decimal(o):
-            return (o / 100.0) + 1.0 if o > 0 else (100.0 / abs(o)) + 1.0
-
-        dec_over = to_decimal(odds_over)
-        dec_under = to_decimal(odds_under)
-        ev_over = (over_probability * dec_over) - 1.0
-        ev_under = ((1.0 - over_probability) * dec_under) - 1.0
-        return float(max(ev_over, ev_under))
+        return float(max(
+            over_probability * _to_decimal(odds_over) - 1.0,
+            (1.0 - over_probability) * _to_decimal(odds_under) - 1.0,
+        ))
@@ -1,13 +1,43 @@
 from __future__ import annotations
+import atexit
+import functools
+import itertools
 import os
 import joblib
 import logging
-from typing import Optional
+import mmap
+import pickle
+import queue
+import shutil
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
-from sqlalchemy import create_engine
 import json
 import hashlib
-from sqlalchemy.dialects import postgresql as pg_dialect
+import hmac
+
+try:
+    from backend.services import cache as _cache_module
+except Exception:  # pragma: no cover - cache layer unavailable
+    _cache_module = None
+
+try:
+    import orjson
+
+    def _sidecar_bytes(meta: dict) -> bytes:
+        # numpy scalars/arrays (e.g. a feature list kept as an ndarray) are
+        # serialized natively; anything orjson rejects goes through json
+        try:
+            return orjson.dumps(meta, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            return json.dumps(meta, indent=2).encode('utf-8')
+except Exception:  # pragma: no cover - optional dependency
+    def _sidecar_bytes(meta: dict) -> bytes:
+        return json.dumps(meta, indent=2).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +66,561 @@ def _sync_db_url(raw: Optional[str]) -> str:
     return sync
 
 
+@functools.lru_cache(maxsize=4)
+def _get_engine(sync_url: str):
+    """Process-wide sync engine for `sync_url`, so metadata inserts reuse one
+    connection pool instead of building (and discarding) one per save.
+    Pooled connections are pinged on checkout, since a long-lived engine
+    can outlast a database restart."""
+    from sqlalchemy import create_engine  # local import: only the DB paths need it
+
+    engine = create_engine(sync_url, future=True, pool_pre_ping=True)
+    _engines.add(engine)
+    return engine
+
+
+# engines built by _get_engine, so a forked child can drop their pools
+_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _metadata_db_url() -> Optional[str]:
+    """Sync URL for model_metadata writes, or None when there is no database
+    to write to: a SQLite file that does not exist (connecting would only
+    create an empty file without the table), e.g. the dev default when
+    DATABASE_URL is unset. Checked without importing SQLAlchemy."""
+    url = _sync_db_url(os.environ.get("DATABASE_URL"))
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):].split('?', 1)[0]
+        if path and path != ':memory:' and not os.path.exists(path):
+            return None
+    return url
+
+
+def _upsert_model_metadata(conn, ins_kwargs: dict) -> None:
+    """Insert or update the `model_metadata` row for (name, version)."""
+    from backend.models.model_metadata import ModelMetadata  # local import
+
+    table = ModelMetadata.__table__
+    player_name = ins_kwargs.get('name')
+    version = ins_kwargs.get('version')
+    try:
+        # One round trip where the dialect has a native upsert. NULL versions
+        # never conflict, so those rows take the select path below.
+        if version is not None and conn.dialect.name in _NATIVE_UPSERT_DIALECTS:
+            try:
+                conn.execute(_upsert_statement(conn.dialect.name, tuple(sorted(ins_kwargs))), ins_kwargs)
+                logger.info("Upserted ModelMetadata row for %s", player_name)
+                return
+            except Exception:
+                pass  # e.g. no unique index on (name, version): select+write
+        # Generic DB: try select then insert/update (best-effort)
+        sel = table.select().where((table.c.name == player_name) & (table.c.version == version))
+        existing = conn.execute(sel).first()
+        if existing is not None:
+            conn.execute(table.update().where(table.c.id == existing.id).values(**ins_kwargs))
+        else:
+            conn.execute(table.insert().values(**ins_kwargs))
+    except Exception:
+        # Fallback: try serializing JSON-like fields and retry insert
+        try:
+            row = dict(ins_kwargs)
+            for col in ('kept_contextual_features', 'feature_list'):
+                if row.get(col) is not None:
+                    row[col] = json.dumps(row[col])
+            conn.execute(table.insert().values(**row))
+        except Exception:
+            logger.exception("Failed to insert or update ModelMetadata for %s", player_name)
+            return
+    logger.info("Inserted ModelMetadata row for %s", player_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _metadata_statements():
+    """(table, existing-rows SELECT, UPDATE by id, INSERT) for batched
+    model_metadata writes, built once and reused with bound parameters."""
+    from sqlalchemy import bindparam, select
+    from backend.models.model_metadata import ModelMetadata  # local import
+
+    t = ModelMetadata.__table__
+    existing = (
+        select(t.c.id, t.c.name, t.c.version)
+        .where(t.c.name.in_(bindparam('names', expanding=True)))
+        .order_by(t.c.id)
+    )
+    return t, existing, t.update().where(t.c.id == bindparam('_id')), t.insert()
+
+
+# Dialects with a single-statement upsert on the (name, version) unique key.
+_NATIVE_UPSERT_DIALECTS = ('postgresql', 'sqlite', 'mysql', 'mariadb')
+
+
+@functools.lru_cache(maxsize=32)
+def _upsert_statement(dialect: str, keys: tuple):
+    """INSERT-or-update on (name, version) for rows carrying exactly `keys`:
+    ON CONFLICT DO UPDATE on Postgres and SQLite (3.24+), ON DUPLICATE KEY
+    UPDATE on MySQL/MariaDB."""
+    t = _metadata_statements()[0]
+    cols = [k for k in keys if k not in ('name', 'version')]
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects import mysql
+
+        stmt = mysql.insert(t)
+        if not cols:
+            return stmt.prefix_with('IGNORE')
+        return stmt.on_duplicate_key_update({k: stmt.inserted[k] for k in cols})
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects import postgresql as dialect_mod
+    else:
+        from sqlalchemy.dialects import sqlite as dialect_mod
+    stmt = dialect_mod.insert(t)
+    if not cols:
+        return stmt.on_conflict_do_nothing(index_elements=['name', 'version'])
+    return stmt.on_conflict_do_update(
+        index_elements=['name', 'version'],
+        set_={k: stmt.excluded[k] for k in cols},
+    )
+
+
+def _by_shape(rows):
+    """Group rows by their key set (executemany needs uniform parameters)."""
+    groups: Dict[tuple, list] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups.items()
+
+
+def _upsert_model_metadata_many(conn, rows: list) -> None:
+    """Batched `_upsert_model_metadata`: one native-upsert executemany per row
+    shape, or (NULL versions, other dialects) one SELECT for the whole batch
+    and one executemany per statement and row shape. Rows for the same (name,
+    version) are merged in order, as sequential upserts would leave them.
+    Raises on any failure so the caller can fall back to row-by-row writes."""
+    merged: Dict[tuple, dict] = {}
+    for row in rows:
+        key = (row.get('name'), row.get('version'))
+        merged[key] = {**merged[key], **row} if key in merged else dict(row)
+    if conn.dialect.name in _NATIVE_UPSERT_DIALECTS and all(k[1] is not None for k in merged):
+        for keys, group in _by_shape(merged.values()):
+            conn.execute(_upsert_statement(conn.dialect.name, keys), group)
+        return
+    _, existing, update, insert = _metadata_statements()
+    ids: Dict[tuple, int] = {}
+    for rid, name, version in conn.execute(existing, {'names': sorted({k[0] for k in merged})}):
+        ids.setdefault((name, version), rid)
+    updates, inserts = [], []
+    for key, row in merged.items():
+        if key in ids:
+            updates.append({**row, '_id': ids[key]})
+        else:
+            inserts.append(row)
+    for _, group in _by_shape(updates):
+        conn.execute(update, group)
+    for _, group in _by_shape(inserts):
+        conn.execute(insert, group)
+
+# Background writer for model_metadata rows: save_model enqueues and returns,
+# and one daemon thread applies up to _METADATA_BATCH rows per transaction.
+# MODEL_METADATA_ASYNC=false writes inline instead. Rows still queued at
+# interpreter exit are flushed by an atexit hook.
+_METADATA_BATCH = 100
+_metadata_queue: "queue.Queue" = queue.Queue(maxsize=1024)
+_metadata_thread: Optional[threading.Thread] = None
+_metadata_lock = threading.Lock()
+
+
+def _write_metadata_batch(sync_url: str, rows: list) -> None:
+    engine = _get_engine(sync_url)
+    try:
+        with engine.begin() as conn:
+            _upsert_model_metadata_many(conn, rows)
+        logger.info("Wrote %d ModelMetadata row(s)", len(rows))
+        return
+    except Exception:
+        logger.debug("Batched ModelMetadata write failed; retrying row by row", exc_info=True)
+    # one bad row must not cost the rest of the batch
+    for row in rows:
+        try:
+            with engine.begin() as conn:
+                _upsert_model_metadata(conn, row)
+        except Exception:
+            logger.exception("Failed to persist ModelMetadata for %s", row.get('name'))
+
+
+def _metadata_worker() -> None:
+    while True:
+        jobs = [_metadata_queue.get()]
+        while len(jobs) < _METADATA_BATCH:
+            try:
+                jobs.append(_metadata_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            by_url: Dict[str, list] = {}
+            for sync_url, row in jobs:
+                by_url.setdefault(sync_url, []).append(row)
+            for sync_url, rows in by_url.items():
+                _write_metadata_batch(sync_url, rows)
+        except Exception:
+            logger.exception("Model metadata writer failed")
+        finally:
+            for _ in jobs:
+                _metadata_queue.task_done()
+
+
+def _background_writes() -> bool:
+    """Whether save_model hands its metadata rows and Redis invalidation to
+    background threads (MODEL_METADATA_ASYNC, on by default)."""
+    return os.environ.get('MODEL_METADATA_ASYNC', 'true').lower() not in ('0', 'false', 'no')
+
+
+def _submit_metadata(sync_url: str, rows: list) -> None:
+    """Queue model_metadata rows for the background writer (or, with
+    MODEL_METADATA_ASYNC=false, write them now in one transaction)."""
+    global _metadata_thread
+    if not _background_writes():
+        _write_metadata_batch(sync_url, rows)
+        return
+    if _metadata_thread is None:
+        with _metadata_lock:
+            if _metadata_thread is None:
+                t = threading.Thread(target=_metadata_worker, name='model-metadata-writer', daemon=True)
+                t.start()
+                atexit.register(flush_metadata_writes)
+                _metadata_thread = t
+    for row in rows:
+        try:
+            _metadata_queue.put_nowait((sync_url, row))
+        except queue.Full:
+            logger.warning("Model metadata queue full; dropping row for %s", row.get('name'))
+
+
+def flush_metadata_writes(timeout: Optional[float] = 10.0) -> bool:
+    """Wait until queued model_metadata rows are written (at most `timeout`
+    seconds, None waits indefinitely). Returns True when the queue drained."""
+    if _metadata_thread is None:
+        return True
+    done = threading.Event()
+
+    def _join():
+        _metadata_queue.join()
+        done.set()
+
+    threading.Thread(target=_join, daemon=True).start()
+    return done.wait(timeout)
+
+
+def _reset_metadata_writer() -> None:
+    """In a forked child: forget the parent's writer thread (it does not
+    exist here) and its queue, whose lock may have been held at fork time.
+    The first save in the child starts its own writer. Inherited engines
+    drop their pooled connections without closing the parent's sockets."""
+    global _metadata_queue, _metadata_thread, _metadata_lock
+    _metadata_queue = queue.Queue(maxsize=1024)
+    _metadata_thread = None
+    _metadata_lock = threading.Lock()
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_metadata_writer)
+
+
+def _merge_notes(notes, **extra) -> dict:
+    """`notes` (None, a dict or a JSON/plain string) as a new dict with
+    `extra` added; notes that are not a JSON object go under 'orig_notes'."""
+    if notes is None:
+        return dict(extra)
+    try:
+        parsed = json.loads(notes) if isinstance(notes, str) else notes
+    except Exception:
+        parsed = None
+    if isinstance(parsed, dict):
+        return {**parsed, **extra}
+    return {'orig_notes': notes, **extra}
+
+
+def _checksum_json(features) -> str:
+    js = json.dumps(list(features), separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(js.encode('utf-8')).hexdigest()
+
+
+_cached_checksum = functools.lru_cache(maxsize=256)(_checksum_json)
+
+
+def _feature_checksum(features) -> str:
+    """`feature_list_checksum` of a feature list: sha256 of its compact JSON.
+    Written to sidecars at save time and compared by validate_feature_list;
+    memoized per distinct list (as a tuple) so repeat calls skip the work."""
+    try:
+        return _cached_checksum(tuple(features))
+    except TypeError:  # unhashable entries
+        return _checksum_json(features)
+
+
+_uid_counter = itertools.count()
+
+
+def _version_uid(player_name: str) -> str:
+    """12 hex chars naming a version directory. Unique per save: the counter
+    separates saves within a process, the pid separates processes, and the
+    clock separates a later process that reuses a pid."""
+    key = f"{player_name}|{os.getpid()}|{time.time_ns()}|{next(_uid_counter)}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()
+
+# Artifacts that pickle to less than this are written with plain pickle
+# (protocol 5) and read back with the C unpickler; larger ones go through
+# joblib. Both formats stay readable by `joblib.load`.
+_PICKLE_MAX_BYTES = 1 << 20
+
+# joblib artifacts are loaded with their numpy arrays memory-mapped read-only,
+# so workers serving the same models_store share the page cache rather than
+# each holding a private copy (MODEL_MMAP=false loads them into memory).
+_MMAP_MODE = None if os.environ.get('MODEL_MMAP', 'true').lower() in ('0', 'false', 'no') else 'r'
+
+
+def _artifact_compression(raw: Optional[str]):
+    """joblib `compress` value for MODEL_COMPRESS: off by default, since a
+    compressed artifact cannot be memory-mapped. `true` (or a level 1-9)
+    selects lz4 when installed and zlib otherwise."""
+    raw = (raw or '').strip().lower()
+    if raw in ('', '0', 'false', 'no'):
+        return 0
+    level = int(raw) if raw.isdigit() else 3
+    try:
+        import lz4  # noqa: F401
+        return ('lz4', level)
+    except Exception:
+        return ('zlib', level)
+
+
+_COMPRESS = _artifact_compression(os.environ.get('MODEL_COMPRESS'))
+
+
+def _tmp_path(path: str) -> str:
+    # unique per writer thread, so concurrent saves never share a temp file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _open_exclusive(tmp: str):
+    try:
+        return open(tmp, 'xb')
+    except FileExistsError:
+        # left behind by a crashed writer that had the same pid / thread id
+        os.remove(tmp)
+        return open(tmp, 'xb')
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist the directory entry created by a rename (no-op where
+    directories cannot be opened, e.g. Windows)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dump_artifact(obj, path: str, compress=None) -> None:
+    """Write `obj` to `path` atomically: temp file (created exclusively),
+    fsync, rename, fsync of the directory. A crash leaves either the old or
+    the new artifact, and a process that has the previous one mapped never
+    sees it truncated underneath it.
+
+    `compress` overrides MODEL_COMPRESS for large artifacts (e.g. archival
+    copies that will not be served)."""
+    compress = _COMPRESS if compress is None else compress
+    # Size the object with numpy buffers passed out-of-band: the arrays that
+    # dominate a large model are referenced, not copied, so picking the
+    # format does not cost a full serialisation.
+    buffers: List[pickle.PickleBuffer] = []
+    try:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        size = len(data) + sum(b.raw().nbytes for b in buffers)
+    except Exception:
+        data, size = None, None
+    tmp = _tmp_path(path)
+    try:
+        with _open_exclusive(tmp) as fh:
+            if data is not None and size < _PICKLE_MAX_BYTES:
+                fh.write(pickle.dumps(obj, protocol=5) if buffers else data)
+            elif data is not None and not buffers and not compress:
+                # large but array-free: nothing to memory-map, so the
+                # pickle already built is the artifact
+                fh.write(data)
+            else:
+                joblib.dump(obj, fh, compress=compress, protocol=5)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+    _fsync_dir(path)
+
+
+def _link_artifact(src: str, dst: str) -> None:
+    """Point `dst` at the already-written artifact `src` without serializing
+    the model again: a hard link where the filesystem allows it, else a byte
+    copy. Swapped in by rename, like `_dump_artifact`."""
+    tmp = _tmp_path(dst)
+    try:
+        try:
+            os.link(src, tmp)
+        except FileExistsError:
+            os.remove(tmp)
+            os.link(src, tmp)
+    except OSError:  # cross-device, or no hard links on this filesystem
+        try:
+            _open_exclusive(tmp).close()
+            # copyfile copies in the kernel (sendfile / fcopyfile) where it can
+            shutil.copyfile(src, tmp)
+            fd = os.open(tmp, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except BaseException:
+            _remove_quietly(tmp)
+            raise
+    try:
+        os.replace(tmp, dst)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+    _fsync_dir(dst)
+
+
+_HMAC_CHUNK = 1 << 20
+
+
+def _file_hmac(key: bytes, path: str) -> str:
+    """HMAC-SHA256 of the file at `path`.
+
+    The file is memory-mapped and handed to `hmac.update` whole, so OpenSSL
+    hashes it in one C call (without the GIL) rather than one interpreter
+    round trip per chunk. Empty or unmappable files are streamed in
+    `_HMAC_CHUNK` pieces instead; either way peak memory stays constant.
+    """
+    mac = hmac.new(key, None, hashlib.sha256)
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # empty file / no mmap support
+            mm = None
+        if mm is not None:
+            with mm:
+                if hasattr(mm, 'madvise'):
+                    try:
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    except (OSError, AttributeError):
+                        pass
+                mac.update(mm)
+            return mac.hexdigest()
+        with open(fd, 'rb', buffering=0, closefd=False) as fh:
+            buf = bytearray(_HMAC_CHUNK)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                mac.update(view[:n])
+    finally:
+        os.close(fd)
+    return mac.hexdigest()
+
+
+def _load_artifact(path: str):
+    """Load an artifact written by `_dump_artifact` or `joblib.dump`.
+
+    Small uncompressed files without joblib's numpy array records are
+    unpickled directly; anything else (or a failed attempt) uses joblib.
+    """
+    if os.path.getsize(path) < _PICKLE_MAX_BYTES:
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        if data[:1] == b'\x80' and b'joblib.numpy_pickle' not in data:
+            try:
+                return pickle.loads(data)
+            except (pickle.UnpicklingError, EOFError):
+                pass
+    with warnings.catch_warnings():
+        # compressed artifacts are read into memory; that is expected
+        warnings.filterwarnings('ignore', message='mmap_mode .* not compatible with compressed', category=UserWarning)
+        return joblib.load(path, mmap_mode=_MMAP_MODE)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, 'false').lower() in ('1', 'true', 'yes')
+
+
+def _onnxruntime_available() -> bool:
+    try:
+        from backend.models.onnx_model import ONNXRUNTIME_AVAILABLE
+    except Exception:
+        return False
+    return ONNXRUNTIME_AVAILABLE
+
+
 class ModelRegistry:
-    def __init__(self, model_dir: str = "./backend/models_store"):
+    def __init__(self, model_dir: str = "./backend/models_store", compress_artifacts=None):
         self.model_dir = os.path.abspath(model_dir)
         os.makedirs(self.model_dir, exist_ok=True)
-        # In-memory cache of loaded models to enable fast predictions
-        # and to make startup preloading meaningful.
-        self._loaded_models = {}
+        # joblib `compress` for large artifacts this registry writes: None
+        # follows MODEL_COMPRESS, True/False or a level 1-9 override it.
+        # Compressed artifacts load fully into memory instead of mmap.
+        if compress_artifacts is None:
+            self._compress = None
+        elif isinstance(compress_artifacts, bool):
+            self._compress = _artifact_compression('true' if compress_artifacts else 'false')
+        else:
+            self._compress = _artifact_compression(str(compress_artifacts))
+        # In-memory LRU of loaded models (player -> model), capped at
+        # MODEL_CACHE_SIZE entries so RSS tracks the working set rather than
+        # the whole store. `_model_stamps` records the artifact each entry was
+        # loaded from so a newer file on disk is picked up.
+        self._loaded_models = OrderedDict()
+        self._model_stamps = {}
+        self._lru_lock = threading.Lock()
+        self._model_cache_size = max(1, int(os.environ.get('MODEL_CACHE_SIZE', '128')))
+        # Loaded calibrators keyed by player -> ((mtime_ns, size), calibrator).
+        # A single stat() per lookup revalidates the entry, so a calibrator
+        # rewritten by another process is still picked up. LRU-capped at
+        # MODEL_CACHE_SIZE like the models.
+        self._loaded_calibrators = OrderedDict()
+        # versions dir -> (dir mtime_ns, versions/*/model.pkl newest first).
+        # save_model adds a new subdirectory per version, which bumps the
+        # versions dir mtime and triggers a rescan.
+        self._version_index = {}
+        # (model_dir mtime_ns, sorted model filenames) for list_models.
+        self._model_listing = None
+        # (signing key, st_dev, st_ino, mtime_ns, size) -> artifact HMAC, so a
+        # file (or a hard link to it) is hashed once until it changes.
+        self._hmac_cache = OrderedDict()
+        # Optional ONNX artifacts (see backend.models.onnx_model): written next
+        # to model.pkl on save with MODEL_EXPORT_ONNX, served in its place with
+        # MODEL_USE_ONNX when onnxruntime is installed and the .onnx is at
+        # least as new as the pickle. Not used when artifact signing is on.
+        self._export_onnx = _env_flag('MODEL_EXPORT_ONNX')
+        self._serve_onnx = _env_flag('MODEL_USE_ONNX') and _onnxruntime_available()
 
     def _model_path(self, player_name: str) -> str:
         safe = player_name.replace(" ", "_")
@@ -57,12 +635,20 @@ class ModelRegistry:
         if not key:
             return None
         try:
-            import hmac
-            import hashlib as _hashlib
-            bkey = key.encode('utf-8')
-            with open(file_path, 'rb') as fh:
-                data = fh.read()
-            sig = hmac.new(bkey, data, _hashlib.sha256).hexdigest()
+            st = os.stat(file_path)
+            # ctime as well as mtime: utime can put mtime back after an
+            # in-place rewrite, but nothing short of the clock resets ctime
+            cache_key = (key, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+            with self._lru_lock:
+                sig = self._hmac_cache.get(cache_key)
+                if sig is not None:
+                    self._hmac_cache.move_to_end(cache_key)
+                    return sig
+            sig = _file_hmac(key.encode('utf-8'), file_path)
+            with self._lru_lock:
+                self._hmac_cache[cache_key] = sig
+                while len(self._hmac_cache) > 2 * self._model_cache_size:
+                    self._hmac_cache.popitem(last=False)
             return sig
         except Exception:
             logger.exception('Failed to compute HMAC for %s', file_path)
@@ -72,207 +658,157 @@ class ModelRegistry:
         """Save a model artifact to disk and persist metadata to the DB.
 
         `version` and `notes` are optional textual fields stored in
-        `model_metadata` table for traceability.
+        `model_metadata` table for traceability. The DB row and the Redis
+        cache invalidation happen in the background; call `flush()` to wait
+        for them.
         """
+        self._save_one(player_name, model, version, notes, None)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait for background work from earlier saves (metadata rows and
+        Redis invalidations). Returns True when both drained in time."""
+        done = flush_metadata_writes(timeout)
+        if _cache_module is not None:
+            done = _cache_module.flush_invalidations(timeout) and done
+        return done
+
+    def save_models_bulk(self, items) -> None:
+        """Save many models at once, e.g. a nightly retrain of every player.
+
+        `items` yields `(player_name, model)` or `(player_name, model,
+        version, notes)` tuples. Each artifact is written as by `save_model`;
+        the prediction caches of all players are then invalidated in one
+        sweep and their metadata rows submitted together.
+        """
+        pending = {'prefixes': [], 'rows': []}
+        for item in items:
+            player_name, model, *rest = item
+            version = rest[0] if len(rest) > 0 else None
+            notes = rest[1] if len(rest) > 1 else None
+            self._save_one(player_name, model, version, notes, pending)
+        if pending['prefixes'] and _cache_module is not None:
+            try:
+                _cache_module.invalidate_prefixes_sync(pending['prefixes'], background=_background_writes())
+            except Exception:
+                logger.exception("Failed to invalidate cached predictions after bulk save")
+        sync_url = _metadata_db_url()
+        if pending['rows'] and sync_url is not None:
+            try:
+                _submit_metadata(sync_url, pending['rows'])
+            except Exception:
+                logger.exception("Failed to persist ModelMetadata for bulk save")
+
+    def _save_one(self, player_name: str, model, version: Optional[str], notes: Optional[str], pending: Optional[dict]) -> None:
+        """Body of `save_model`. With `pending` (see `save_models_bulk`) the
+        cache prefixes and metadata row are collected instead of applied."""
         # Write a versioned artifact under per-player directory for better organization
         safe = player_name.replace(' ', '_')
         # generate a version id if not provided
-        import datetime, uuid
-        ver_id = version or datetime.datetime.utcnow().strftime('v%Y%m%dT%H%M%SZ')
-        # use uuid to avoid collisions for same-version tradeoffs
-        uid = uuid.uuid4().hex[:12]
+        ver_id = version or time.strftime('v%Y%m%dT%H%M%SZ', time.gmtime())
+        # unique suffix so repeated saves of the same version never collide
+        uid = _version_uid(player_name)
         player_dir = os.path.join(self.model_dir, safe)
         version_dir = os.path.join(player_dir, 'versions', f"{ver_id}_{uid}")
         os.makedirs(version_dir, exist_ok=True)
         versioned_path = os.path.join(version_dir, 'model.pkl')
-        joblib.dump(model, versioned_path)
+        _dump_artifact(model, versioned_path, compress=self._compress)
+        if self._export_onnx:
+            try:
+                from backend.models.onnx_model import export_onnx
+                if export_onnx(model, os.path.join(version_dir, 'model.onnx')):
+                    logger.info("Exported ONNX model for %s", player_name)
+            except Exception:
+                logger.debug('ONNX export skipped for %s', player_name, exc_info=True)
+        self._version_index.pop(os.path.join(player_dir, 'versions'), None)
         logger.info("Saved versioned model for %s to %s", player_name, versioned_path)
 
-        # compute artifact signature if signing key present
-        artifact_sig = self._compute_hmac(versioned_path)
-
         # Also write the legacy flat path for backward compatibility
         legacy_path = self._model_path(player_name)
         try:
-            joblib.dump(model, legacy_path)
+            _link_artifact(versioned_path, legacy_path)
         except Exception:
             logger.debug('Failed to write flat compatibility model for %s', player_name)
 
+        # compute artifact signature if signing key present; after the link,
+        # which changes the inode's ctime and so the memoized HMAC's key
+        artifact_sig = self._compute_hmac(versioned_path)
+
         # Cache the model in-memory so services can use it without reloading
         try:
-            self._loaded_models[player_name] = model
+            self._cache_model(player_name, model, versioned_path)
         except Exception:
             logger.exception("Failed to cache model in-memory for %s", player_name)
 
-        # Invalidate any prediction/player-context caches related to this player.
-        try:
-            from backend.services import cache as cache_module
-
-            # FastAPI endpoint uses `predict:` prefix; keep `prediction:` as a fallback
-            try:
-                cache_module.redis_delete_prefix_sync(f"predict:{player_name}:")
-            except Exception:
-                logger.exception("Failed to delete predict cache prefix for %s", player_name)
-
-            # Best-effort: also remove keys from the in-process fallback store so
-            # invalidation is visible to async readers in environments without
-            # a real Redis server (useful for tests and local dev).
+        # Invalidate any prediction/player-context caches related to this player
+        # in one sweep: the in-process fallback store now, Redis in the
+        # background (inline with MODEL_METADATA_ASYNC=false).
+        if _cache_module is not None:
             try:
-                prefix = f"predict:{player_name}:"
-                if hasattr(cache_module, '_fallback_store'):
-                    for k in list(cache_module._fallback_store.keys()):
-                        if k.startswith(prefix):
-                            try:
-                                del cache_module._fallback_store[k]
-                            except Exception:
-                                pass
+                # FastAPI endpoint uses `predict:` prefix; keep `prediction:` as a fallback
+                prefixes = [
+                    f"predict:{player_name}:",
+                    f"prediction:{player_name}:",
+                    f"player_context:{player_name}:",
+                ]
+                if pending is not None:
+                    pending['prefixes'].extend(prefixes)
+                else:
+                    _cache_module.invalidate_prefixes_sync(prefixes, background=_background_writes())
             except Exception:
-                logger.exception("Best-effort predict prefix cleanup failed for %s", player_name)
+                logger.exception("Failed to invalidate cached predictions for %s", player_name)
 
-            try:
-                cache_module.redis_delete_prefix_sync(f"prediction:{player_name}:")
-            except Exception:
-                logger.exception("Failed to delete prediction cache prefix for %s", player_name)
-
-            try:
-                prefix = f"prediction:{player_name}:"
-                if hasattr(cache_module, '_fallback_store'):
-                    for k in list(cache_module._fallback_store.keys()):
-                        if k.startswith(prefix):
-                            try:
-                                del cache_module._fallback_store[k]
-                            except Exception:
-                                pass
-            except Exception:
-                logger.exception("Best-effort prediction prefix cleanup failed for %s", player_name)
-
-            try:
-                cache_module.redis_delete_prefix_sync(f"player_context:{player_name}:")
-            except Exception:
-                logger.exception("Failed to delete player_context cache prefix for %s", player_name)
-            try:
-                prefix = f"player_context:{player_name}:"
-                if hasattr(cache_module, '_fallback_store'):
-                    for k in list(cache_module._fallback_store.keys()):
-                        if k.startswith(prefix):
-                            try:
-                                del cache_module._fallback_store[k]
-                            except Exception:
-                                pass
-            except Exception:
-                logger.exception("Best-effort player_context prefix cleanup failed for %s", player_name)
+        # Read the model's feature attributes and the active mlflow run once;
+        # the DB row and the sidecar share the resulting lists.
+        try:
+            kept = getattr(model, '_kept_contextual_features', None)
+            kept_val = list(kept) if kept is not None else None
         except Exception:
-            logger.exception("Cache module not available for invalidation")
-
-        # Attempt to persist metadata into DB. Do this with a short-lived
-        # synchronous engine so this function can be called from sync code.
+            kept_val = None
         try:
-            from backend.models.model_metadata import ModelMetadata  # local import
+            featlist = getattr(model, '_feature_list', None)
+            featlist_val = list(featlist) if featlist is not None else None
+        except Exception:
+            featlist_val = None
+        run_id = None
+        try:
+            import mlflow
+            run = mlflow.active_run()
+            run_id = getattr(run.info, 'run_id', None) if run is not None else None
+        except Exception:
+            run_id = None
+        # the run id and feature list are mirrored into notes; `notes` is
+        # parsed once here and shared by the DB row and the sidecar
+        extra = {}
+        if run_id is not None:
+            extra['mlflow_run_id'] = run_id
+        if featlist_val is not None:
+            extra['feature_list'] = featlist_val
+        base_notes = _merge_notes(notes) if extra else None
 
-            raw_db = os.environ.get("DATABASE_URL")
-            sync_url = _sync_db_url(raw_db)
-            engine = create_engine(sync_url, future=True)
-            with engine.begin() as conn:
-                # If the model object carries `_kept_contextual_features`, attempt
-                # to persist it into the DB JSON column. For DBs that don't
-                # support native JSON, fall back to storing a JSON string.
-                kept = None
-                try:
-                    kept = getattr(model, '_kept_contextual_features', None)
-                    if kept is not None:
-                        # Normalize to a plain list
-                        kept_val = list(kept)
-                    else:
-                        kept_val = None
-                except Exception:
-                    kept_val = None
-
-                ins_kwargs = dict(
-                    name=player_name,
-                    version=version,
-                    path=os.path.abspath(versioned_path),
-                    notes=notes,
-                )
-                # Attach mlflow run_id into notes for traceability when available
-                run_id = None
-                try:
-                    import mlflow
-                    run = mlflow.active_run()
-                    if run is not None and getattr(run.info, 'run_id', None):
-                        run_id = run.info.run_id
-                        try:
-                            if ins_kwargs.get('notes') is None:
-                                ins_kwargs['notes'] = {'mlflow_run_id': run_id}
-                            else:
-                                try:
-                                    parsed = json.loads(ins_kwargs['notes']) if isinstance(ins_kwargs['notes'], str) else ins_kwargs['notes']
-                                    if isinstance(parsed, dict):
-                                        parsed['mlflow_run_id'] = run_id
-                                        ins_kwargs['notes'] = parsed
-                                    else:
-                                        ins_kwargs['notes'] = {'orig_notes': ins_kwargs['notes'], 'mlflow_run_id': run_id}
-                                except Exception:
-                                    ins_kwargs['notes'] = {'orig_notes': ins_kwargs['notes'], 'mlflow_run_id': run_id}
-                        except Exception:
-                            pass
-                except Exception:
-                    run_id = None
-                if kept_val is not None:
-                    ins_kwargs['kept_contextual_features'] = kept_val
-                # include explicit feature_list column when available
-                try:
-                    featlist_val = getattr(model, '_feature_list', None)
-                    if featlist_val is not None:
-                        ins_kwargs['feature_list'] = list(featlist_val)
-                except Exception:
-                    pass
+        # Persist metadata into the DB. The row is built here (the mlflow run
+        # is only visible from this thread) and written by the background
+        # metadata writer, so the save does not wait on the DB round trip.
+        try:
+            ins_kwargs = dict(
+                name=player_name,
+                version=version,
+                path=os.path.abspath(versioned_path),
+                # attach the mlflow run_id for traceability when available
+                notes={**base_notes, 'mlflow_run_id': run_id} if run_id else notes,
+            )
+            # JSON columns; for DBs without native JSON the writer falls back
+            # to a JSON string.
+            if kept_val is not None:
+                ins_kwargs['kept_contextual_features'] = kept_val
+            if featlist_val is not None:
+                ins_kwargs['feature_list'] = featlist_val
 
-                try:
-                    # If Postgres, use native upsert for atomicity
-                    if engine.dialect.name == 'postgresql':
-                        try:
-                            insert_stmt = pg_dialect.insert(ModelMetadata.__table__).values(**ins_kwargs)
-                            do_update = insert_stmt.on_conflict_do_update(
-                                index_elements=['name', 'version'],
-                                set_=ins_kwargs,
-                            )
-                            conn.execute(do_update)
-                        except Exception:
-                            # fallback to select+insert
-                            sel = ModelMetadata.__table__.select().where(
-                                (ModelMetadata.__table__.c.name == player_name) & (ModelMetadata.__table__.c.version == version)
-                            )
-                            existing = conn.execute(sel).first()
-                            if existing is not None:
-                                upd = ModelMetadata.__table__.update().where(ModelMetadata.__table__.c.id == existing.id).values(**ins_kwargs)
-                                conn.execute(upd)
-                            else:
-                                ins = ModelMetadata.__table__.insert().values(**ins_kwargs)
-                                conn.execute(ins)
-                    else:
-                        # Generic DB: try select then insert/update (best-effort)
-                        sel = ModelMetadata.__table__.select().where(
-                            (ModelMetadata.__table__.c.name == player_name) & (ModelMetadata.__table__.c.version == version)
-                        )
-                        existing = conn.execute(sel).first()
-                        if existing is not None:
-                            upd = ModelMetadata.__table__.update().where(ModelMetadata.__table__.c.id == existing.id).values(**ins_kwargs)
-                            conn.execute(upd)
-                        else:
-                            ins = ModelMetadata.__table__.insert().values(**ins_kwargs)
-                            conn.execute(ins)
-                except Exception:
-                    # Fallback: try serializing JSON-like fields and retry insert
-                    try:
-                        if 'kept_contextual_features' in ins_kwargs and ins_kwargs['kept_contextual_features'] is not None:
-                            ins_kwargs['kept_contextual_features'] = json.dumps(ins_kwargs['kept_contextual_features'])
-                        if 'feature_list' in ins_kwargs and ins_kwargs['feature_list'] is not None:
-                            ins_kwargs['feature_list'] = json.dumps(ins_kwargs['feature_list'])
-                        ins = ModelMetadata.__table__.insert().values(**ins_kwargs)
-                        conn.execute(ins)
-                    except Exception:
-                        logger.exception("Failed to insert or update ModelMetadata for %s", player_name)
-            logger.info("Inserted ModelMetadata row for %s", player_name)
+            if pending is not None:
+                pending['rows'].append(ins_kwargs)
+            else:
+                sync_url = _metadata_db_url()
+                if sync_url is not None:
+                    _submit_metadata(sync_url, [ins_kwargs])
         except Exception:
             logger.exception("Failed to persist ModelMetadata for %s", player_name)
 
@@ -286,137 +822,140 @@ class ModelRegistry:
                 'version': version,
                 'notes': notes,
             }
-            # If model object carries a kept contextual features attribute,
-            # record it in the sidecar for later inspection.
-            kept = None
-            try:
-                kept = getattr(model, '_kept_contextual_features', None)
-            except Exception:
-                kept = None
-            if kept is not None:
-                meta['kept_contextual_features'] = list(kept)
-            # include canonical feature list when available
-            featlist = None
-            try:
-                featlist = getattr(model, '_feature_list', None)
-            except Exception:
-                featlist = None
-            if featlist is not None:
-                meta['feature_list'] = list(featlist)
-                # compute and include deterministic checksum for quick validation
+            if kept_val is not None:
+                meta['kept_contextual_features'] = kept_val
+            if run_id is not None:
+                meta['mlflow_run_id'] = run_id
+            if featlist_val is not None:
+                meta['feature_list'] = featlist_val
+                # deterministic checksum for quick validation
                 try:
-                    _js = json.dumps(list(featlist), separators=(',', ':'))
-                    checksum = hashlib.sha256(_js.encode('utf-8')).hexdigest()
-                    meta['feature_list_checksum'] = checksum
+                    meta['feature_list_checksum'] = _feature_checksum(featlist_val)
                 except Exception as exc:
                     logger.debug('Failed to compute feature_list checksum: %s', exc)
+            # mirror the run id and feature list into notes for DB visibility
+            if extra:
+                meta['notes'] = {**base_notes, **extra}
+            if artifact_sig is not None:
+                meta['artifact_sig'] = artifact_sig
 
-            # include mlflow run id in sidecar for traceability
-            try:
-                if run_id is not None:
-                    meta['mlflow_run_id'] = run_id
-                    # also merge into notes
-                    try:
-                        if meta.get('notes') is None:
-                            meta['notes'] = {'mlflow_run_id': run_id}
-                        else:
-                            try:
-                                parsed = json.loads(meta['notes']) if isinstance(meta['notes'], str) else meta['notes']
-                                if isinstance(parsed, dict):
-                                    parsed['mlflow_run_id'] = run_id
-                                    meta['notes'] = parsed
-                                else:
-                                    meta['notes'] = {'orig_notes': meta['notes'], 'mlflow_run_id': run_id}
-                            except Exception:
-                                meta['notes'] = {'orig_notes': meta['notes'], 'mlflow_run_id': run_id}
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-            # If feature list present and notes is a string, attempt to merge into notes for DB visibility
-            try:
-                import json as _json
-                if featlist is not None:
-                    if meta.get('notes') is None:
-                        meta['notes'] = {'feature_list': list(featlist)}
-                    else:
-                        # try to parse existing notes if JSON-like, else attach
-                        try:
-                            parsed = _json.loads(meta['notes']) if isinstance(meta['notes'], str) else meta['notes']
-                            if isinstance(parsed, dict):
-                                parsed['feature_list'] = list(featlist)
-                                meta['notes'] = parsed
-                            else:
-                                meta['notes'] = {'orig_notes': meta['notes'], 'feature_list': list(featlist)}
-                        except Exception:
-                            meta['notes'] = {'orig_notes': meta['notes'], 'feature_list': list(featlist)}
-            except Exception:
-                pass
-
-            import json
-            # Ensure checksum present in sidecar (compute again to be robust)
-            try:
-                if 'feature_list' in meta and 'feature_list_checksum' not in meta:
-                    _js = json.dumps(list(meta.get('feature_list', [])), separators=(',', ':'))
-                    meta['feature_list_checksum'] = hashlib.sha256(_js.encode('utf-8')).hexdigest()
-            except Exception:
-                pass
-
-            # Attach artifact signature when available
-            try:
-                if artifact_sig is not None:
-                    meta['artifact_sig'] = artifact_sig
-            except Exception:
-                pass
-
-            # Write sidecar next to versioned artifact
+            # Serialize once; write next to the versioned artifact and, for
+            # compatibility, next to the flat path.
+            body = _sidecar_bytes(meta)
             sidecar_versioned = os.path.splitext(versioned_path)[0] + "_metadata.json"
-            with open(sidecar_versioned, 'w', encoding='utf-8') as fh:
-                json.dump(meta, fh, indent=2)
-
-            # Also write legacy sidecar next to flat path for compatibility
+            with open(sidecar_versioned, 'wb') as fh:
+                fh.write(body)
             try:
                 legacy_sidecar = os.path.splitext(legacy_path)[0] + "_metadata.json"
-                with open(legacy_sidecar, 'w', encoding='utf-8') as fh:
-                    json.dump(meta, fh, indent=2)
+                with open(legacy_sidecar, 'wb') as fh:
+                    fh.write(body)
             except Exception:
                 logger.debug('Failed to write legacy sidecar for %s', player_name)
             logger.info("Wrote model sidecar metadata to %s", sidecar_versioned)
         except Exception:
             logger.exception("Failed to write model sidecar metadata for %s", player_name)
 
-    def load_model(self, player_name: str):
+    def _versioned_models(self, versions_dir: str) -> tuple:
+        """Return every `<versions_dir>/*/model.pkl`, newest (by mtime) first.
+
+        The result is cached per directory and only recomputed (one scandir
+        pass plus a stat per version) when the directory's mtime changes.
+        Ties on the nanosecond mtime go to the later version directory name
+        (`v<UTC timestamp>_<uid>` for generated ids).
+        """
+        try:
+            mtime = os.stat(versions_dir).st_mtime_ns
+        except OSError:
+            self._version_index.pop(versions_dir, None)
+            return ()
+        cached = self._version_index.get(versions_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        found = []
+        with os.scandir(versions_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                path = os.path.join(entry.path, 'model.pkl')
+                try:
+                    found.append((os.stat(path).st_mtime_ns, entry.name, path))
+                except OSError:
+                    continue
+        found.sort(reverse=True)
+        paths = tuple(path for _, _, path in found)
+        self._version_index[versions_dir] = (mtime, paths)
+        return paths
+
+    def _latest_versioned_model(self, versions_dir: str) -> Optional[str]:
+        """Return the newest `<versions_dir>/*/model.pkl`, or None."""
+        paths = self._versioned_models(versions_dir)
+        return paths[0] if paths else None
+
+    def _resolve_model(self, player_name: str):
+        """Locate the artifact `load_model` would serve for `player_name`.
+
+        Returns None when there is none, else `(pkl_path, pkl_stamp,
+        onnx_path_or_None, stamp_of_served_artifact)`.
+        """
         # Prefer per-player versioned model if present
         safe = player_name.replace(' ', '_')
         player_dir = os.path.join(self.model_dir, safe)
         chosen_model = None
-        # look for versions/*/model.pkl and pick newest by mtime
+        # newest versions/*/model.pkl by mtime, via the cached index
         try:
-            versions_dir = os.path.join(player_dir, 'versions')
-            if os.path.isdir(versions_dir):
-                candidate_files = []
-                for root, dirs, files in os.walk(versions_dir):
-                    for f in files:
-                        if f == 'model.pkl':
-                            candidate_files.append(os.path.join(root, f))
-                if candidate_files:
-                    chosen_model = max(candidate_files, key=os.path.getmtime)
+            chosen_model = self._latest_versioned_model(os.path.join(player_dir, 'versions'))
         except Exception:
             logger.exception('Error scanning versioned models for %s', player_name)
 
-        # fallback to legacy flat path
+        # fallback to legacy flat path; its stat doubles as the existence check
         if chosen_model is None:
-            legacy = self._model_path(player_name)
-            if os.path.exists(legacy):
-                chosen_model = legacy
-            else:
+            chosen_model = self._model_path(player_name)
+            stamp = self._artifact_stamp(chosen_model)
+            if stamp is None:
                 return None
+        else:
+            stamp = self._artifact_stamp(chosen_model)
+        pkl_stamp = stamp
+        onnx_path = self._onnx_sibling(chosen_model, stamp)
+        if onnx_path is not None:
+            stamp = self._artifact_stamp(onnx_path)
+        return chosen_model, pkl_stamp, onnx_path, stamp
+
+    def needs_load(self, player_name: str) -> bool:
+        """True when `load_model` would read an artifact from disk (it exists
+        and the in-memory copy is missing or stale), False when it would be
+        served from memory or there is no model at all."""
+        resolved = self._resolve_model(player_name)
+        if resolved is None:
+            return False
+        stamp = resolved[3]
+        return stamp is None or self._model_stamps.get(player_name) != stamp or player_name not in self._loaded_models
+
+    def load_model(self, player_name: str):
+        resolved = self._resolve_model(player_name)
+        if resolved is None:
+            return None
+        chosen_model, pkl_stamp, onnx_path, stamp = resolved
+        if stamp is not None and self._model_stamps.get(player_name) == stamp:
+            with self._lru_lock:
+                if player_name in self._loaded_models:
+                    self._loaded_models.move_to_end(player_name)
+                    return self._loaded_models[player_name]
+
+        if onnx_path is not None:
+            try:
+                from backend.models.onnx_model import OnnxModel
+                model = OnnxModel(onnx_path)
+                self._cache_model(player_name, model, onnx_path, stamp)
+                return model
+            except Exception:
+                logger.exception("Failed to load ONNX model for %s, using pickle", player_name)
+                stamp = pkl_stamp
 
         try:
             # verify signature if signing key set
             sidecar = os.path.splitext(chosen_model)[0] + '_metadata.json'
-            if os.path.exists(sidecar) and os.environ.get('MODEL_ARTIFACT_SIGNING_KEY'):
+            if os.environ.get('MODEL_ARTIFACT_SIGNING_KEY') and os.path.exists(sidecar):
                 try:
                     with open(sidecar, 'r', encoding='utf-8') as fh:
                         md = json.load(fh)
@@ -429,10 +968,10 @@ class ModelRegistry:
                     logger.exception('Artifact signature verification failed for %s', player_name)
                     raise
 
-            model = joblib.load(chosen_model)
+            model = _load_artifact(chosen_model)
             # cache for future quick access
             try:
-                self._loaded_models[player_name] = model
+                self._cache_model(player_name, model, chosen_model, stamp)
             except Exception:
                 logger.exception("Failed to cache loaded model for %s", player_name)
             return model
@@ -440,24 +979,65 @@ class ModelRegistry:
             logger.exception("Failed to load model for %s", player_name)
             return None
 
+    def _onnx_sibling(self, pkl_path: str, pkl_stamp) -> Optional[str]:
+        """The `.onnx` next to `pkl_path` when ONNX serving applies, else None."""
+        if not self._serve_onnx or pkl_stamp is None or os.environ.get('MODEL_ARTIFACT_SIGNING_KEY'):
+            return None
+        onnx_path = os.path.splitext(pkl_path)[0] + '.onnx'
+        onnx_stamp = self._artifact_stamp(onnx_path)
+        if onnx_stamp is None or onnx_stamp[1] < pkl_stamp[1]:
+            return None
+        return onnx_path
+
+    @staticmethod
+    def _artifact_stamp(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+    def _cache_model(self, player_name: str, model, path: str, stamp=None) -> None:
+        """Insert `model` into the LRU, evicting the least recently used."""
+        stamp = stamp or self._artifact_stamp(path)
+        with self._lru_lock:
+            self._loaded_models[player_name] = model
+            self._loaded_models.move_to_end(player_name)
+            self._model_stamps[player_name] = stamp
+            while len(self._loaded_models) > self._model_cache_size:
+                old, _ = self._loaded_models.popitem(last=False)
+                self._model_stamps.pop(old, None)
+
     def get_cached_model(self, player_name: str):
         return self._loaded_models.get(player_name)
 
     def list_models(self):
-        """Return list of model filenames (basename) found in the model_dir."""
+        """Return the sorted model filenames (basename) found in the model_dir.
+
+        The result is an immutable tuple cached until the directory's mtime
+        changes, so polling callers share it instead of rescanning.
+        """
         try:
+            mtime = os.stat(self.model_dir).st_mtime_ns
+            cached = self._model_listing
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
             items = set()
-            # prefer per-player directories
-            for name in os.listdir(self.model_dir):
-                p = os.path.join(self.model_dir, name)
-                if os.path.isdir(p):
-                    # directory names are player safe names
-                    items.add(name + '.pkl')
-                elif os.path.isfile(p) and name.endswith('.pkl') and not name.endswith('_calibrator.pkl'):
-                    items.add(name)
-            return sorted(items)
+            # prefer per-player directories; scandir's entry types avoid a
+            # stat per name
+            with os.scandir(self.model_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir():
+                        # directory names are player safe names
+                        items.add(name + '.pkl')
+                    elif name.endswith('.pkl') and not name.endswith('_calibrator.pkl') and entry.is_file():
+                        items.add(name)
+            listing = tuple(sorted(items))
+            self._model_listing = (mtime, listing)
+            return listing
         except Exception:
-            return []
+            return ()
 
     def load_all_models(self):
         """Load all model files from disk into the in-memory cache."""
@@ -479,8 +1059,7 @@ class ModelRegistry:
         """
         # compute checksum of provided list
         try:
-            _js = json.dumps(list(feature_list), separators=(',', ':'), sort_keys=True)
-            provided_checksum = hashlib.sha256(_js.encode('utf-8')).hexdigest()
+            provided_checksum = _feature_checksum(feature_list)
         except Exception:
             return False
 
@@ -490,12 +1069,9 @@ class ModelRegistry:
             player_dir = os.path.join(self.model_dir, safe)
             sidecar_paths = []
             try:
-                versions_dir = os.path.join(player_dir, 'versions')
-                if os.path.isdir(versions_dir):
-                    for root, dirs, files in os.walk(versions_dir):
-                        for f in files:
-                            if f == 'model.pkl':
-                                sidecar_paths.append(os.path.splitext(os.path.join(root, f))[0] + '_metadata.json')
+                # newest version first, from the cached version index
+                versions = self._versioned_models(os.path.join(player_dir, 'versions'))
+                sidecar_paths.extend(os.path.splitext(p)[0] + '_metadata.json' for p in versions)
             except Exception:
                 pass
             # legacy sidecar
@@ -516,11 +1092,12 @@ class ModelRegistry:
             pass
 
         # fallback: try DB lookup
+        sync_url = _metadata_db_url()
+        if sync_url is None:
+            return False
         try:
             from backend.models.model_metadata import ModelMetadata  # local import
-            raw_db = os.environ.get("DATABASE_URL")
-            sync_url = _sync_db_url(raw_db)
-            engine = create_engine(sync_url, future=True)
+            engine = _get_engine(sync_url)
             with engine.begin() as conn:
                 sel = ModelMetadata.__table__.select().where(ModelMetadata.__table__.c.name == player_name)
                 row = conn.execute(sel).first()
@@ -533,9 +1110,14 @@ class ModelRegistry:
 
         return False
 
+    def invalidate_calibrator(self, player_name: str) -> None:
+        """Drop the in-memory calibrator for `player_name`."""
+        self._loaded_calibrators.pop(player_name, None)
+
     def save_calibrator(self, player_name: str, calibrator) -> None:
         path = self._calibrator_path(player_name)
-        joblib.dump(calibrator, path)
+        _dump_artifact(calibrator, path, compress=self._compress)
+        self.invalidate_calibrator(player_name)
         logger.info("Saved calibrator for %s to %s", player_name, path)
         try:
             sig = self._compute_hmac(path)
@@ -543,15 +1125,34 @@ class ModelRegistry:
             if sig is not None:
                 meta['artifact_sig'] = sig
             sidecar = os.path.splitext(path)[0] + '_calibrator_metadata.json'
-            with open(sidecar, 'w', encoding='utf-8') as fh:
-                json.dump(meta, fh, indent=2)
+            with open(sidecar, 'wb') as fh:
+                fh.write(_sidecar_bytes(meta))
         except Exception:
             logger.exception('Failed to write calibrator sidecar for %s', player_name)
 
     def load_calibrator(self, player_name: str):
         path = self._calibrator_path(player_name)
-        if not os.path.exists(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._loaded_calibrators.pop(player_name, None)
             return None
+        stamp = (st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+        with self._lru_lock:
+            cached = self._loaded_calibrators.get(player_name)
+            if cached is not None and cached[0] == stamp:
+                self._loaded_calibrators.move_to_end(player_name)
+                return cached[1]
+        calibrator = self._load_calibrator_file(player_name, path)
+        if calibrator is not None:
+            with self._lru_lock:
+                self._loaded_calibrators[player_name] = (stamp, calibrator)
+                self._loaded_calibrators.move_to_end(player_name)
+                while len(self._loaded_calibrators) > self._model_cache_size:
+                    self._loaded_calibrators.popitem(last=False)
+        return calibrator
+
+    def _load_calibrator_file(self, player_name: str, path: str):
         try:
             # verify signature if present
             sidecar = os.path.splitext(path)[0] + '_calibrator_metadata.json'
@@ -567,7 +1168,25 @@ class ModelRegistry:
                 except Exception:
                     logger.exception('Calibrator signature verification failed for %s', player_name)
                     raise
-            return joblib.load(path)
+            return _load_artifact(path)
         except Exception:
             logger.exception("Failed to load calibrator for %s", player_name)
             return None
+
+
+# One registry per resolved model_dir, shared by the services in this process
+# so constructing a service per request reuses the already-loaded models.
+_REGISTRY_CACHE: Dict[str, ModelRegistry] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry(model_dir: str = "./backend/models_store") -> ModelRegistry:
+    """Return the process-wide `ModelRegistry` for `model_dir`."""
+    key = os.path.abspath(model_dir)
+    reg = _REGISTRY_CACHE.get(key)
+    if reg is None:
+        with _REGISTRY_LOCK:
+            reg = _REGISTRY_CACHE.get(key)
+            if reg is None:
+                reg = _REGISTRY_CACHE[key] = ModelRegistry(model_dir=key)
+    return reg
@@ -16,7 +16,7 @@ import json
 import logging
 import os
 import subprocess
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 
 logger = logging.getLogger(__name__)
 
@@ -476,6 +476,59 @@ class OllamaClient:
             logger.debug("Ollama embeddings http fallback failed: %s", e)
         return None
 
+    def embeddings_batch(self, model: Optional[str], inputs: List[str], timeout: float = 30.0) -> Optional[List[list]]:
+        """Return one embedding per entry of `inputs` from a single request.
+
+        Uses the array form of `input` accepted by `/api/embed` and
+        `/v1/embeddings`. Returns None when no backend produced exactly
+        `len(inputs)` vectors so callers can fall back to `embeddings()`.
+        """
+        if not inputs:
+            return []
+
+        def _vectors(data) -> Optional[List[list]]:
+            if data is None:
+                return None
+            vecs = None
+            if isinstance(data, dict):
+                if isinstance(data.get('embeddings'), list):
+                    vecs = data['embeddings']
+                elif isinstance(data.get('data'), list):
+                    vecs = [d.get('embedding') if isinstance(d, dict) else None for d in data['data']]
+            elif hasattr(data, 'embeddings'):
+                vecs = getattr(data, 'embeddings')
+            if isinstance(vecs, list) and len(vecs) == len(inputs) and all(isinstance(v, (list, tuple)) and v for v in vecs):
+                return [list(v) for v in vecs]
+            return None
+
+        if self._has_ollama and self._client is not None and hasattr(self._client, 'embed'):
+            try:
+                vecs = _vectors(self._client.embed(model=model, input=list(inputs)))
+                if vecs is not None:
+                    return vecs
+            except Exception as e:
+                logger.debug("ollama client batch embed failed: %s", e)
+
+        try:
+            import requests
+
+            base = self._base_url.rstrip('/')
+            headers = {'Content-Type': 'application/json'}
+            if self._api_key:
+                headers['Authorization'] = f"Bearer {self._api_key}"
+            payload = {"model": model or os.environ.get('OLLAMA_DEFAULT_MODEL'), "input": list(inputs)}
+            for api_path in (base + '/api/embed', base + '/v1/embeddings'):
+                try:
+                    resp = requests.post(api_path, json=payload, headers=headers, timeout=timeout)
+                    vecs = _vectors(resp.json())
+                except Exception:
+                    continue
+                if vecs is not None:
+                    return vecs
+        except Exception as e:
+            logger.debug("Ollama batch embeddings http fallback failed: %s", e)
+        return None
+
 
 _default_client: Optional[OllamaClient] = None
 
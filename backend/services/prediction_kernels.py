@@ -0,0 +1,262 @@
+"""Numeric kernels for the prediction hot path.
+
+`score_tail` turns a batch of raw predictions into the over probability
+(sigmoid around the line), under probability, EV, confidence and
+recommendation code used by `MLPredictionService.predict_batch_sync`, in
+one pass. It is compiled with numba when available (warmed once at import
+so the JIT cost is not paid on the first request) and falls back to NumPy
+otherwise.
+
+`map_members` / `voting_predict` run the members of an ensemble side by side
+on a shared thread pool for large batches (RandomForest, XGBoost and linear
+models release the GIL in their C loops); small inputs stay serial, where
+thread hand-off would cost more than it saves.
+
+`forest_predictor` flattens a fitted RandomForest/ExtraTrees regressor into
+node arrays walked by a numba kernel, skipping sklearn's per-call
+validation and per-tree dispatch (the dominant cost for one-row predicts).
+`model_predict` is the entry point the prediction service uses: it picks
+the fastest available path for a model and falls back to `model.predict`.
+"""
+from __future__ import annotations
+
+import functools
+import math
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:
+    njit = None  # type: ignore
+
+
+def _score_tail_numpy(raws, lines, dec_odds, over_threshold, under_threshold):
+    probs = np.subtract(lines, raws)
+    with np.errstate(over="ignore"):  # exp overflow -> probability 0
+        np.exp(probs, out=probs)
+    probs += 1.0
+    np.reciprocal(probs, out=probs)
+    unders = 1.0 - probs
+    evs = np.maximum(probs, unders) * dec_odds - 1.0
+    confs = np.abs(probs - 0.5) * 200.0
+    codes = np.where(probs > over_threshold, 1, np.where(probs < under_threshold, 2, 0)).astype(np.int8)
+    return probs, unders, evs, confs, codes
+
+
+if njit is not None:
+    # no fastmath: the EV / confidence arithmetic must match the scalar path
+    @njit(cache=True)
+    def _score_tail_numba(raws, lines, dec_odds, over_threshold, under_threshold):
+        n = raws.shape[0]
+        probs = np.empty(n, dtype=np.float64)
+        unders = np.empty(n, dtype=np.float64)
+        evs = np.empty(n, dtype=np.float64)
+        confs = np.empty(n, dtype=np.float64)
+        codes = np.zeros(n, dtype=np.int8)
+        for i in range(n):
+            p = 1.0 / (1.0 + math.exp(lines[i] - raws[i]))
+            if p < 0.0:
+                p = 0.0
+            elif p > 1.0:
+                p = 1.0
+            u = 1.0 - p
+            probs[i] = p
+            unders[i] = u
+            evs[i] = (p if p > u else u) * dec_odds - 1.0
+            confs[i] = abs(p - 0.5) * 200.0
+            if p > over_threshold:
+                codes[i] = 1
+            elif p < under_threshold:
+                codes[i] = 2
+        return probs, unders, evs, confs, codes
+
+    try:
+        _score_tail_numba(np.zeros(1), np.zeros(1), 2.0, 0.55, 0.45)
+        _score_tail = _score_tail_numba
+    except Exception:
+        _score_tail = _score_tail_numpy
+else:
+    _score_tail = _score_tail_numpy
+
+
+def score_tail(raws, lines, dec_odds: float, over_threshold: float, under_threshold: float):
+    """Everything `MLPredictionService` derives from a batch of raw
+    predictions, in one pass: `(over_probs, under_probs, evs, confidences,
+    rec_codes)`, where EV takes `dec_odds` on both sides and `rec_codes` is
+    int8 (0 no pick, 1 over, 2 under)."""
+    raws = np.ascontiguousarray(raws, dtype=np.float64).reshape(-1)
+    lines = np.ascontiguousarray(lines, dtype=np.float64).reshape(-1)
+    return _score_tail(raws, lines, float(dec_odds), float(over_threshold), float(under_threshold))
+
+
+# Rows below which ensemble members are run serially.
+_PARALLEL_MIN_ROWS = int(os.environ.get("ENSEMBLE_PARALLEL_MIN_ROWS", "512"))
+_member_pool: Optional[ThreadPoolExecutor] = None
+_member_pool_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _member_pool
+    if _member_pool is None:
+        with _member_pool_lock:
+            if _member_pool is None:
+                workers = int(os.environ.get("ENSEMBLE_PREDICT_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+                _member_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ensemble-predict")
+    return _member_pool
+
+
+def _call(fn: Callable, X):
+    try:
+        return fn(X)
+    except Exception as e:  # returned, so callers decide per member
+        return e
+
+
+def map_members(predict_fns: Sequence[Callable], X) -> List:
+    """Apply each member's predict to `X`, in order.
+
+    Each entry of the result is the member's prediction or the exception it
+    raised. Members run concurrently when there are several and `X` has at
+    least ENSEMBLE_PARALLEL_MIN_ROWS rows.
+    """
+    if len(predict_fns) < 2 or len(X) < _PARALLEL_MIN_ROWS:
+        return [_call(fn, X) for fn in predict_fns]
+    return list(_pool().map(_call, predict_fns, [X] * len(predict_fns)))
+
+
+@functools.lru_cache(maxsize=None)
+def _sklearn_types() -> Optional[tuple]:
+    """(VotingRegressor, (RandomForestRegressor, ExtraTreesRegressor)), or None
+    without scikit-learn. Resolved on first use and then reused, keeping the
+    import off both module load and the per-predict path."""
+    try:
+        from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor, VotingRegressor
+    except Exception:
+        return None
+    return VotingRegressor, (RandomForestRegressor, ExtraTreesRegressor)
+
+
+def voting_predict(model, X) -> Optional[np.ndarray]:
+    """`VotingRegressor.predict` with members mapped through `map_members`.
+
+    Returns None when `model` is not a fitted voting ensemble, so callers can
+    fall back to `model.predict`. Matches sklearn's weighted average.
+    """
+    types = _sklearn_types()
+    if types is None or not isinstance(model, types[0]) or not getattr(model, "estimators_", None):
+        return None
+    preds = map_members([forest_predictor(est) or est.predict for est in model.estimators_], X)
+    for p in preds:
+        if isinstance(p, Exception):
+            raise p
+    return np.average(np.asarray(preds).T, axis=1, weights=model._weights_not_none)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _forest_predict_numba(X, roots, left, right, feature, threshold, value):
+        n = X.shape[0]
+        n_trees = roots.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            acc = 0.0
+            for t in range(n_trees):
+                node = roots[t]
+                while left[node] != -1:
+                    if X[i, feature[node]] <= threshold[node]:
+                        node = left[node]
+                    else:
+                        node = right[node]
+                acc += value[node]
+            out[i] = acc / n_trees
+        return out
+
+    try:
+        _z = np.zeros(1, dtype=np.int64)
+        _m1 = np.full(1, -1, dtype=np.int64)
+        _forest_predict_numba(np.zeros((1, 1), dtype=np.float32), _z, _m1, _m1, _z, np.zeros(1), np.zeros(1))
+    except Exception:
+        _forest_predict_numba = None
+else:
+    _forest_predict_numba = None
+
+
+# model -> (estimators_ list it was built from, predict fn or None)
+_forest_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_forest_lock = threading.Lock()
+
+
+def _compile_forest(model) -> Optional[Callable]:
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.fromiter((t.node_count for t in trees), dtype=np.int64, count=len(trees))
+    roots = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+
+    def _children(arr, off):
+        return np.where(arr == -1, -1, arr + off)
+
+    left = np.concatenate([_children(t.children_left, r) for t, r in zip(trees, roots)]).astype(np.int64)
+    right = np.concatenate([_children(t.children_right, r) for t, r in zip(trees, roots)]).astype(np.int64)
+    feature = np.concatenate([t.feature for t in trees]).astype(np.int64)
+    threshold = np.concatenate([t.threshold for t in trees]).astype(np.float64)
+    value = np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float64)
+    n_features = int(model.n_features_in_)
+    names = getattr(model, "feature_names_in_", None)
+    names = list(names) if names is not None else None
+    sk_predict = model.predict
+
+    def predict(X):
+        columns = getattr(X, "columns", None)
+        if columns is not None and (names is None or list(columns) != names):
+            return sk_predict(X)  # sklearn checks / reports the column mismatch
+        # sklearn compares float32 feature values against float64 thresholds
+        Xf = np.ascontiguousarray(X, dtype=np.float32)
+        if Xf.ndim != 2 or Xf.shape[1] != n_features or not np.isfinite(Xf).all():
+            return sk_predict(X)  # let sklearn validate / handle the odd cases
+        return _forest_predict_numba(Xf, roots, left, right, feature, threshold, value)
+
+    return predict
+
+
+def forest_predictor(model) -> Optional[Callable]:
+    """Return a compiled `predict(X)` for a fitted single-output
+    RandomForestRegressor / ExtraTreesRegressor, else None.
+
+    Built once per model (and rebuilt if it is refitted); results match
+    `model.predict`. Non-finite or mis-shaped input is passed to sklearn.
+    """
+    if _forest_predict_numba is None:
+        return None
+    try:
+        cached = _forest_cache.get(model)
+    except TypeError:  # not weak-referenceable / hashable
+        return None
+    estimators = getattr(model, "estimators_", None)
+    if cached is not None and cached[0] is estimators:
+        return cached[1]
+    fn = None
+    types = _sklearn_types()
+    try:
+        if types is not None and type(model) in types[1] and estimators and getattr(model, "n_outputs_", 1) == 1:
+            fn = _compile_forest(model)
+    except Exception:
+        fn = None
+    with _forest_lock:
+        _forest_cache[model] = (estimators, fn)
+    return fn
+
+
+def model_predict(model, X):
+    """`model.predict(X)` through the fastest available path."""
+    fn = forest_predictor(model)
+    if fn is not None:
+        return fn(X)
+    out = voting_predict(model, X)
+    if out is not None:
+        return out
+    return model.predict(X)
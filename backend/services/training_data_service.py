@@ -6,6 +6,7 @@ import json
 import uuid
 from pathlib import Path
 import tempfile
+import time
 
 import pandas as pd
 
@@ -21,6 +22,13 @@ STAT_MAP = {
 }
 
 
+def _utc_now_iso() -> str:
+    """Current UTC time as `YYYY-MM-DDTHH:MM:SS.ffffffZ`. Fixed width, so
+    manifests sort chronologically by their `created_at` strings."""
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec)) + f'.{us:06d}Z'
+
+
 def _extract_stat_from_game(g: dict, stat_field: str):
     for key in (stat_field, stat_field.upper()):
         if key in g and g.get(key) is not None:
@@ -519,7 +527,7 @@ def export_dataset_with_version(df: pd.DataFrame, y: Optional[pd.Series] = None,
         'name': name,
         'version': version,
         'uid': uid,
-        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat() + 'Z',
+        'created_at': _utc_now_iso(),
         'rows': int(len(df)),
         'columns': list(df.columns),
     }
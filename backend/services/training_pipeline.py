@@ -300,9 +300,15 @@ def train_player_model(df: pd.DataFrame, target_col: str = "target", use_stackin
         return model
 
 
-def save_model(model, path: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    joblib.dump(model, path)
+def save_model(model, path: str, compress=None) -> None:
+    """Write `model` to `path` the way `ModelRegistry` writes artifacts:
+    atomically and, unless `compress` (a joblib compress value) or
+    MODEL_COMPRESS asks otherwise, uncompressed so `load_model` can
+    memory-map it. Pass `compress` for archival copies."""
+    from backend.services.model_registry import _dump_artifact  # local import
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    _dump_artifact(model, path, compress=compress)
     # If MLflow is enabled, record the saved artifact for traceability
     try:
         mlflow_enabled = os.environ.get('MLFLOW_TRACKING', '0') == '1' and _HAS_MLFLOW
@@ -318,9 +324,13 @@ def save_model(model, path: str) -> None:
 
 
 def load_model(path: str):
+    """Load a saved model; large artifacts are memory-mapped read-only
+    (MODEL_MMAP), so processes serving the same file share its pages."""
+    from backend.services.model_registry import _load_artifact  # local import
+
     if not os.path.exists(path):
         return None
-    return joblib.load(path)
+    return _load_artifact(path)
 
 
 if __name__ == "__main__":
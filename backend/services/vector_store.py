@@ -1,24 +1,156 @@
 """Simple in-memory vector store for development and testing.
 
-Provides add(id, embedding, metadata) and search(query_embedding, top_k).
+Provides add(id, embedding, metadata), add_many(ids, embeddings, metadatas),
+extend(ids, embedding_matrix, metadatas) and search(query_embedding, top_k).
 Uses cosine similarity.
+
+With `quantize='int8'` each embedding is L2-normalized and stored as int8
+plus a per-vector scale (4x smaller than float32), and search runs an
+int8 x int8 dot product with int32 accumulation; scores then approximate
+cosine to roughly 1e-2.
 """
 from __future__ import annotations
 
 import math
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None  # type: ignore
+    prange = range  # type: ignore
+
+
+def _dot_rows_numpy(matrix: np.ndarray, q: np.ndarray) -> np.ndarray:
+    return matrix @ q
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows(matrix, q):
+        n = matrix.shape[0]
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * q[j]
+            out[i] = acc
+        return out
+else:
+    _dot_rows = _dot_rows_numpy
+
+
+def _dot_rows_i8_numpy(matrix: np.ndarray, q: np.ndarray) -> np.ndarray:
+    return matrix.astype(np.int32) @ q.astype(np.int32)
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _dot_rows_i8(matrix, q):
+        n = matrix.shape[0]
+        out = np.empty(n, dtype=np.int32)
+        for i in prange(n):
+            acc = np.int32(0)
+            for j in range(matrix.shape[1]):
+                acc += np.int32(matrix[i, j]) * np.int32(q[j])
+            out[i] = acc
+        return out
+else:
+    _dot_rows_i8 = _dot_rows_i8_numpy
+
+
+def _quantize_i8(embedding: Any) -> Tuple[np.ndarray, float]:
+    """L2-normalize and quantize to int8; returns (codes, dequant_scale)."""
+    v = np.asarray(embedding, dtype=np.float32).ravel()
+    n = float(np.linalg.norm(v))
+    if n > 0:
+        v = v / n
+    m = float(np.abs(v).max()) if v.size else 0.0
+    if m == 0.0:
+        return np.zeros(v.shape[0], dtype=np.int8), 0.0
+    return np.rint(v * (127.0 / m)).astype(np.int8), m / 127.0
+
 
 class InMemoryVectorStore:
-    def __init__(self):
-        # store as id -> (embedding, metadata)
-        self._items: Dict[str, Tuple[List[float], Dict[str, Any]]] = {}
+    def __init__(self, quantize: Optional[str] = None):
+        if quantize not in (None, 'int8'):
+            raise ValueError(f"unsupported quantize mode: {quantize!r}")
+        self.quantize = quantize
+        # store as id -> (embedding, metadata); with quantize='int8' the
+        # embedding is kept as (int8 codes, dequant scale)
+        self._items: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        # (ids, matrix[, scales]) snapshot used by search; rebuilt after writes
+        self._matrix: Optional[Tuple[Any, ...]] = None
+        # float snapshot backing array with spare rows; the snapshot matrix is
+        # a prefix view of it, so extend() appends in amortized O(block)
+        self._buf: Optional[np.ndarray] = None
+
+    def _encode(self, embedding: List[float]) -> Any:
+        if self.quantize == 'int8':
+            return _quantize_i8(embedding)
+        return embedding
+
+    def _embedding(self, stored: Any) -> List[float]:
+        if self.quantize == 'int8':
+            codes, scale = stored
+            return (codes.astype(np.float32) * scale).tolist()
+        if isinstance(stored, np.ndarray):
+            return stored.tolist()
+        return stored
 
     def add(self, id: str, embedding: List[float], metadata: Optional[Dict[str, Any]] = None) -> None:
-        self._items[id] = (embedding, metadata or {})
+        self._items[id] = (self._encode(embedding), metadata or {})
+        self._matrix = None
+
+    def add_many(self, ids: List[str], embeddings: List[List[float]], metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        metadatas = metadatas or [None] * len(ids)
+        for id, emb, meta in zip(ids, embeddings, metadatas):
+            self._items[id] = (self._encode(emb), meta or {})
+        self._matrix = None
+
+    def extend(self, ids: List[str], embeddings: np.ndarray, metadatas: Optional[List[Optional[Dict[str, Any]]]] = None) -> None:
+        """Add an `(N, D)` block of embeddings in one step.
+
+        Rows are kept as views of one float32 array; when a search snapshot
+        of the same dimension exists and none of `ids` is already stored,
+        the normalized block is written into the snapshot's spare capacity
+        (doubled when full) instead of rebuilding.
+        """
+        mat = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if mat.ndim != 2 or mat.shape[0] != len(ids):
+            raise ValueError("embeddings must be an (len(ids), dim) array")
+        metadatas = metadatas or [None] * len(ids)
+        if self.quantize is not None:
+            self.add_many(ids, mat, metadatas)
+            return
+        snap = self._matrix
+        append = (
+            snap is not None and snap[1].shape[1] == mat.shape[1]
+            and len(set(ids)) == len(ids) and not any(i in self._items for i in ids)
+        )
+        for id, row, meta in zip(ids, mat, metadatas):
+            self._items[id] = (row, meta or {})
+        if not append:
+            self._matrix = None
+            return
+        snap_ids, cur = snap
+        count, need = cur.shape[0], cur.shape[0] + mat.shape[0]
+        buf = self._buf
+        if buf is None or buf.shape[0] < need:
+            buf = np.empty((max(need, 2 * count), mat.shape[1]), dtype=np.float32)
+            buf[:count] = cur
+            self._buf = buf
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        block = buf[count:need]
+        block.fill(0.0)
+        np.divide(mat, norms, out=block, where=norms > 0)
+        snap_ids.extend(ids)
+        self._matrix = (snap_ids, buf[:need])
 
     def _cosine(self, a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
+        if a is None or b is None or len(a) == 0 or len(a) != len(b):
             return 0.0
         dot = 0.0
         na = 0.0
@@ -31,16 +163,65 @@ class InMemoryVectorStore:
             return 0.0
         return dot / (math.sqrt(na) * math.sqrt(nb))
 
+    def _snapshot(self) -> Optional[Tuple[Any, ...]]:
+        """Return (ids, row-normalized matrix) when all embeddings share one dimension.
+
+        Rows are L2-normalized once here so each search is a bare dot
+        product against the normalized query. In int8 mode the snapshot is
+        (ids, int8 codes, per-row scales).
+        """
+        if self._matrix is None:
+            ids = list(self._items.keys())
+            embs = [self._items[i][0] for i in ids]
+            if self.quantize == 'int8':
+                if len({len(c) for c, _ in embs}) != 1:
+                    return None
+                codes = np.ascontiguousarray(np.stack([c for c, _ in embs]))
+                scales = np.fromiter((sc for _, sc in embs), dtype=np.float32, count=len(embs))
+                self._matrix = (ids, codes, scales)
+                return self._matrix
+            dims = {len(e) for e in embs}
+            if len(dims) != 1:
+                return None
+            mat = np.asarray(embs, dtype=np.float32)
+            norms = np.linalg.norm(mat, axis=1, keepdims=True)
+            mat = np.divide(mat, norms, out=np.zeros_like(mat), where=norms > 0)
+            self._buf = np.ascontiguousarray(mat)
+            self._matrix = (ids, self._buf)
+        return self._matrix
+
+    def _scores(self, query_embedding: List[float]) -> Tuple[List[str], np.ndarray]:
+        snap = self._snapshot()
+        if snap is None:
+            # mixed dimensions: score item by item
+            ids = list(self._items.keys())
+            return ids, np.fromiter((self._cosine(query_embedding, self._embedding(self._items[i][0])) for i in ids), dtype=np.float64, count=len(ids))
+        if self.quantize == 'int8':
+            ids, codes, scales = snap
+            qc, qs = _quantize_i8(query_embedding)
+            if qc.shape[0] != codes.shape[1] or qs == 0.0:
+                return ids, np.zeros(len(ids))
+            return ids, _dot_rows_i8(codes, qc) * (scales * np.float32(qs))
+        ids, mat = snap
+        q = np.asarray(query_embedding, dtype=np.float32).ravel()
+        qn = float(np.linalg.norm(q))
+        if q.shape[0] != mat.shape[1] or qn == 0.0:
+            return ids, np.zeros(len(ids))
+        return ids, _dot_rows(mat, np.ascontiguousarray(q / qn))
+
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        scores = []
-        for id, (emb, meta) in self._items.items():
-            score = self._cosine(query_embedding, emb)
-            scores.append((score, id, meta))
-        scores.sort(key=lambda x: x[0], reverse=True)
+        if not self._items or top_k <= 0:
+            return []
+        ids, scores = self._scores(query_embedding)
+        # partial selection of the top_k candidates, then order just those
+        k = min(int(top_k), scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
         results = []
-        for score, id, meta in scores[:top_k]:
-            results.append({"id": id, "score": float(score), "metadata": meta})
+        for i in top:
+            id = ids[i]
+            results.append({"id": id, "score": float(scores[i]), "metadata": self._items[id][1]})
         return results
 
     def all_items(self) -> List[Dict[str, Any]]:
-        return [{"id": id, "embedding": emb, "metadata": meta} for id, (emb, meta) in self._items.items()]
+        return [{"id": id, "embedding": self._embedding(emb), "metadata": meta} for id, (emb, meta) in self._items.items()]
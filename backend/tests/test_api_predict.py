@@ -29,3 +29,41 @@ def test_health_and_predict_with_stub_model(monkeypatch):
         data = r2.json()
         assert 'player' in data and data['player'] == 'LeBron James'
         assert 'over_probability' in data or 'predicted_value' in data
+
+
+def test_predict_cache_hit_serves_stored_body(monkeypatch):
+    class FakeRedis:
+        def __init__(self):
+            self.store = {}
+
+        def get(self, key):
+            return self.store.get(key)
+
+        def setex(self, key, ttl, value):
+            self.store[key] = value
+
+    fake = FakeRedis()
+    # an entry in the pre-versioning format (unfiltered dict) is never served raw
+    fake.store['predict:Cache Probe:points:20.5'] = json.dumps({'player': 'Cache Probe', 'internal': 'leak'})
+    monkeypatch.setattr(fastapi_nba, 'redis_client', fake)
+    client = TestClient(fastapi_nba.app)
+    payload = {
+        'player': 'Cache Probe',
+        'stat': 'points',
+        'line': 20.5,
+        'player_data': {'recentGames': [{'statValue': 22}, {'statValue': 25}], 'seasonAvg': 23},
+        'opponent_data': {}
+    }
+
+    first = client.post('/api/predict', json=payload)
+    assert first.status_code == 200
+    assert 'internal' not in first.json()
+    key = f"predict:Cache Probe:points:20.5:{fastapi_nba._PREDICT_CACHE_VERSION}"
+    assert json.loads(fake.store[key]) == first.json()
+
+    calls = []
+    monkeypatch.setattr(fastapi_nba.ml_service, 'predict', lambda *a, **k: calls.append(1))
+    second = client.post('/api/predict', json=payload)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert calls == []
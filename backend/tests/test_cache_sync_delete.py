@@ -78,3 +78,65 @@ def test_redis_delete_prefix_sync_with_loop_running(monkeypatch):
     assert deleted >= 1
     assert "predict:Player A:line" not in cache._fallback_store
     assert "predict:Player B:line" in cache._fallback_store
+
+
+def test_invalidate_prefixes_sync_sweeps_fallback_once_and_pipelines_unlink(monkeypatch):
+    import sys
+    import types
+
+    cache._fallback_store.clear()
+    for key in ("predict:P A:1", "player_context:P A:2", "predict:P B:1"):
+        cache._fallback_store[key] = {"v": "1", "e": None}
+
+    class FakePipe:
+        def __init__(self, client):
+            self.client = client
+            self.ops = []
+
+        def unlink(self, *keys):
+            self.ops.append(keys)
+
+        def execute(self):
+            self.client.executes += 1
+            out = []
+            for keys in self.ops:
+                out.append(sum(self.client.keys.pop(k, None) is not None for k in keys))
+            return out
+
+    class FakeClient:
+        def __init__(self):
+            self.keys = {f"predict:P A:{i}": 1 for i in range(5)}
+            self.keys.update({"player_context:P A:x": 1, "predict:P B:1": 1, "predict:P*:1": 1})
+            self.executes = 0
+            self.pipes = []
+            self.scans = []
+
+        def ping(self):
+            return True
+
+        def scan_iter(self, match, count=None):
+            import fnmatch
+            self.scans.append(match)
+            return [k for k in list(self.keys) if fnmatch.fnmatchcase(k, match.replace("\\*", "[*]"))]
+
+        def pipeline(self, transaction=True):
+            self.pipes.append(FakePipe(self))
+            return self.pipes[-1]
+
+    client = FakeClient()
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(from_url=lambda url, **kw: client))
+
+    deleted = cache.invalidate_prefixes_sync(["predict:P A:", "player_context:P A:", "predict:P*:"], batch_size=2)
+
+    assert set(cache._fallback_store) == {"predict:P B:1"}
+    assert set(client.keys) == {"predict:P B:1"}
+    assert deleted == 2 + 7
+    assert client.executes == 1 and len(client.pipes) == 1
+    # one tight walk per namespace, unlinked in batches of batch_size
+    assert client.scans == ["predict:P*", "player_context:P A:*"]
+    # save_model's three namespaces never collapse into a keyspace-wide match
+    assert list(cache._scan_groups(("predict:X:", "prediction:X:", "player_context:X:"))) == [
+        "predict:X:*", "prediction:X:*", "player_context:X:*",
+    ]
+    assert [len(b) for b in client.pipes[0].ops] == [2, 2, 2, 1]
+    cache._fallback_store.clear()
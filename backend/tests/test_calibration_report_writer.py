@@ -9,7 +9,7 @@ def test_calibration_report_written(tmp_path, monkeypatch):
     # The CalibrationService default registry reads environment? It uses ModelRegistry default,
     # so override registry.model_dir after construction.
     svc = CalibrationService()
-    svc.registry.model_dir = str(tmp_path)
+    monkeypatch.setattr(svc.registry, 'model_dir', str(tmp_path))
 
     # create simple synthetic probabilistic data
     y_true = [0, 1, 1, 0, 1]
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import tempfile
 import os
 
@@ -47,3 +48,44 @@ def test_fit_and_persist_isotonic_calibrator(tmp_path):
     assert calib is not None
     out = cs.calibrate('Test Player Iso', np.array([1.0, 10.0, 20.0]))
     assert len(out) == 3
+
+
+def test_calibrate_handles_scalar_and_vector_in_one_call(tmp_path):
+    x = np.linspace(1, 10, 30)
+    cs = CalibrationService(model_dir=str(tmp_path / 'models'))
+    cs.fit_and_save('Vec Player', y_true=2.0 * x + 1.0, y_pred=x, method='linear')
+
+    out = cs.calibrate('Vec Player', [1.0, 2.0, 3.0])
+    assert out.shape == (3,)
+    assert np.allclose(out, [3.0, 5.0, 7.0])
+    assert abs(cs.calibrate('Vec Player', 4.0) - 9.0) < 1e-6
+
+
+def test_calibrator_binding_matches_predict_and_follows_new_calibrator(tmp_path):
+    from backend.services.calibration_service import _bind_calibrator
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(20, 5, 100)
+    y = x + rng.normal(0, 2, 100)
+    q = np.linspace(0, 40, 50)
+    cs = CalibrationService(model_dir=str(tmp_path / 'models'))
+    iso = cs.fit_calibrator(y, x, method='isotonic')
+    assert np.allclose(_bind_calibrator(iso)[0](q), iso.predict(q))
+    lin = cs.fit_calibrator(y, x, method='linear')
+    assert np.allclose(_bind_calibrator(lin)[0](q), lin.predict(q.reshape(-1, 1)))
+    for calib, shaped in ((iso, q), (lin, q.reshape(-1, 1))):
+        fn, scalar_ok = _bind_calibrator(calib)
+        assert scalar_ok
+        assert [fn(float(v)) for v in q] == pytest.approx(calib.predict(shaped))
+
+    cs.fit_and_save('Bind Player', y_true=x * 2.0, y_pred=x, method='linear')
+    first = cs.calibrate('Bind Player', [1.0])
+    fn = cs._bound['Bind Player'][1]
+    cs.calibrate('Bind Player', [2.0])
+    assert cs._bound['Bind Player'][1] is fn
+    assert np.allclose(first, [2.0])
+
+    cs.fit_and_save('Bind Player', y_true=x * 3.0, y_pred=x, method='linear')
+    assert np.allclose(cs.calibrate('Bind Player', [1.0]), [3.0])
+    scalar = cs.calibrate('Bind Player', 1.0)
+    assert isinstance(scalar, float) and scalar == pytest.approx(3.0)
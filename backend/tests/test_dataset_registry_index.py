@@ -0,0 +1,57 @@
+import json
+
+from backend.services import dataset_versioning as dv
+
+
+def _manifest(tmp_path, name, version, created_at):
+    d = tmp_path / 'exports' / f'{name}_{version}'
+    d.mkdir(parents=True)
+    p = d / 'manifest.json'
+    p.write_text(json.dumps({'name': name, 'version': version, 'uid': 'u1', 'created_at': created_at, 'rows': 3}))
+    return str(p)
+
+
+def test_register_appends_to_journal_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, '_COMPACT_EVERY', 3)
+    reg = tmp_path / 'registry'
+
+    dv.register_manifest(_manifest(tmp_path, 'ds', 'v2', '2024-01-02'), registry_dir=str(reg))
+    dv.register_manifest(_manifest(tmp_path, 'ds', 'v1', '2024-01-01'), registry_dir=str(reg))
+    assert not (reg / 'index.json').exists()
+    assert len((reg / 'index.jsonl').read_text().splitlines()) == 2
+    assert [e['version'] for e in dv.list_registered('ds', registry_dir=str(reg))] == ['v1', 'v2']
+
+    # the third line triggers compaction into the snapshot
+    dv.register_manifest(_manifest(tmp_path, 'other', 'v1', '2024-01-03'), registry_dir=str(reg))
+    assert (reg / 'index.jsonl').read_text() == ''
+    snapshot = json.loads((reg / 'index.json').read_text())
+    assert [(e['name'], e['version']) for e in snapshot] == [('ds', 'v1'), ('ds', 'v2'), ('other', 'v1')]
+
+    # re-registering replaces the entry; a torn trailing line is ignored
+    dv.register_manifest(str(reg / 'ds' / 'v2_u1' / 'manifest.json'), registry_dir=str(reg))
+    with open(reg / 'index.jsonl', 'a', encoding='utf-8') as f:
+        f.write('{"name": "ds", "vers')
+    assert [e['version'] for e in dv.list_registered('ds', registry_dir=str(reg))] == ['v1', 'v2']
+    assert dv.latest_registered('ds', registry_dir=str(reg))['version'] == 'v2'
+    dv.register_manifest(_manifest(tmp_path, 'ds', 'v3', '2024-01-04'), registry_dir=str(reg))
+    assert dv.latest_registered('ds', registry_dir=str(reg))['version'] == 'v3'
+
+
+def test_index_json_codec_matches_stdlib_semantics():
+    import datetime
+
+    entry = {'name': 'ds', 'created_at': datetime.datetime(2024, 1, 2, 3, 4, 5), 'rows': 3, 'columns': ['a']}
+    assert json.loads(dv._json_dumps(entry)) == json.loads(json.dumps(entry, default=str))
+    assert json.loads(dv._json_dumps([entry], indent=True)) == [json.loads(json.dumps(entry, default=str))]
+    assert dv._json_loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+
+def test_created_at_is_fixed_width_utc_iso():
+    import datetime
+
+    from backend.services.training_data_service import _utc_now_iso
+
+    a, b = _utc_now_iso(), _utc_now_iso()
+    assert len(a) == len(b) == 27 and a.endswith('Z') and a <= b
+    parsed = datetime.datetime.strptime(a, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=datetime.timezone.utc)
+    assert abs((datetime.datetime.now(datetime.timezone.utc) - parsed).total_seconds()) < 5
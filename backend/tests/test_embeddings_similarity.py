@@ -36,3 +36,147 @@ def test_index_and_similarity():
     # Scores should be within -1..1
     for m in res['top_matches']:
         assert -1.0 <= m['score'] <= 1.0
+
+
+def test_index_texts_uses_batched_embeddings():
+    store = InMemoryVectorStore()
+    svc = LLMFeatureService(default_model='embeddinggemma', vector_store=store)
+
+    batches = []
+
+    class FakeBatchClient:
+        def embeddings_batch(self, model, inputs, timeout=30.0):
+            batches.append(list(inputs))
+            return [[float(len(t)), 1.0] for t in inputs]
+
+    svc.client = FakeBatchClient()
+    items = [(f"id{i}", "x" * (10 - i), {"i": i}) for i in range(5)]
+    indexed = svc.index_texts(items, batch_size=2)
+
+    assert indexed == [f"id{i}" for i in range(5)]
+    # batches may be embedded concurrently, so call order is not fixed
+    assert sorted(len(b) for b in batches) == [1, 2, 2]
+    # shorter texts first within each batch
+    assert ["x" * 9, "x" * 10] in batches
+    emb = {it["id"]: it["embedding"] for it in store.all_items()}
+    assert emb["id3"] == [7.0, 1.0]
+
+
+def test_inmemory_search_topk_matches_full_sort():
+    import random
+
+    rnd = random.Random(7)
+    store = InMemoryVectorStore()
+    vecs = {f"v{i}": [rnd.uniform(-1, 1) for _ in range(16)] for i in range(200)}
+    for k, v in vecs.items():
+        store.add(k, v, {"k": k})
+    q = [rnd.uniform(-1, 1) for _ in range(16)]
+
+    expected = sorted(vecs, key=lambda k: store._cosine(q, vecs[k]), reverse=True)[:10]
+    res = store.search(q, top_k=10)
+    assert [r["id"] for r in res] == expected
+    assert abs(res[0]["score"] - store._cosine(q, vecs[expected[0]])) < 1e-5
+
+
+def test_aindex_texts_adds_all_batches():
+    import asyncio
+
+    os.environ['OLLAMA_EMBEDDINGS_FALLBACK'] = 'true'
+    store = InMemoryVectorStore()
+    svc = LLMFeatureService(default_model='embeddinggemma', vector_store=store)
+
+    class FakeBatchClient:
+        def embeddings_batch(self, model, inputs, timeout=30.0):
+            return [[float(len(t)), 1.0] for t in inputs]
+
+    svc.client = FakeBatchClient()
+    items = [(f"id{i}", "y" * (i + 1), None) for i in range(7)]
+    indexed = asyncio.run(svc.aindex_texts(items, batch_size=3, concurrency=2))
+    assert indexed == [f"id{i}" for i in range(7)]
+    assert len(store.all_items()) == 7
+
+
+def test_int8_quantized_store_matches_float_ranking():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((300, 64)).astype(np.float32)
+    ids = [str(i) for i in range(len(X))]
+    exact = InMemoryVectorStore()
+    quant = InMemoryVectorStore(quantize='int8')
+    exact.add_many(ids, X.tolist())
+    quant.add_many(ids, X.tolist())
+
+    q = (X[7] + 0.05 * rng.standard_normal(64)).tolist()
+    e = exact.search(q, top_k=3)
+    r = quant.search(q, top_k=3)
+    assert r[0]['id'] == e[0]['id'] == '7'
+    for a, b in zip(e, r):
+        assert abs(a['score'] - b['score']) < 0.02
+    # all_items returns dequantized (unit-norm) embeddings
+    emb = dict((it['id'], it['embedding']) for it in quant.all_items())['7']
+    assert abs(float(np.linalg.norm(emb)) - 1.0) < 0.02
+
+
+def test_extend_appends_to_search_snapshot():
+    import numpy as np
+
+    store = InMemoryVectorStore()
+    store.add('a', [1.0, 0.0])
+    store.search([1.0, 0.0], top_k=1)  # build the snapshot
+    store.extend(['b', 'c'], np.array([[0.0, 2.0], [1.0, 1.0]]), [{'k': 1}, None])
+
+    assert store._matrix is not None and store._matrix[1].shape == (3, 2)
+    res = store.search([0.0, 1.0], top_k=3)
+    assert [r['id'] for r in res] == ['b', 'c', 'a']
+    assert res[0]['metadata'] == {'k': 1}
+    assert {it['id']: it['embedding'] for it in store.all_items()}['b'] == [0.0, 2.0]
+
+
+def test_repeated_extends_grow_the_snapshot_buffer_geometrically():
+    import numpy as np
+
+    store = InMemoryVectorStore()
+    store.add('seed', [1.0, 0.0, 0.0])
+    store.search([1.0, 0.0, 0.0], top_k=1)
+    rng = np.random.default_rng(0)
+    capacities = set()
+    for step in range(200):
+        store.extend([f'{step}-{j}' for j in range(3)], rng.normal(size=(3, 3)))
+        capacities.add(store._buf.shape[0])
+    # 601 rows from a 1-row snapshot: a handful of reallocations, not 200
+    assert store._matrix[1].shape == (601, 3) and len(capacities) <= 12
+    assert np.shares_memory(store._matrix[1], store._buf)
+
+    q = rng.normal(size=3)
+    res = store.search(q.tolist(), top_k=5)
+    embs = {it['id']: np.asarray(it['embedding']) for it in store.all_items()}
+    cos = {k: float(v @ q / (np.linalg.norm(v) * np.linalg.norm(q))) for k, v in embs.items()}
+    assert [r['id'] for r in res] == sorted(cos, key=lambda k: -cos[k])[:5]
+
+
+def test_index_texts_overlaps_batch_requests():
+    import threading
+    import time
+
+    store = InMemoryVectorStore()
+    svc = LLMFeatureService(default_model='embeddinggemma', vector_store=store)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    class SlowBatchClient:
+        def embeddings_batch(self, model, inputs, timeout=30.0):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return [[float(len(t)), 1.0] for t in inputs]
+
+    svc.client = SlowBatchClient()
+    items = [(f"id{i}", "y" * (i + 1), None) for i in range(8)]
+    indexed = svc.index_texts(items, batch_size=2, workers=4)
+
+    assert indexed == [f"id{i}" for i in range(8)]
+    assert state["peak"] > 1
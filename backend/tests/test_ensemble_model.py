@@ -28,3 +28,62 @@ def test_ensemble_train_predict_and_save(tmp_path):
     loaded = EnsembleModel.load(str(p))
     preds2 = loaded.predict(X.head(5))
     assert preds2.shape[0] == 5
+
+
+def test_ensemble_weighted_combine_matches_components():
+    rng = np.random.RandomState(2)
+    X = pd.DataFrame({"x1": rng.normal(size=120), "x2": rng.normal(size=120)})
+    y = X["x1"] * 2.0 + rng.normal(scale=0.1, size=120)
+
+    ens = EnsembleModel(rf_params={"n_estimators": 10, "random_state": 0}, en_params={"alpha": 0.1, "l1_ratio": 0.5, "random_state": 0})
+    ens.train(X, y)
+    ens.xgb_model = None
+    rf = ens.rf.predict(X.values[:4])
+    en = ens.en.predict(X.head(4))
+
+    ens.weights = [3.0, 1.0]
+    assert np.allclose(ens.predict(X.head(4)), 0.75 * rf + 0.25 * en)
+    # weights that don't match the component count fall back to a plain mean
+    ens.weights = [1.0, 1.0, 1.0]
+    assert np.allclose(ens.predict(X.head(4).values), (rf + en) / 2.0)
+
+
+def test_ensemble_component_table_is_reused_and_not_pickled():
+    import pickle
+
+    rng = np.random.RandomState(3)
+    X = pd.DataFrame({"x1": rng.normal(size=60), "x2": rng.normal(size=60)})
+    y = X["x1"] + rng.normal(scale=0.1, size=60)
+    ens = EnsembleModel(rf_params={"n_estimators": 5, "random_state": 0}, en_params={"alpha": 0.1, "l1_ratio": 0.5, "random_state": 0})
+    ens.train(X, y)
+
+    first = ens.predict(X.head(3))
+    fns = ens._components()[0]
+    assert ens._components()[0] is fns
+    clone = pickle.loads(pickle.dumps(ens))
+    assert not hasattr(clone, "_component_cache")
+    assert np.allclose(clone.predict(X.head(3)), first)
+
+    ens.xgb_model = None
+    assert len(ens._components()[0]) == 2
+
+
+def test_ensemble_passes_frames_to_members_fitted_with_feature_names():
+    import warnings
+
+    from sklearn.linear_model import ElasticNet
+
+    rng = np.random.RandomState(4)
+    X = pd.DataFrame({"x1": rng.normal(size=80), "x2": rng.normal(size=80)})
+    y = X["x1"] - X["x2"] + rng.normal(scale=0.1, size=80)
+    ens = EnsembleModel(rf_params={"n_estimators": 5, "random_state": 0}, en_params={"alpha": 0.1, "l1_ratio": 0.5, "random_state": 0})
+    ens.train(X, y)
+    ens.xgb_model = None
+    # a bare sklearn member fitted on the frame records feature_names_in_
+    ens.en = ElasticNet(alpha=0.1).fit(X, y)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        preds = ens.predict(X.head(4))
+    expected = (ens.rf.predict(X.values[:4]) + ens.en.predict(X.head(4))) / 2.0
+    assert np.allclose(preds, expected)
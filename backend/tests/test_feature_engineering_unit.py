@@ -26,3 +26,91 @@ def test_engineer_features_basic():
 
     # values are numeric / non-null after fillna
     assert float(df.iloc[0]["recent_mean"]) > 0
+
+
+def test_features_to_row_zero_fills_nan_like_the_frame():
+    import numpy as np
+
+    from backend.services.feature_engineering import engineer_features_dict, features_to_frame, features_to_row
+
+    nan = float("nan")
+    f = engineer_features_dict({
+        "recentGames": [{"statValue": nan}, {"statValue": 22}, {"statValue": nan}],
+        "seasonAvg": nan,
+        "contextualFactors": {"homeAway": "home", "daysRest": 1},
+    })
+    row = features_to_row(f)
+    assert not np.isnan(row).any()
+    assert np.array_equal(row, features_to_frame(f).to_numpy(dtype=np.float64))
+
+
+def test_features_to_matrix_matches_stacked_rows():
+    import numpy as np
+
+    from backend.services.feature_engineering import (
+        engineer_features_dict,
+        features_to_frame,
+        features_to_matrix,
+        features_to_row,
+    )
+
+    nan = float("nan")
+    feats = [
+        engineer_features_dict({"recentGames": [{"statValue": v}, {"statValue": v + 4}], "seasonAvg": avg})
+        for v, avg in ((10, 12), (20, 21), (30, None), (nan, nan))
+    ]
+    mat = features_to_matrix(feats)
+    assert mat.shape == (4, len(feats[0]))
+    assert np.array_equal(mat, np.vstack([features_to_row(f) for f in feats]))
+    # NaN-bearing payloads are zero-filled like the DataFrame path
+    assert np.array_equal(mat, features_to_frame(feats).to_numpy(dtype=np.float64))
+    assert features_to_matrix([]).shape == (0, 0)
+
+
+def test_engineer_features_array_matches_frame_and_column_order():
+    import numpy as np
+
+    from backend.services.feature_engineering import FeatureEngineering, engineer_features_array
+
+    player_data = {
+        "recentGames": [{"statValue": 20}, {"statValue": 26}],
+        "seasonAvg": 24,
+        "contextualFactors": {"homeAway": "home", "daysRest": 1},
+    }
+    df = engineer_features(player_data)
+    row = engineer_features_array(player_data)
+    assert row.shape == (1, df.shape[1]) and row.dtype == np.float64
+    assert np.allclose(row, df.to_numpy(dtype=np.float64))
+
+    picked = FeatureEngineering.engineer_features_array(player_data, columns=["season_avg", "not_a_feature", "is_home"])
+    assert picked.tolist() == [[24.0, 0.0, 1.0]]
+    nan_avg = FeatureEngineering.engineer_features_array(dict(player_data, seasonAvg=float("nan")), columns=["season_avg", "is_home"])
+    assert nan_avg.tolist() == [[0.0, 1.0]]
+
+
+def test_rolling_averages_from_stat_column_match_reference():
+    import numpy as np
+
+    from backend.services.feature_engineering import calculate_rolling_averages
+
+    vals = [31.0, 18, None, 24.5, 27, 12, 35, None, 22, 19, 28, 30]
+    out = calculate_rolling_averages([{"statValue": v} for v in vals])
+    ref = [float(v) for v in vals if v is not None]
+    for w in (3, 5, 10):
+        part = ref[:w]
+        assert out[f"last_{w}_avg"] == np.mean(part)
+        assert out[f"last_{w}_std"] == np.std(part)
+        assert out[f"last_{w}_median"] == np.median(part)
+        assert (out[f"last_{w}_min"], out[f"last_{w}_max"]) == (min(part), max(part))
+    assert np.isclose(out["slope_10"], np.polyfit(np.arange(10), ref[:10], 1)[0])
+    assert out["momentum_vs_5_avg"] == ref[0] - np.mean(ref[:5])
+    assert calculate_rolling_averages([{"statValue": 9}])["slope_10"] == 0.0
+
+
+def test_engineer_features_dict_tolerates_null_contextual_factors():
+    from backend.services.feature_engineering import engineer_features_dict
+
+    feats = engineer_features_dict({"recentGames": [{"statValue": 20}], "contextualFactors": None})
+    assert (feats["is_home"], feats["days_rest"], feats["is_back_to_back"]) == (0, 0, 0)
+    feats = engineer_features_dict({"contextualFactors": {"homeAway": "home", "daysRest": 0}})
+    assert (feats["is_home"], feats["days_rest"], feats["is_back_to_back"]) == (1, 0, 1)
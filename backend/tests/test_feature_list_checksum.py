@@ -33,3 +33,120 @@ def test_feature_list_checksum_sidecar_and_validator(tmp_path):
 
     # and False for a different list
     assert reg.validate_feature_list('Dummy Player', ['feat_a', 'feat_b']) is False
+
+
+def test_validator_prefers_newest_version_and_reuses_version_index(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    old = DummyModel()
+    old._feature_list = ['old_a']
+    reg.save_model('Multi Player', old, version='v1')
+    new = DummyModel()
+    reg.save_model('Multi Player', new, version='v2')
+    # drop the legacy sidecar so only the versioned lookup can answer
+    legacy = os.path.splitext(reg._model_path('Multi Player'))[0] + '_metadata.json'
+    os.remove(legacy)
+
+    assert reg.validate_feature_list('Multi Player', ['feat_a', 'feat_b', 'feat_c']) is True
+
+    scans = []
+    real_scandir = mr.os.scandir
+    monkeypatch.setattr(mr.os, 'scandir', lambda p: scans.append(p) or real_scandir(p))
+    monkeypatch.setattr(mr.os, 'walk', lambda *a, **k: (_ for _ in ()).throw(AssertionError('walked')))
+    assert reg.validate_feature_list('Multi Player', ['feat_a', 'feat_b', 'feat_c']) is True
+    assert reg.validate_feature_list('Multi Player', ['old_a']) is False
+    assert scans == []
+
+
+def test_sidecars_share_one_serialization_and_leave_notes_untouched(tmp_path):
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    notes = {'source': 'nightly'}
+    reg.save_model('Notes Player', DummyModel(), version='v1', notes=notes)
+    assert notes == {'source': 'nightly'}
+
+    legacy = os.path.splitext(reg._model_path('Notes Player'))[0] + '_metadata.json'
+    versioned = os.path.splitext(reg._latest_versioned_model(
+        str(tmp_path / 'models' / 'Notes_Player' / 'versions')))[0] + '_metadata.json'
+    with open(legacy, encoding='utf8') as fh:
+        legacy_body = fh.read()
+    with open(versioned, encoding='utf8') as fh:
+        assert fh.read() == legacy_body
+    data = json.loads(legacy_body)
+    assert data['notes'] == {'source': 'nightly', 'feature_list': ['feat_a', 'feat_b', 'feat_c']}
+    assert data['kept_contextual_features'] == ['feat_a', 'feat_b']
+    assert reg.validate_feature_list('Notes Player', ['feat_a', 'feat_b', 'feat_c']) is True
+
+
+def test_notes_are_parsed_once_for_db_row_and_sidecar(tmp_path, monkeypatch):
+    import sys
+    import types
+
+    from backend.services import model_registry as mr
+
+    run = types.SimpleNamespace(info=types.SimpleNamespace(run_id='run-1'))
+    monkeypatch.setitem(sys.modules, 'mlflow', types.SimpleNamespace(active_run=lambda: run))
+    parses, rows = [], []
+    real = mr._merge_notes
+    monkeypatch.setattr(mr, '_merge_notes', lambda notes, **kw: parses.append(notes) or real(notes, **kw))
+    monkeypatch.setattr(mr, '_metadata_db_url', lambda: 'sqlite://')
+    monkeypatch.setattr(mr, '_submit_metadata', lambda url, batch: rows.extend(batch))
+
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('Run Player', DummyModel(), version='v1', notes='{"source": "nightly"}')
+
+    assert parses == ['{"source": "nightly"}']
+    assert rows[0]['notes'] == {'source': 'nightly', 'mlflow_run_id': 'run-1'}
+    sidecar = os.path.splitext(reg._model_path('Run Player'))[0] + '_metadata.json'
+    with open(sidecar, encoding='utf8') as fh:
+        data = json.load(fh)
+    assert data['mlflow_run_id'] == 'run-1'
+    assert data['notes'] == {'source': 'nightly', 'mlflow_run_id': 'run-1',
+                             'feature_list': ['feat_a', 'feat_b', 'feat_c']}
+
+
+def test_feature_checksum_is_memoized_and_matches_sidecar(tmp_path, monkeypatch):
+    import hashlib
+
+    from backend.services import model_registry as mr
+
+    feats = ['feat_a', 'feat_b', 'feat_c']
+    expected = hashlib.sha256(json.dumps(feats, separators=(',', ':')).encode('utf-8')).hexdigest()
+    mr._cached_checksum.cache_clear()
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('Sum Player', DummyModel(), version='v1')
+    for _ in range(3):
+        assert reg.validate_feature_list('Sum Player', list(feats)) is True
+    assert reg.validate_feature_list('Sum Player', feats[:2]) is False
+    info = mr._cached_checksum.cache_info()
+    assert info.misses == 2 and info.hits == 3
+    sidecar = os.path.splitext(reg._model_path('Sum Player'))[0] + '_metadata.json'
+    with open(sidecar, encoding='utf8') as fh:
+        assert json.load(fh)['feature_list_checksum'] == expected
+    # unhashable entries still get a checksum
+    assert mr._feature_checksum([{'b': 1, 'a': 2}]) == mr._feature_checksum([{'a': 2, 'b': 1}])
+
+
+class NumpyModel(DummyModel):
+    def __init__(self):
+        import numpy as np
+
+        self._kept_contextual_features = np.array(['feat_a'])
+        self._feature_list = np.array(['feat_a', 'feat_b'])
+
+
+def test_sidecar_serializes_numpy_notes_and_features(tmp_path):
+    import numpy as np
+
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('Np Player', NumpyModel(), version='v1', notes={'rows': np.int64(82)})
+    sidecar = os.path.splitext(reg._model_path('Np Player'))[0] + '_metadata.json'
+    with open(sidecar, encoding='utf8') as fh:
+        data = json.load(fh)
+    assert data['feature_list'] == ['feat_a', 'feat_b']
+    assert data['notes']['rows'] == 82
+    assert reg.validate_feature_list('Np Player', ['feat_a', 'feat_b']) is True
+    # stdlib-compatible, indented output either way
+    assert mr._sidecar_bytes({'a': [1]}).decode() == json.dumps({'a': [1]}, indent=2)
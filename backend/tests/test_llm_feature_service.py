@@ -118,3 +118,158 @@ def test_fetch_news_and_extract_basic(names):
     for n in names:
         res2 = svc.fetch_news_and_extract(n, source_id='test', text_fetcher=dummy_text_fetcher)
         assert res2 == results[n]
+
+
+def test_extract_from_text_skips_llm_for_trivial_text(monkeypatch):
+    fake = FakeClient([{"injury_status": "out", "morale_score": 10, "news_sentiment": -1.0}])
+    monkeypatch.setattr("backend.services.llm_feature_service.get_default_client", lambda: fake)
+
+    svc = LLMFeatureService()
+    for text in ("-", "ok", "No news.", "  nothing to report  ", "N/A", "No updates available"):
+        out = svc.extract_from_text("Some Player", text)
+        assert out["injury_status"] == "healthy"
+        assert out["morale_score"] == 50
+    assert fake.calls == 0
+
+    # real notes are never gated, however short or whatever phrases they contain
+    assert not svc._is_trivial_context("Out (ankle), GTD")
+    assert not svc._is_trivial_context("Coach says there are no updates on his ankle yet.")
+    # empty context still goes to the model, which can gather its own via tools
+    assert not svc._is_trivial_context("")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+def test_fetch_news_and_extract_shares_results_through_redis(monkeypatch):
+    fake = FakeClient([
+        {
+            "injury_status": "healthy",
+            "morale_score": 75,
+            "news_sentiment": 0.3,
+            "trade_sentiment": 0.0,
+            "motivation": 0.6,
+        }
+    ])
+    monkeypatch.setattr("backend.services.llm_feature_service.get_default_client", lambda: fake)
+    redis = FakeRedis()
+
+    def fetcher(name):
+        return "Routine update from practice with good morale reported"
+
+    first = LLMFeatureService(redis_client=redis)
+    out1 = first.fetch_news_and_extract("PlayerZ", "src9", fetcher)
+    assert "llm_feat:PlayerZ:src9" in redis.store
+
+    # a second worker (fresh L1) is served from Redis without an LLM call
+    second = LLMFeatureService(redis_client=redis)
+    out2 = second.fetch_news_and_extract("PlayerZ", "src9", fetcher)
+    assert out2 == out1
+    assert fake.calls == 1
+
+
+def test_cache_encoding_compresses_large_values():
+    from backend.services.llm_feature_service import _decode_cached, _encode_cached
+
+    small = {"a": 1.0}
+    assert json.loads(_encode_cached(small)) == small
+    assert _decode_cached(_encode_cached(small).encode()) == small
+    big = {f"k{i}": float(i) for i in range(200)}
+    enc = _encode_cached(big)
+    assert enc.startswith("z:") and len(enc) < len(json.dumps(big))
+    assert _decode_cached(enc) == big
+    assert _decode_cached(enc.encode("utf-8")) == big
+
+
+def test_extract_from_text_reuses_result_for_identical_prompt(monkeypatch):
+    fake = FakeClient([
+        {
+            "injury_status": "out",
+            "morale_score": 30,
+            "news_sentiment": -0.7,
+            "trade_sentiment": 0.0,
+            "motivation": 0.2,
+        }
+    ])
+    monkeypatch.setattr("backend.services.llm_feature_service.get_default_client", lambda: fake)
+
+    svc = LLMFeatureService()
+    text = "Team announced the starting lineup will rest tonight on a back-to-back."
+    out1 = svc.extract_from_text("Player One", text)
+    out2 = svc.extract_from_text("Player Two", text)
+    assert out1 == out2
+    assert out1["injury_status"] == "out"
+    assert fake.calls == 1
+
+
+def test_extract_from_text_parses_json_embedded_in_prose(monkeypatch):
+    payload = json.dumps({
+        "injury_status": "doubtful",
+        "morale_score": 40,
+        "news_sentiment": -0.5,
+        "trade_sentiment": 0.1,
+        "motivation": 0.3,
+    })
+    fake = FakeClient([f"Here is the analysis: {payload} Let me know if {{you}} need more."])
+    monkeypatch.setattr("backend.services.llm_feature_service.get_default_client", lambda: fake)
+
+    svc = LLMFeatureService()
+    out = svc.extract_from_text("Some Player", "Coach said the forward is day-to-day with knee soreness.")
+    assert out["injury_status"] == "doubtful"
+    assert out["morale_score"] == 40
+
+
+def test_afetch_many_matches_sync_results():
+    import asyncio
+
+    from backend.services.llm_feature_service import LLMFeatureService
+
+    names = ["Injured_Player", "Motivated_Player", "Coach_Player", "Neutral_Player"]
+    sync_svc = LLMFeatureService(redis_client=None)
+    expected = {n: sync_svc.fetch_news_and_extract(n, "test", dummy_text_fetcher) for n in names}
+
+    async_svc = LLMFeatureService(redis_client=None)
+    got = asyncio.run(async_svc.afetch_many(names, "test", dummy_text_fetcher, concurrency=2))
+    assert got == expected
+
+
+def test_coerce_partial_keeps_falsy_values_and_aliases():
+    svc = LLMFeatureService()
+    out = svc._coerce_partial({'morale': 0, 'sentiment': 0.0, 'tradeSentiment': None, 'motivation_score': '0.2'})
+    assert out['morale_score'] == 0
+    assert out['news_sentiment'] == 0.0
+    assert out['trade_sentiment'] == 0.0
+    assert out['motivation'] == 0.2
+    assert out['injury_status'] == 'healthy'
+    assert svc._coerce_partial({'morale_score': 'high'}) is None
+
+
+def test_refresh_config_picks_up_env_changes(monkeypatch):
+    svc = LLMFeatureService()
+    monkeypatch.setenv('LLM_MIN_CTX_CHARS', '20')
+    monkeypatch.setenv('OLLAMA_URL', 'https://api.ollama.com')
+    assert not svc._is_trivial_context("short text")
+    svc.refresh_config()
+    assert svc._is_trivial_context("short text")
+    assert svc._ollama_api_path == 'https://api.ollama.com/api/chat'
+
+
+def test_generate_embedding_returns_none_when_live_fails_and_fallback_disabled(monkeypatch):
+    monkeypatch.setenv('OLLAMA_EMBEDDINGS_FALLBACK', 'false')
+
+    class FailingClient:
+        def embeddings(self, model, input):
+            raise RuntimeError('embedding backend down')
+
+    svc = LLMFeatureService()
+    svc.client = FailingClient()
+    assert svc.generate_embedding("some text") is None
+    assert svc._last_embedding_source is None
@@ -28,3 +28,22 @@ def test_llm_feature_range():
     assert -1.0 <= r.get("injury_sentiment", 0.0) <= 1.0
     assert -1.0 <= r.get("morale_score", 0.0) <= 1.0
     assert 0.0 <= r.get("motivation", 0.0) <= 1.0
+
+
+def test_llm_feature_empty_text_short_circuits():
+    from backend.services.llm_feature_service import LLMFeatureService
+
+    svc = LLMFeatureService(redis_client=None)
+
+    calls = {"n": 0}
+
+    def boom(**kwargs):
+        calls["n"] += 1
+        raise AssertionError("LLM should not be called for empty text")
+
+    svc.client.generate = boom
+
+    for i, text in enumerate(("", "   \n")):
+        r = svc.fetch_news_and_extract("Player Y", f"news_{i}", lambda name, t=text: t)
+        assert r == {"injury_sentiment": 0.0, "morale_score": 0.0, "motivation": 0.0, "coaching_change_impact": 0.0}
+    assert calls["n"] == 0
@@ -45,3 +45,42 @@ def test_tool_call_flow(monkeypatch):
     assert abs(out["news_sentiment"] + 0.4) < 1e-6
     assert web_calls.get("q") == "PlayerX injury"
     assert calls["generate"] >= 2
+
+
+def test_extract_many_dedupes_concurrent_web_search(monkeypatch):
+    """Concurrent extractions asking for the same query share one web_search."""
+    import asyncio
+    import time
+
+    class FakeClient:
+        def generate(self, **kwargs):
+            if "[web_search result]" not in kwargs["prompt"]:
+                return {"tool_call": {"name": "web_search", "arguments": {"query": "league injury report"}}}
+            return {
+                "injury_status": "questionable",
+                "morale_score": 60,
+                "news_sentiment": -0.2,
+                "trade_sentiment": 0.0,
+                "motivation": 0.5,
+            }
+
+    monkeypatch.setattr("backend.services.llm_feature_service.get_default_client", lambda: FakeClient())
+
+    web_calls = []
+
+    def slow_web_search(q: str) -> str:
+        web_calls.append(q)
+        time.sleep(0.2)
+        return "Report: several players listed as questionable."
+
+    monkeypatch.setattr("backend.services.web_search.web_search", slow_web_search)
+
+    from backend.services.llm_feature_service import LLMFeatureService
+
+    svc = LLMFeatureService()
+    items = [(f"Player{i}", f"Player{i} was limited at practice on Tuesday per team reporters.") for i in range(4)]
+    out = asyncio.run(svc.extract_many(items, concurrency=4))
+
+    assert len(out) == 4
+    assert all(o["injury_status"] == "questionable" for o in out)
+    assert web_calls == ["league injury report"]
@@ -0,0 +1,72 @@
+from backend.services.memmap_vector_store import MemmapVectorStore
+
+
+def test_memmap_store_search_and_reopen(tmp_path):
+    path = str(tmp_path / "vectors")
+    store = MemmapVectorStore(path, flush_every=2)
+    store.add("a", [1.0, 0.0, 0.0], {"text": "alpha"})
+    store.add("b", [0.0, 1.0, 0.0], {"text": "beta"})
+    store.add("c", [0.9, 0.1, 0.0], {"text": "gamma"})
+
+    res = store.search([1.0, 0.0, 0.0], top_k=2)
+    assert [r["id"] for r in res] == ["a", "c"]
+    assert abs(res[0]["score"] - 1.0) < 1e-6
+    assert res[0]["metadata"] == {"text": "alpha"}
+    store.close()
+
+    # a fresh instance on the same path sees every vector without re-adding
+    reopened = MemmapVectorStore(path)
+    assert len(reopened) == 3
+    res2 = reopened.search([0.0, 1.0, 0.0], top_k=1)
+    assert res2[0]["id"] == "b"
+    assert res2[0]["metadata"] == {"text": "beta"}
+
+
+def test_memmap_store_grows_and_overwrites(tmp_path):
+    store = MemmapVectorStore(str(tmp_path / "vectors"))
+    for i in range(1500):
+        store.add(f"id{i}", [float(i), 1.0], {})
+    assert len(store) == 1500
+
+    store.add("id0", [0.0, -1.0], {"v": 2})
+    assert len(store) == 1500
+    res = store.search([0.0, -1.0], top_k=1)
+    assert res[0]["id"] == "id0"
+    assert res[0]["metadata"] == {"v": 2}
+
+
+def test_memmap_extend_block(tmp_path):
+    import numpy as np
+
+    store = MemmapVectorStore(str(tmp_path / "vec"))
+    store.extend(["x", "y"], np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]), [{"n": 1}, {"n": 2}])
+    store.extend(["y", "z"], np.array([[0.0, 0.0, 1.0], [1.0, 1.0, 0.0]]))
+    store.close()
+
+    reopened = MemmapVectorStore(str(tmp_path / "vec"))
+    assert len(reopened) == 3
+    assert reopened.search([0.0, 0.0, 1.0], top_k=1)[0]["id"] == "y"
+    assert reopened.search([1.0, 0.0, 0.0], top_k=1)[0]["metadata"] == {"n": 1}
+
+
+def test_memmap_cached_norms_track_writes_after_search(tmp_path):
+    import numpy as np
+
+    store = MemmapVectorStore(str(tmp_path / "vec"))
+    store.add("a", [3.0, 4.0], {})
+    store.add("b", [1.0, 0.0], {})
+    assert store.search([1.0, 0.0], top_k=1)[0]["id"] == "b"  # builds the norm cache
+
+    # overwrite, single add, block extend and a capacity grow after the cache exists
+    store.add("b", [0.0, 2.0], {})
+    store.add("c", [5.0, 0.0], {})
+    rng = np.random.default_rng(0)
+    block = rng.normal(size=(1200, 2)).astype(np.float32)
+    store.extend([f"r{i}" for i in range(1200)], block)
+
+    q = np.array([0.6, 0.8], dtype=np.float32)
+    res = store.search(q.tolist(), top_k=3)
+    items = {it["id"]: np.asarray(it["embedding"], dtype=np.float32) for it in store.all_items()}
+    expected = sorted(items, key=lambda k: -float(items[k] @ q / np.linalg.norm(items[k])))[:3]
+    assert [r["id"] for r in res] == expected
+    assert abs(res[0]["score"] - float(items[expected[0]] @ q / np.linalg.norm(items[expected[0]]))) < 1e-5
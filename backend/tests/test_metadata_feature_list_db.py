@@ -25,6 +25,8 @@ def test_model_metadata_feature_list_db(tmp_path):
     from backend.services.model_registry import ModelRegistry
     reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
     reg.save_model('DB Player', m, version='v9', notes='db-test')
+    from backend.services.model_registry import flush_metadata_writes
+    assert flush_metadata_writes()
 
     # Query row and ensure feature_list column present and matches
     with engine.begin() as conn:
@@ -48,3 +50,201 @@ def test_model_metadata_feature_list_db(tmp_path):
             assert parsed == ['a', 'b', 'c']
         else:
             assert list(val) == ['a', 'b', 'c']
+
+
+def test_saves_reuse_one_engine(tmp_path, monkeypatch):
+    db_path = tmp_path / 'reuse.db'
+    url = f"sqlite:///{db_path}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    ModelMetadata.__table__.create(create_engine(url, future=True))
+
+    import sqlalchemy
+    from backend.services import model_registry
+    built = []
+    real = sqlalchemy.create_engine
+    monkeypatch.setattr(sqlalchemy, 'create_engine', lambda *a, **k: built.append((a, k)) or real(*a, **k))
+    model_registry._get_engine.cache_clear()
+
+    reg = model_registry.ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('Pool Player', M(), version='v1')
+    reg.save_model('Pool Player', M(), version='v2')
+    assert model_registry.flush_metadata_writes()
+    reg.validate_feature_list('Pool Player', ['a'])
+
+    assert [a for a, _ in built] == [(url,)]
+    assert built[0][1]['pool_pre_ping'] is True
+    with create_engine(url, future=True).begin() as conn:
+        rows = conn.execute(select(ModelMetadata.__table__.c.version)).scalars().all()
+    assert sorted(rows) == ['v1', 'v2']
+
+
+def test_metadata_written_in_background(tmp_path, monkeypatch):
+    db_path = tmp_path / 'bg.db'
+    url = f"sqlite:///{db_path}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    ModelMetadata.__table__.create(create_engine(url, future=True))
+
+    import threading
+    from backend.services import model_registry
+    writers = []
+    real = model_registry._upsert_model_metadata_many
+    monkeypatch.setattr(model_registry, '_upsert_model_metadata_many',
+                        lambda conn, rows: writers.extend([threading.current_thread().name] * len(rows)) or real(conn, rows))
+
+    reg = model_registry.ModelRegistry(model_dir=str(tmp_path / 'models'))
+    for i in range(5):
+        reg.save_model('Queued Player', M(), version=f'v{i}')
+    assert model_registry.flush_metadata_writes()
+
+    assert writers == ['model-metadata-writer'] * 5
+    with create_engine(url, future=True).begin() as conn:
+        rows = conn.execute(select(ModelMetadata.__table__.c.version)).scalars().all()
+    assert sorted(rows) == [f'v{i}' for i in range(5)]
+
+
+def test_save_models_bulk_batches_invalidation_and_metadata(tmp_path, monkeypatch):
+    db_path = tmp_path / 'bulk.db'
+    url = f"sqlite:///{db_path}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.setenv('MODEL_METADATA_ASYNC', 'false')
+    ModelMetadata.__table__.create(create_engine(url, future=True))
+
+    from backend.services import cache as cache_module
+    from backend.services import model_registry
+    sweeps, batches = [], []
+    monkeypatch.setattr(cache_module, 'invalidate_prefixes_sync', lambda prefixes, **kw: sweeps.append(list(prefixes)) or 0)
+    real = model_registry._write_metadata_batch
+    monkeypatch.setattr(model_registry, '_write_metadata_batch',
+                        lambda sync_url, rows: batches.append(len(rows)) or real(sync_url, rows))
+
+    reg = model_registry.ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_models_bulk([('Bulk A', M()), ('Bulk B', M(), 'v2', 'retrain'), ('Bulk C', M(), 'v3')])
+
+    assert len(sweeps) == 1 and len(sweeps[0]) == 9
+    assert 'predict:Bulk B:' in sweeps[0]
+    assert batches == [3]
+    assert reg.load_model('Bulk C') is not None
+    with create_engine(url, future=True).begin() as conn:
+        names = conn.execute(select(ModelMetadata.__table__.c.name)).scalars().all()
+    assert sorted(names) == ['Bulk A', 'Bulk B', 'Bulk C']
+
+
+def test_missing_sqlite_database_skips_metadata_writes(tmp_path, monkeypatch):
+    from backend.services import model_registry
+
+    missing = tmp_path / 'absent.db'
+    monkeypatch.setenv('DATABASE_URL', f"sqlite+aiosqlite:///{missing}")
+    monkeypatch.setattr(model_registry, '_submit_metadata', lambda *a: (_ for _ in ()).throw(AssertionError('submitted')))
+    reg = model_registry.ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('No DB Player', M(), version='v1')
+    reg.save_models_bulk([('No DB Player', M(), 'v2')])
+    assert not missing.exists()
+    assert reg.load_model('No DB Player') is not None
+
+
+def test_metadata_batch_is_one_select_plus_executemany(tmp_path):
+    from sqlalchemy import event
+    from backend.services import model_registry
+
+    url = f"sqlite:///{tmp_path / 'batch.db'}"
+    engine = create_engine(url, future=True)
+    table = ModelMetadata.__table__
+    table.create(engine)
+    with engine.begin() as conn:
+        conn.execute(table.insert().values(name='A', version='v1', notes='old'))
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *a: statements.append(a[2].split()[0]))
+    rows = [
+        {'name': 'A', 'version': 'v1', 'notes': 'new'},
+        {'name': 'B', 'version': None, 'path': '/b1'},
+        {'name': 'B', 'version': None, 'path': '/b2'},
+        {'name': 'C', 'version': 'v2', 'path': '/c', 'feature_list': ['x', 'y']},
+    ]
+    with engine.begin() as conn:
+        model_registry._upsert_model_metadata_many(conn, rows)
+
+    assert statements.count('SELECT') == 1
+    assert statements.count('UPDATE') == 1
+    with engine.begin() as conn:
+        got = conn.execute(select(table.c.name, table.c.version, table.c.path, table.c.notes, table.c.feature_list)
+                           .order_by(table.c.name)).all()
+    assert [tuple(r) for r in got] == [
+        ('A', 'v1', None, 'new', None),
+        ('B', None, '/b2', None, None),
+        ('C', 'v2', '/c', None, ['x', 'y']),
+    ]
+
+
+def test_versioned_metadata_rows_upsert_in_one_statement(tmp_path):
+    from sqlalchemy import MetaData, UniqueConstraint, event
+    from backend.services import model_registry
+
+    url = f"sqlite:///{tmp_path / 'upsert.db'}"
+    engine = create_engine(url, future=True)
+    table = ModelMetadata.__table__
+    table.create(engine)
+    with engine.begin() as conn:
+        conn.execute(table.insert().values(name='A', version='v1', notes='old', path='/a'))
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *a: statements.append(a[2].split()[0]))
+    with engine.begin() as conn:
+        model_registry._upsert_model_metadata_many(conn, [
+            {'name': 'A', 'version': 'v1', 'notes': 'new'},
+            {'name': 'C', 'version': 'v2', 'path': '/c', 'feature_list': ['x']},
+        ])
+        model_registry._upsert_model_metadata(conn, {'name': 'C', 'version': 'v2', 'path': '/c2'})
+    assert statements == ['INSERT', 'INSERT', 'INSERT']
+    with engine.begin() as conn:
+        got = conn.execute(select(table.c.name, table.c.version, table.c.path, table.c.notes, table.c.feature_list)
+                           .order_by(table.c.name)).all()
+    assert [tuple(r) for r in got] == [('A', 'v1', '/a', 'new', None), ('C', 'v2', '/c2', None, ['x'])]
+
+    # a database created before the unique key still gets one row per version
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", future=True)
+    legacy = table.to_metadata(MetaData())
+    legacy.constraints = {c for c in legacy.constraints if not isinstance(c, UniqueConstraint)}
+    legacy.create(legacy_engine)
+    for path in ('/l1', '/l2'):
+        with legacy_engine.begin() as conn:
+            model_registry._upsert_model_metadata(conn, {'name': 'L', 'version': 'v1', 'path': path})
+    with legacy_engine.begin() as conn:
+        assert conn.execute(select(legacy.c.path)).scalars().all() == ['/l2']
+
+
+def _save_in_pool_worker(args):
+    # mirrors train_orchestrator._train_worker: save, then flush before returning
+    from backend.services.model_registry import get_registry
+
+    model_dir, name = args
+    reg = get_registry(model_dir)
+    reg.save_model(name, M(), version='v1')
+    return reg.flush(timeout=20.0)
+
+
+def test_pool_workers_persist_every_metadata_row(tmp_path, monkeypatch):
+    import multiprocessing
+
+    import pytest
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('needs the fork start method')
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.delenv('MODEL_METADATA_ASYNC', raising=False)
+    ModelMetadata.__table__.create(create_engine(url, future=True))
+
+    from backend.services import model_registry
+    model_dir = str(tmp_path / 'models')
+    # the parent's writer thread is running when the pool forks
+    model_registry.get_registry(model_dir).save_model('Parent Player', M(), version='v1')
+    assert model_registry.flush_metadata_writes()
+
+    names = [f'Pool Player {i}' for i in range(12)]
+    with multiprocessing.get_context('fork').Pool(3) as pool:
+        flushed = pool.map(_save_in_pool_worker, [(model_dir, n) for n in names])
+    assert all(flushed)
+    with create_engine(url, future=True).begin() as conn:
+        got = conn.execute(select(ModelMetadata.__table__.c.name)).scalars().all()
+    assert sorted(got) == sorted(names + ['Parent Player'])
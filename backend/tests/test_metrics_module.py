@@ -0,0 +1,36 @@
+import importlib
+import sys
+
+
+def test_metrics_import_is_lazy_and_reload_safe():
+    from backend.services import metrics
+
+    c1 = metrics.embedding_requests_total
+    c1.inc()
+    assert metrics.embedding_requests_total is c1
+
+    # reloading must reuse the registered collector instead of raising
+    # "Duplicated timeseries"
+    reloaded = importlib.reload(metrics)
+    assert reloaded.embedding_requests_total is c1
+    assert 'prometheus_client' in sys.modules
+    assert reloaded.CONTENT_TYPE_LATEST.startswith('text/plain')
+    assert b'embedding_requests_total' in reloaded.generate_latest()
+
+
+def test_multiprocess_registry_cached_until_dir_changes(tmp_path, monkeypatch):
+    import os
+    from backend.services import metrics
+
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    metrics.generate_latest()
+    first = metrics._REGISTRY
+    metrics.generate_latest()
+    assert metrics._REGISTRY is first
+
+    # touching the directory (new worker file) forces a rebuild
+    (tmp_path / 'marker').write_bytes(b'')
+    st = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    metrics.generate_latest()
+    assert metrics._REGISTRY is not first
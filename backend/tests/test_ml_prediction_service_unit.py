@@ -24,3 +24,178 @@ def test_ml_prediction_with_persisted_model():
     assert "over_probability" in result
     assert 0.0 <= float(result["over_probability"]) <= 1.0
     assert "predicted_value" in result
+
+
+def test_model_input_skips_dataframe_for_array_models():
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+
+    feats = {"recent_mean": 25.0, "recent_std": None, "is_home": 1}
+    arr_model = LinearRegression().fit(np.array([[1.0, 0.0, 0.0], [2.0, 1.0, 1.0]]), [1.0, 2.0])
+    df_model = LinearRegression().fit(pd.DataFrame([feats, feats]).fillna(0), [1.0, 2.0])
+
+    x = MLPredictionService._model_input(arr_model, feats)
+    assert isinstance(x, np.ndarray) and x.tolist() == [[25.0, 0.0, 1.0]]
+    assert isinstance(MLPredictionService._model_input(df_model, feats), pd.DataFrame)
+    # non-numeric values (e.g. dates) fall back to the DataFrame path
+    assert isinstance(MLPredictionService._model_input(arr_model, {"d": "2025-11-01"}), pd.DataFrame)
+
+
+def test_predict_batch_matches_predict(tmp_path):
+    import numpy as np
+
+    class LinearModel:
+        def __init__(self):
+            self.calls = 0
+
+        def predict(self, X):
+            self.calls += 1
+            X = np.asarray(X, dtype=float)
+            return X[:, 0] * 0.0 + 20.0 + X.shape[0]
+
+    svc = MLPredictionService(model_dir=str(tmp_path))
+    model = LinearModel()
+    svc.registry.load_model = lambda name: model if name == "Has Model" else None
+
+    pdata = {"recentGames": [{"statValue": 18}, {"statValue": 22}], "seasonAvg": 20}
+    reqs = [
+        {"player_name": "Has Model", "stat_type": "points", "line": 21.5, "player_data": pdata},
+        {"player_name": "No Model", "stat_type": "points", "line": 19.5, "player_data": pdata},
+        {"player_name": "Has Model", "stat_type": "rebounds", "line": 24.0, "player_data": pdata},
+    ]
+    out = asyncio.run(svc.predict_batch(reqs))
+
+    assert [r["player"] for r in out] == ["Has Model", "No Model", "Has Model"]
+    assert model.calls == 1  # one stacked call for both rows
+    assert out[0]["predicted_value"] == 22.0 and out[2]["stat"] == "rebounds"
+    assert out[0]["over_probability"] > 0.5 > out[2]["over_probability"]
+    single = asyncio.run(svc.predict("No Model", "points", 19.5, pdata))
+    assert out[1] == single == svc.predict_sync("No Model", "points", 19.5, pdata)
+    assert asyncio.run(svc.predict_many(reqs)) == svc.predict_batch_sync(reqs) == out
+
+    # NaN stats (pandas-sourced payloads) are zero-filled on both paths
+    nan_data = {"recentGames": [{"statValue": float("nan")}, {"statValue": 22}], "seasonAvg": float("nan")}
+    nan_reqs = [dict(reqs[0], player_data=nan_data), dict(reqs[2], player_data=nan_data)]
+    assert [r["predicted_value"] for r in svc.predict_batch_sync(nan_reqs)] == [22.0, 22.0]
+    assert svc.predict_sync("Has Model", "points", 21.5, nan_data)["predicted_value"] == 21.0
+
+    # the scalar sigmoid agrees with the batch kernel and saturates cleanly
+    one = svc.predict_sync("Has Model", "points", 19.0, pdata)
+    assert abs(one["over_probability"] - 1.0 / (1.0 + np.exp(19.0 - 21.0))) < 1e-12
+    assert svc.predict_sync("Has Model", "points", 5000.0, pdata)["over_probability"] == 0.0
+
+
+def test_calculate_ev_default_and_custom_odds():
+    # -110 both sides: EV of a 60% over is 0.6 * (1 + 100/110) - 1
+    assert abs(MLPredictionService._calculate_ev(0.6) - (0.6 * (1 + 100 / 110) - 1)) < 1e-12
+    assert abs(MLPredictionService._calculate_ev(0.5, odds_over=150, odds_under=-200) - 0.25) < 1e-12
+
+
+def test_failing_model_falls_back_to_heuristic_without_retry(tmp_path, caplog, monkeypatch):
+    import logging
+
+    # alembic's fileConfig (run by migration tests) disables existing loggers
+    monkeypatch.setattr(logging.getLogger("backend.services.ml_prediction_service"), "disabled", False)
+
+    class BrokenModel:
+        calls = 0
+
+        def predict(self, X):
+            BrokenModel.calls += 1
+            raise ValueError("shape mismatch")
+
+    svc = MLPredictionService(model_dir=str(tmp_path))
+    model = BrokenModel()
+    svc.registry.load_model = lambda name: model if name == "Broken" else None
+    pdata = {"recentGames": [{"statValue": 18}, {"statValue": 22}], "seasonAvg": 20}
+
+    expected = svc.predict_sync("Nobody", "points", 19.5, pdata)
+    with caplog.at_level(logging.WARNING, logger="backend.services.ml_prediction_service"):
+        first = svc.predict_sync("Broken", "points", 19.5, pdata)
+        second = svc.predict_sync("Broken", "points", 19.5, pdata)
+
+    assert BrokenModel.calls == 1  # no recursive retry; then skipped while marked
+    assert first == second == dict(expected, player="Broken")
+    assert sum("Broken" in r.getMessage() for r in caplog.records) == 1
+
+    # a replacement model is tried immediately (and its failure logged), and
+    # the mark expires
+    replacement = BrokenModel()
+    svc.registry.load_model = lambda name: replacement
+    with caplog.at_level(logging.WARNING, logger="backend.services.ml_prediction_service"):
+        svc.predict_sync("Broken", "points", 19.5, pdata)
+    assert BrokenModel.calls == 2
+    assert sum("Broken" in r.getMessage() for r in caplog.records) == 2
+    deadline, marked = svc._failed_models["Broken"]
+    svc._failed_models["Broken"] = (deadline - svc._failure_ttl - 1, marked)
+    svc.predict_sync("Broken", "points", 19.5, pdata)
+    assert BrokenModel.calls == 3
+
+
+def test_score_tail_matches_scalar_result():
+    import numpy as np
+    from backend.services import ml_prediction_service as mps
+    from backend.services import prediction_kernels as pk
+
+    raws = 20.0 + np.array([3.0, 0.25, 0.2, 0.0, -0.2, -0.25, -3.0, 800.0, -800.0])
+    lines = np.full(raws.shape, 20.0)
+    args = (raws, lines, mps._DEFAULT_DECIMAL_ODDS, mps._OVER_THRESHOLD, mps._UNDER_THRESHOLD)
+    for tail in (pk.score_tail(*args), pk._score_tail_numpy(*args)):
+        probs, unders, evs, confs, codes = tail
+        assert mps._REC_LABELS[codes].tolist() == ["OVER", "OVER", None, None, None, "UNDER", "UNDER", "OVER", "UNDER"]
+        for p, under, ev, conf, rec in zip(probs.tolist(), unders.tolist(), evs.tolist(), confs.tolist(), mps._REC_LABELS[codes].tolist()):
+            row = MLPredictionService._result("P", "points", 20.0, 20.0, p)
+            assert (rec, ev, under, conf) == (
+                row["recommendation"], row["expected_value"], row["under_probability"], row["confidence"],
+            )
+
+
+def test_async_predict_loads_cold_model_once_off_loop(tmp_path, monkeypatch):
+    import threading
+
+    from backend.services import model_registry as mr
+    from backend.services.stub_model import StubModel
+
+    svc = MLPredictionService(model_dir=str(tmp_path))
+    svc.registry.save_model("Cold Player", StubModel(), version="v1")
+    svc.registry._loaded_models.clear()
+    svc.registry._model_stamps.clear()
+
+    loads = []
+    real_load = mr._load_artifact
+    monkeypatch.setattr(mr, "_load_artifact", lambda p: loads.append(threading.current_thread().name) or real_load(p))
+    pdata = {"recentGames": [{"statValue": 20}], "seasonAvg": 20}
+
+    async def burst():
+        return await asyncio.gather(*[svc.predict("Cold Player", "points", 24.5, pdata) for _ in range(5)])
+
+    out = asyncio.run(burst())
+    assert len(loads) == 1 and loads[0] != threading.main_thread().name
+    assert all(r["predicted_value"] == 27.0 for r in out)
+    assert not svc.registry.needs_load("Cold Player")
+    assert not svc.registry.needs_load("Nobody At All")
+    assert svc._load_locks == {}  # per-player locks do not outlive the load
+
+
+def test_failed_model_marks_are_capped_and_expire(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_FAILURE_CACHE_SIZE", "3")
+
+    class BrokenModel:
+        def predict(self, X):
+            raise ValueError("broken")
+
+    svc = MLPredictionService(model_dir=str(tmp_path))
+    model = BrokenModel()
+    svc.registry.load_model = lambda name: model
+    pdata = {"recentGames": [{"statValue": 18}], "seasonAvg": 20}
+    for i in range(5):
+        svc.predict_sync(f"P{i}", "points", 19.5, pdata)
+    assert list(svc._failed_models) == ["P2", "P3", "P4"]
+
+    # expired marks are dropped on the next failure, not only on lookup
+    for name in ("P2", "P3"):
+        deadline, marked = svc._failed_models[name]
+        svc._failed_models[name] = (deadline - svc._failure_ttl - 1, marked)
+    svc.predict_sync("P5", "points", 19.5, pdata)
+    assert list(svc._failed_models) == ["P4", "P5"]
@@ -28,3 +28,509 @@ def test_load_saved_model():
     except Exception:
         # model may be a stub; at minimum load succeeded
         pass
+
+
+def test_load_calibrator_is_memoized_until_file_changes(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    assert reg.load_calibrator('Cal Player') is None
+
+    reg.save_calibrator('Cal Player', {'version': 1})
+    loads = []
+    real_load = mr._load_artifact
+    monkeypatch.setattr(mr, '_load_artifact', lambda p: loads.append(p) or real_load(p))
+
+    assert reg.load_calibrator('Cal Player') == {'version': 1}
+    assert reg.load_calibrator('Cal Player') == {'version': 1}
+    assert len(loads) == 1
+
+    reg.save_calibrator('Cal Player', {'version': 2, 'pad': 'x'})
+    assert reg.load_calibrator('Cal Player') == {'version': 2, 'pad': 'x'}
+    assert len(loads) == 2
+
+
+
+def test_loaded_calibrators_are_lru_bounded(tmp_path, monkeypatch):
+    monkeypatch.setenv('MODEL_CACHE_SIZE', '2')
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    for name in ('A', 'B', 'C'):
+        reg.save_calibrator(name, {'name': name})
+    reg.load_calibrator('A')
+    reg.load_calibrator('B')
+    reg.load_calibrator('A')  # A is now most recent
+    reg.load_calibrator('C')
+    assert list(reg._loaded_calibrators) == ['A', 'C']
+    assert reg.load_calibrator('B') == {'name': 'B'}  # evicted, reloads from disk
+
+def test_versioned_model_index_rescans_only_on_change(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Idx Player', {'v': 1}, version='v1')
+    assert reg.load_model('Idx Player') == {'v': 1}
+
+    scans = []
+    real_scandir = mr.os.scandir
+    monkeypatch.setattr(mr.os, 'scandir', lambda p: scans.append(p) or real_scandir(p))
+    assert reg.load_model('Idx Player') == {'v': 1}
+    assert scans == []
+
+    reg.save_model('Idx Player', {'v': 2}, version='v2')
+    assert reg.load_model('Idx Player') == {'v': 2}
+    assert len(scans) == 1
+
+    # identical mtimes: the later version directory name wins
+    versions = tmp_path / 'Idx_Player' / 'versions'
+    pkls = sorted(versions.glob('*/model.pkl'))
+    for p in pkls:
+        os.utime(p, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(versions, ns=(2_000_000_000, 2_000_000_000))
+    assert reg._versioned_models(str(versions)) == tuple(str(p) for p in reversed(pkls))
+
+
+
+def test_list_models_is_cached_until_the_directory_changes(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('List A', {'v': 1}, version='v1')
+    reg.save_calibrator('List A', {'c': 1})
+    first = reg.list_models()
+    assert first == ('List_A.pkl',)
+
+    scans = []
+    real_scandir = mr.os.scandir
+    monkeypatch.setattr(mr.os, 'scandir', lambda p: scans.append(p) or real_scandir(p))
+    assert reg.list_models() is first
+    assert scans == []
+
+    reg.save_model('List B', {'v': 1}, version='v1')
+    assert reg.list_models() == ('List_A.pkl', 'List_B.pkl')
+    assert scans == [reg.model_dir]
+
+def test_load_model_reuses_cached_model_with_lru_bound(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    monkeypatch.setenv('MODEL_CACHE_SIZE', '2')
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    for name in ('P One', 'P Two', 'P Three'):
+        mr.joblib.dump({'name': name}, reg._model_path(name))
+
+    loads = []
+    real_load = mr._load_artifact
+    monkeypatch.setattr(mr, '_load_artifact', lambda p: loads.append(p) or real_load(p))
+
+    assert reg.load_model('P One') == {'name': 'P One'}
+    assert reg.load_model('P One') == {'name': 'P One'}
+    assert len(loads) == 1
+
+    reg.load_model('P Two')
+    reg.load_model('P Three')
+    assert list(reg._loaded_models) == ['P Two', 'P Three']
+
+    # rewriting the artifact invalidates the cached entry
+    real_dump = mr.joblib.dump
+    real_dump({'name': 'P Three', 'v': 2}, reg._model_path('P Three'))
+    assert reg.load_model('P Three') == {'name': 'P Three', 'v': 2}
+
+
+def test_small_artifacts_use_plain_pickle_and_joblib_files_still_load(tmp_path):
+    import pickle
+
+    import numpy as np
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_calibrator('Pk Player', {'coef': [1.0, 2.0]})
+    with open(reg._calibrator_path('Pk Player'), 'rb') as fh:
+        assert pickle.load(fh) == {'coef': [1.0, 2.0]}
+
+    # artifacts written by joblib (numpy arrays, compression) remain loadable
+    plain = tmp_path / 'plain.pkl'
+    mr.joblib.dump({'w': np.arange(4.0)}, str(plain))
+    assert np.array_equal(mr._load_artifact(str(plain))['w'], np.arange(4.0))
+    packed = tmp_path / 'packed.pkl'
+    mr.joblib.dump({'w': np.arange(3.0)}, str(packed), compress=3)
+    assert np.array_equal(mr._load_artifact(str(packed))['w'], np.arange(3.0))
+
+
+def test_large_artifacts_are_memory_mapped_and_replaced_atomically(tmp_path, monkeypatch):
+    import numpy as np
+    from backend.services import model_registry as mr
+
+    monkeypatch.setattr(mr, '_MMAP_MODE', 'r')
+    path = str(tmp_path / 'big.pkl')
+    weights = np.arange(300_000, dtype=np.float64)  # > _PICKLE_MAX_BYTES
+    mr._dump_artifact({'w': weights}, path)
+    loaded = mr._load_artifact(path)
+    assert isinstance(loaded['w'], np.memmap) and not loaded['w'].flags.writeable
+
+    # rewriting the artifact leaves the mapped copy intact and no temp file
+    mr._dump_artifact({'w': weights * 2}, path)
+    assert np.array_equal(loaded['w'], weights)
+    assert np.array_equal(mr._load_artifact(path)['w'], weights * 2)
+    assert os.listdir(tmp_path) == ['big.pkl']
+
+
+def test_dump_artifact_sizes_without_serialising_arrays_in_band(tmp_path, monkeypatch):
+    import pickle
+
+    import numpy as np
+    from backend.services import model_registry as mr
+
+    built = []
+    real_dumps = pickle.dumps
+    monkeypatch.setattr(mr.pickle, 'dumps', lambda *a, **k: built.append(len(real_dumps(*a, **k))) or real_dumps(*a, **k))
+
+    big = str(tmp_path / 'big.pkl')
+    mr._dump_artifact({'w': np.zeros(300_000)}, big)
+    assert max(built) < 4096  # the 2.4 MB array never lands in a pickle byte string
+    with open(big, 'rb') as fh:
+        assert b'joblib.numpy_pickle' in fh.read(4096)
+
+    # small array-bearing and large array-free objects stay plain pickles
+    built.clear()
+    small, blob = str(tmp_path / 'small.pkl'), str(tmp_path / 'blob.pkl')
+    mr._dump_artifact({'w': np.arange(10.0)}, small)
+    mr._dump_artifact({'s': 'x' * (mr._PICKLE_MAX_BYTES + 1)}, blob)
+    for p in (small, blob):
+        with open(p, 'rb') as fh:
+            assert b'joblib.numpy_pickle' not in fh.read()
+    assert np.array_equal(mr._load_artifact(small)['w'], np.arange(10.0))
+    assert len(mr._load_artifact(blob)['s']) == mr._PICKLE_MAX_BYTES + 1
+
+
+def test_failed_dump_keeps_previous_artifact_and_syncs_on_success(tmp_path, monkeypatch):
+    import numpy as np
+    import pytest
+    from backend.services import model_registry as mr
+
+    path = str(tmp_path / 'model.pkl')
+    mr._dump_artifact({'v': 1}, path)
+
+    # a stale temp file from a crashed writer does not block the next write
+    open(mr._tmp_path(path), 'wb').close()
+
+    def _boom(*a, **k):
+        raise MemoryError('killed mid-write')
+
+    monkeypatch.setattr(mr.joblib, 'dump', _boom)
+    with pytest.raises(MemoryError):
+        mr._dump_artifact({'w': np.zeros(300_000)}, path)  # large -> joblib
+    assert mr._load_artifact(path) == {'v': 1}
+    assert os.listdir(tmp_path) == ['model.pkl']
+
+    synced = []
+    real_fsync = mr.os.fsync
+    monkeypatch.setattr(mr.os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+    mr._dump_artifact({'v': 2}, path)
+    assert len(synced) == 2  # the file, then its directory
+    assert mr._load_artifact(path) == {'v': 2}
+
+def test_model_compress_is_opt_in_and_loads_without_mmap(tmp_path, monkeypatch):
+    import warnings
+
+    import numpy as np
+    from backend.services import model_registry as mr
+
+    assert mr._artifact_compression(None) == 0
+    assert mr._artifact_compression('false') == 0
+    assert mr._artifact_compression('true')[1] == 3
+    assert mr._artifact_compression('6')[1] == 6
+
+    weights = np.zeros(300_000)  # > _PICKLE_MAX_BYTES, compresses well
+    plain, packed = str(tmp_path / 'plain.pkl'), str(tmp_path / 'packed.pkl')
+    mr._dump_artifact({'w': weights}, plain)
+    monkeypatch.setattr(mr, '_COMPRESS', mr._artifact_compression('true'))
+    mr._dump_artifact({'w': weights}, packed)
+    assert os.path.getsize(packed) < os.path.getsize(plain) // 10
+
+    monkeypatch.setattr(mr, '_MMAP_MODE', 'r')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        loaded = mr._load_artifact(packed)
+    assert not isinstance(loaded['w'], np.memmap)
+    assert np.array_equal(loaded['w'], weights)
+
+    # per-registry override, either way round
+    monkeypatch.setattr(mr, '_COMPRESS', 0)
+    packed_reg = ModelRegistry(model_dir=str(tmp_path / 'packed'), compress_artifacts=True)
+    packed_reg.save_model('Zip Player', {'w': weights}, version='v1')
+    packed_reg.save_calibrator('Zip Player', {'w': weights})
+    assert os.path.getsize(packed_reg._model_path('Zip Player')) < os.path.getsize(plain) // 10
+    assert os.path.getsize(packed_reg._calibrator_path('Zip Player')) < os.path.getsize(plain) // 10
+    monkeypatch.setattr(mr, '_COMPRESS', mr._artifact_compression('true'))
+    plain_reg = ModelRegistry(model_dir=str(tmp_path / 'plain'), compress_artifacts=False)
+    plain_reg.save_model('Raw Player', {'w': weights}, version='v1')
+    assert os.path.getsize(plain_reg._model_path('Raw Player')) >= weights.nbytes
+    plain_reg._loaded_models.clear()
+    assert isinstance(plain_reg.load_model('Raw Player')['w'], np.memmap)
+
+
+def test_save_model_serializes_once_and_links_legacy_path(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    dumps = []
+    real = mr._dump_artifact
+    monkeypatch.setattr(mr, '_dump_artifact', lambda obj, path, **kw: dumps.append(path) or real(obj, path, **kw))
+    monkeypatch.setenv('MODEL_METADATA_ASYNC', 'false')
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'meta.db'}")
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    reg.save_model('Link Player', {'v': 1}, version='v1')
+    reg.save_model('Link Player', {'v': 2}, version='v2')  # replaces the link
+
+    assert len(dumps) == 2 and all(p.endswith('model.pkl') for p in dumps)
+    legacy = reg._model_path('Link Player')
+    assert os.path.samefile(legacy, dumps[-1])
+    assert os.path.exists(dumps[0]) and mr._load_artifact(dumps[0]) == {'v': 1}
+    assert mr._load_artifact(legacy) == {'v': 2}
+    assert not [f for f in os.listdir(reg.model_dir) if f.endswith('.tmp')]
+
+    # without hard links the artifact bytes are copied instead
+    monkeypatch.setattr(mr.os, 'link', lambda *a: (_ for _ in ()).throw(OSError('EXDEV')))
+    copies = []
+    real_copyfile = mr.shutil.copyfile
+    monkeypatch.setattr(mr.shutil, 'copyfile', lambda s, d: copies.append(s) or real_copyfile(s, d))
+    mr._link_artifact(dumps[0], legacy)
+    assert copies == [dumps[0]]
+    assert not os.path.samefile(legacy, dumps[0])
+    assert mr._load_artifact(legacy) == {'v': 1}
+
+
+def test_save_model_never_reloads_what_it_saved(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    def fail(*a, **k):
+        raise AssertionError('save_model loaded an artifact')
+
+    monkeypatch.setattr(mr, '_load_artifact', fail)
+    monkeypatch.setattr(mr.joblib, 'load', fail)
+    monkeypatch.setattr(mr.pickle, 'loads', fail)
+    monkeypatch.setenv('MODEL_ARTIFACT_SIGNING_KEY', 'sign-me')
+    hashed = []
+    real_hmac = mr._file_hmac
+    monkeypatch.setattr(mr, '_file_hmac', lambda key, path: hashed.append(path) or real_hmac(key, path))
+    model = {'w': 1}
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Once Player', model, version='v1')
+    assert len(hashed) == 1
+    assert reg.get_cached_model('Once Player') is model
+
+
+def test_repeated_saves_of_one_version_get_distinct_directories(tmp_path):
+    from backend.services import model_registry as mr
+
+    uids = {mr._version_uid('Same Player') for _ in range(1000)}
+    assert len(uids) == 1000 and all(len(u) == 12 for u in uids)
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    for i in range(3):
+        reg.save_model('Same Player', {'v': i}, version='v1')
+    versions = os.listdir(tmp_path / 'Same_Player' / 'versions')
+    assert len(versions) == 3 and all(v.startswith('v1_') for v in versions)
+    assert reg.load_model('Same Player') == {'v': 2}
+
+def test_save_model_skips_cache_invalidation_without_cache_layer(tmp_path, monkeypatch):
+    from backend.services import cache as cache_module
+    from backend.services import model_registry as mr
+
+    sweeps = []
+    monkeypatch.setattr(cache_module, 'invalidate_prefixes_sync', lambda prefixes, **kw: sweeps.append(list(prefixes)) or 0)
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Cache Player', {'v': 1})
+    assert sweeps == [[f"{p}:Cache Player:" for p in ('predict', 'prediction', 'player_context')]]
+
+    monkeypatch.setattr(mr, '_cache_module', None)
+    reg.save_model('Cache Player', {'v': 2})
+    reg.save_models_bulk([('Cache Player', {'v': 3})])
+    assert len(sweeps) == 1
+    assert reg.load_model('Cache Player') == {'v': 3}
+
+
+def test_redis_invalidation_runs_in_background_until_flushed(tmp_path, monkeypatch):
+    import threading
+
+    from backend.services import cache as cache_module
+
+    started, release, ran = threading.Event(), threading.Event(), []
+
+    def slow_unlink(prefixes, batch_size):
+        started.set()
+        release.wait(5)
+        ran.append((threading.current_thread().name, prefixes))
+        return 0
+
+    monkeypatch.setattr(cache_module, '_unlink_redis_prefixes', slow_unlink)
+    cache_module._fallback_store['predict:Bg Player:1'] = {'v': '1', 'e': None}
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Bg Player', {'w': 1})
+    # the in-process store is swept before save_model returns; Redis is not
+    assert 'predict:Bg Player:1' not in cache_module._fallback_store
+    assert started.wait(5) and not ran
+    assert reg.flush(timeout=0.05) is False
+    release.set()
+    assert reg.flush()
+    assert ran[0][0].startswith('cache-invalidate') and 'player_context:Bg Player:' in ran[0][1]
+
+    monkeypatch.setenv('MODEL_METADATA_ASYNC', 'false')
+    reg.save_model('Bg Player', {'w': 2})
+    assert ran[-1][0] == threading.current_thread().name
+
+
+def test_artifact_signature_is_computed_in_place_and_verified(tmp_path, monkeypatch):
+    import hashlib
+    import hmac
+
+    import numpy as np
+
+    from backend.services import model_registry as mr
+
+    monkeypatch.setenv('MODEL_ARTIFACT_SIGNING_KEY', 'sign-me')
+    monkeypatch.setattr(mr, '_HMAC_CHUNK', 4096)
+    big = tmp_path / 'big.bin'
+    big.write_bytes(np.random.default_rng(0).bytes(3 * 4096 + 17))
+    reg = ModelRegistry(model_dir=str(tmp_path / 'models'))
+    expected = hmac.new(b'sign-me', big.read_bytes(), hashlib.sha256).hexdigest()
+    assert reg._compute_hmac(str(big)) == expected
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    assert reg._compute_hmac(str(empty)) == hmac.new(b'sign-me', b'', hashlib.sha256).hexdigest()
+
+    # without mmap the file is streamed in chunks to the same digest
+    def no_mmap(*a, **k):
+        raise OSError('mmap unavailable')
+
+    monkeypatch.setattr(mr.mmap, 'mmap', no_mmap)
+    assert reg._compute_hmac(str(big)) == expected
+    monkeypatch.undo()
+    monkeypatch.setenv('MODEL_ARTIFACT_SIGNING_KEY', 'sign-me')
+
+    reg.save_model('Signed Player', {'w': 1}, version='v1')
+    reg.save_calibrator('Signed Player', {'c': 1})
+    reg._loaded_models.clear()
+    assert reg.load_model('Signed Player') == {'w': 1}
+    assert reg.load_calibrator('Signed Player') == {'c': 1}
+
+    pkl = reg._latest_versioned_model(str(tmp_path / 'models' / 'Signed_Player' / 'versions'))
+    with open(pkl, 'ab') as fh:
+        fh.write(b'tampered')
+    reg._loaded_models.clear()
+    assert reg.load_model('Signed Player') is None
+
+
+def test_artifact_hmac_is_memoized_per_file_version(tmp_path, monkeypatch):
+    import time
+
+    from backend.services import model_registry as mr
+
+    monkeypatch.setenv('MODEL_ARTIFACT_SIGNING_KEY', 'sign-me')
+    calls = []
+    real = mr._file_hmac
+    monkeypatch.setattr(mr, '_file_hmac', lambda key, path: calls.append(path) or real(key, path))
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Hmac Player', {'w': 1}, version='v1')
+    reg._loaded_models.clear()
+    assert reg.load_model('Hmac Player') == {'w': 1}
+    reg._loaded_models.clear()
+    assert reg.load_model('Hmac Player') == {'w': 1}
+    # hashed at save; both verifications hit the cache
+    assert len(calls) == 1
+
+    pkl = calls[0]
+    with open(pkl, 'ab') as fh:
+        fh.write(b'x')
+    first = reg._compute_hmac(pkl)
+    assert len(calls) == 2
+    monkeypatch.setenv('MODEL_ARTIFACT_SIGNING_KEY', 'other-key')
+    assert reg._compute_hmac(pkl) != first and len(calls) == 3
+
+    # a same-size in-place rewrite with mtime restored still misses the cache
+    st = os.stat(pkl)
+    tampered = reg._compute_hmac(pkl)
+    time.sleep(0.02)
+    with open(pkl, 'r+b') as fh:
+        fh.seek(-1, os.SEEK_END)
+        fh.write(b'y')
+    os.utime(pkl, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert reg._compute_hmac(pkl) != tampered and len(calls) == 4
+
+
+def test_get_registry_is_shared_per_model_dir(tmp_path):
+    from backend.services.calibration_service import CalibrationService
+    from backend.services.ml_prediction_service import MLPredictionService
+    from backend.services.model_registry import get_registry
+
+    reg = get_registry(str(tmp_path / 'store'))
+    assert get_registry(str(tmp_path / 'store' / '..' / 'store')) is reg
+    assert MLPredictionService(model_dir=str(tmp_path / 'store')).registry is reg
+    assert CalibrationService(model_dir=str(tmp_path / 'store')).registry is reg
+    assert get_registry(str(tmp_path / 'other')) is not reg
+
+
+def test_missing_model_costs_one_stat_per_candidate(tmp_path, monkeypatch):
+    from backend.services import model_registry as mr
+
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    stats = []
+    real_stat = mr.os.stat
+    monkeypatch.setattr(mr.os, 'stat', lambda p, *a, **k: stats.append(p) or real_stat(p, *a, **k))
+    assert reg.load_model('Ghost Player') is None
+    # the versions dir and the flat .pkl are each checked once
+    assert len(stats) == 2
+
+
+def test_onnx_artifact_is_served_when_enabled(tmp_path, monkeypatch):
+    import time
+
+    from backend.models import onnx_model
+    from backend.services import model_registry as mr
+
+    class FakeOnnx:
+        def __init__(self, path):
+            self.path = path
+
+        def predict(self, X):
+            return [1.0]
+
+    monkeypatch.setattr(onnx_model, 'ONNXRUNTIME_AVAILABLE', True)
+    monkeypatch.setattr(onnx_model, 'OnnxModel', FakeOnnx)
+    monkeypatch.setenv('MODEL_USE_ONNX', '1')
+    monkeypatch.delenv('MODEL_ARTIFACT_SIGNING_KEY', raising=False)
+    reg = ModelRegistry(model_dir=str(tmp_path))
+    reg.save_model('Onnx Player', {'pickled': True}, version='v1')
+    reg._loaded_models.clear()
+    pkl = reg._latest_versioned_model(str(tmp_path / 'Onnx_Player' / 'versions'))
+
+    # no .onnx yet: the pickle is served
+    assert reg.load_model('Onnx Player') == {'pickled': True}
+
+    onnx_path = pkl[:-4] + '.onnx'
+    time.sleep(0.01)
+    with open(onnx_path, 'wb') as fh:
+        fh.write(b'graph')
+    served = reg.load_model('Onnx Player')
+    assert isinstance(served, FakeOnnx) and served.path == onnx_path
+    assert reg.load_model('Onnx Player') is served
+
+    # a newer pickle wins over a stale graph
+    time.sleep(0.01)
+    mr._dump_artifact({'pickled': 2}, pkl)
+    assert reg.load_model('Onnx Player') == {'pickled': 2}
+
+
+def test_onnx_round_trip_when_available(tmp_path):
+    import pytest
+
+    pytest.importorskip('skl2onnx')
+    pytest.importorskip('onnxruntime')
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+
+    from backend.models.onnx_model import OnnxModel, export_onnx
+
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 0])
+    path = str(tmp_path / 'm.onnx')
+    assert export_onnx(model, path)
+    assert np.allclose(OnnxModel(path).predict(X), model.predict(X), atol=1e-4)
@@ -0,0 +1,23 @@
+import os
+
+import numpy as np
+
+from backend.cli import model_versioning
+from backend.services import model_registry as mr
+
+
+def test_archive_compress_stores_a_smaller_loadable_copy(tmp_path):
+    reg = mr.ModelRegistry(model_dir=str(tmp_path))
+    model = {'w': np.zeros(400_000)}
+    reg.save_model('Cold Player', model, version='v1')
+    src = reg._model_path('Cold Player')
+    size = os.path.getsize(src)
+
+    model_versioning.archive_model(reg, 'Cold Player', compress='true')
+
+    dst = tmp_path / 'archive' / 'Cold_Player.pkl'
+    assert not os.path.exists(src)
+    assert dst.stat().st_size < size // 10
+    assert np.array_equal(mr._load_artifact(str(dst))['w'], model['w'])
+    # the served versioned artifact is untouched
+    assert reg.load_model('Cold Player') is not None
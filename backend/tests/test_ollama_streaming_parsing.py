@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import types
 import pytest
 
 # Ensure repo root is on sys.path so `backend` package imports work in pytest
@@ -15,9 +16,11 @@ class MockStreamResp:
         self.headers = {"Content-Type": "text/event-stream"}
         self.text = ""
 
-    def iter_lines(self, decode_unicode=True):
-        for l in self._lines:
-            yield l
+    def iter_content(self, chunk_size=1):
+        # deliver the stream in small blocks that split lines mid-way
+        raw = "".join(self._lines).encode("utf-8")
+        for i in range(0, len(raw), 7):
+            yield raw[i:i + 7]
 
     def raise_for_status(self):
         return None
@@ -56,8 +59,8 @@ def test_streaming_parsing(monkeypatch):
         assert stream is True
         return MockStreamResp(lines)
 
-    # Patch the global requests.post used by the service at call time
-    monkeypatch.setattr('requests.post', fake_post)
+    # Patch the shared HTTP session used by the service at call time
+    monkeypatch.setattr('backend.services.llm_feature_service._http_session', lambda: types.SimpleNamespace(post=fake_post))
 
     out = svc._ollama_request_with_retries("prompt", max_attempts=1)
     assert out is not None
@@ -76,9 +79,35 @@ def test_json_parsing(monkeypatch):
     def fake_post(url, json=None, headers=None, timeout=None, stream=False):
         return MockJSONResp(data)
 
-    # Patch the global requests.post used by the service at call time
-    monkeypatch.setattr('requests.post', fake_post)
+    # Patch the shared HTTP session used by the service at call time
+    monkeypatch.setattr('backend.services.llm_feature_service._http_session', lambda: types.SimpleNamespace(post=fake_post))
 
     out = svc._ollama_request_with_retries("prompt", max_attempts=1)
     assert out is not None
     assert "confident and healthy" in out
+
+
+def test_find_text_prefers_known_paths_and_handles_deep_nesting():
+    from backend.services.llm_feature_service import _find_text
+
+    # Ollama /api/generate shape: the model name must not win over `response`
+    assert _find_text({"model": "llama3", "response": "generated text", "done": True}) == "generated text"
+    assert _find_text({"choices": [{"message": {"role": "assistant", "content": "chat text"}}]}) == "chat text"
+
+    # generic walk keeps document order and skips empty strings
+    assert _find_text({"a": {"b": ""}, "c": [1, {"d": "first"}, "second"]}) == "first"
+
+    deep = "leaf"
+    for _ in range(5000):
+        deep = [deep]
+    assert _find_text({"wrapper": deep}) == "leaf"
+    assert _find_text({"x": 1, "y": [None, 2.0]}) is None
+
+
+def test_sse_payloads_handles_split_blocks_and_done():
+    from backend.services.llm_feature_service import _sse_payloads
+
+    blocks = [b'data: {"a"', b':1}\n\n', b'{"b":2}\ndata: [DO', b'NE]\n', b'data: {"c":3}\n']
+    assert list(_sse_payloads(blocks)) == [b'{"a":1}', b'{"b":2}']
+    # trailing payload without a final newline is still emitted
+    assert list(_sse_payloads([b'data: tail'])) == [b'tail']
@@ -0,0 +1,57 @@
+import numpy as np
+
+from backend.services import prediction_kernels as pk
+
+
+def test_voting_predict_matches_sklearn_serial_and_threaded(monkeypatch):
+    from sklearn.ensemble import RandomForestRegressor, VotingRegressor
+    from sklearn.linear_model import ElasticNet
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X[:, 0] * 3 + rng.normal(size=300)
+    model = VotingRegressor(
+        [("rf", RandomForestRegressor(n_estimators=10, random_state=0)), ("en", ElasticNet(alpha=0.1))],
+        weights=[0.7, 0.3],
+    ).fit(X, y)
+
+    expected = model.predict(X)
+    assert np.allclose(pk.voting_predict(model, X), expected)
+    monkeypatch.setattr(pk, "_PARALLEL_MIN_ROWS", 1)
+    assert np.allclose(pk.voting_predict(model, X), expected)
+    assert pk.voting_predict(RandomForestRegressor(), X) is None
+
+    def boom(_):
+        raise ValueError("bad member")
+
+    out = pk.map_members([lambda a: a.sum(), boom], X)
+    assert out[0] == X.sum() and isinstance(out[1], ValueError)
+
+
+def test_forest_predictor_matches_sklearn():
+    import pandas as pd
+    import pytest
+    from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+    from sklearn.linear_model import Ridge
+
+    if pk._forest_predict_numba is None:
+        pytest.skip("numba not available")
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(400, 5))
+    y = X[:, 0] * 2 + X[:, 3] + rng.normal(size=400)
+    for cls in (RandomForestRegressor, ExtraTreesRegressor):
+        model = cls(n_estimators=15, random_state=0).fit(X, y)
+        fn = pk.forest_predictor(model)
+        assert fn is not None and pk.forest_predictor(model) is fn
+        assert np.array_equal(fn(X), model.predict(X))
+        assert np.array_equal(pk.model_predict(model, X[:1]), model.predict(X[:1]))
+        # refitting rebuilds the compiled arrays
+        model.fit(X[:200], y[:200])
+        assert np.array_equal(pk.model_predict(model, X), model.predict(X))
+
+    df = pd.DataFrame(X, columns=list("abcde"))
+    named = RandomForestRegressor(n_estimators=5, random_state=0).fit(df, y)
+    assert np.array_equal(pk.model_predict(named, df.head(7)), named.predict(df.head(7)))
+    with pytest.raises(ValueError):
+        pk.model_predict(named, df[list("edcba")])
+    assert pk.forest_predictor(Ridge().fit(X, y)) is None
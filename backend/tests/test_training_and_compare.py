@@ -28,6 +28,26 @@ def test_train_player_model_basic():
     assert len(preds) == len(X)
 
 
+
+def test_save_and_load_model_memory_maps_unless_archived(tmp_path, monkeypatch):
+    from backend.services import model_registry
+
+    monkeypatch.setattr(model_registry, '_MMAP_MODE', 'r')
+    model = {'weights': np.zeros(300_000)}  # large enough to go through joblib
+
+    served, archived = tmp_path / 'serve' / 'm.pkl', tmp_path / 'archive' / 'm.pkl'
+    training_pipeline.save_model(model, str(served))
+    training_pipeline.save_model(model, str(archived), compress=3)
+    assert archived.stat().st_size < served.stat().st_size // 10
+
+    loaded = training_pipeline.load_model(str(served))
+    assert isinstance(loaded['weights'], np.memmap)
+    assert np.array_equal(loaded['weights'], model['weights'])
+    unpacked = training_pipeline.load_model(str(archived))
+    assert np.array_equal(unpacked['weights'], model['weights'])
+    assert training_pipeline.load_model(str(tmp_path / 'missing.pkl')) is None
+
+
 def test_compare_evaluate_player_handles_insufficient(monkeypatch):
     # monkeypatch generate_training_data to return a tiny df (1 row)
     small_df = make_training_df(1)
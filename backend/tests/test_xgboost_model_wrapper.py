@@ -10,3 +10,19 @@ def test_xgboost_wrapper_import_or_skip():
         # basic smoke: instantiate (no training here)
         m = xgboost_model.XGBoostModel(num_boost_round=5)
         assert m is not None
+
+
+def test_xgboost_predict_matches_dmatrix_path():
+    if not getattr(xgboost_model, 'XGBOOST_AVAILABLE', False):
+        pytest.skip('xgboost not installed')
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(80, 4)), columns=list('abcd'))
+    y = X['a'] * 2 + rng.normal(size=80)
+    m = xgboost_model.XGBoostModel(num_boost_round=10)
+    m.train(X, y)
+    expected = m.booster.predict(xgboost_model.xgb.DMatrix(X.values))
+    assert np.array_equal(m.predict(X), expected)
+    assert np.array_equal(m.predict(X.values[:1]), expected[:1])